@@ -4,14 +4,14 @@ FLASH 2.0 Model Inference API
 Production-ready FastAPI server for startup success predictions
 """
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, FileResponse, PlainTextResponse, Response
 from pydantic import BaseModel, Field, validator, conint, confloat
 from typing import Dict, List, Optional, Any, Union
 import numpy as np
 import pandas as pd
-import catboost as cb
 import joblib
 import json
 import logging
@@ -20,15 +20,19 @@ import os
 import sys
 from pathlib import Path
 import time
+import asyncio
 from functools import wraps
 import hashlib
 import secrets
 from collections import defaultdict
-from shap_explainer import FLASHExplainer
 from stage_hierarchical_models import StageHierarchicalModel
 from dna_pattern_analysis import StartupDNAAnalyzer
 from temporal_models import TemporalPredictionModel
 from industry_specific_models import IndustrySpecificModel
+from profiling import ProfileStore, RequestProfiler
+from memory_report import LoadLedger, AllocationSampler, build_report
+from config import settings
+from vocabulary import FUNDING_STAGE, INVESTOR_TIER, PRODUCT_STAGE
 
 # Configure logging
 logging.basicConfig(
@@ -118,6 +122,72 @@ async def validate_request_size(request: Request, call_next):
     response = await call_next(request)
     return response
 
+
+def is_admin_request(request: Request) -> bool:
+    """Check whether the request carries a configured admin API key"""
+    if not settings.ADMIN_API_KEYS:
+        # Without configured keys admin access stays closed unless explicitly opened
+        return settings.ADMIN_ALLOW_UNAUTHENTICATED
+    api_key = request.headers.get(API_KEY_HEADER, '')
+    return any(secrets.compare_digest(api_key, key) for key in settings.ADMIN_API_KEYS)
+
+
+def require_admin(request: Request) -> None:
+    """Reject requests to admin endpoints without a valid admin API key"""
+    if not is_admin_request(request):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin API key required")
+
+
+# Per-request profiling; the middleware is only installed when enabled so
+# unprofiled deployments pay nothing for it
+PROFILE_STORE = ProfileStore(Path(settings.PROFILE_DIR), max_profiles=settings.PROFILE_MAX_FILES)
+
+if settings.ENABLE_PROFILING:
+    REQUEST_PROFILER = RequestProfiler(
+        PROFILE_STORE,
+        mode=settings.PROFILE_MODE,
+        sample_rate=settings.PROFILE_SAMPLE_RATE
+    )
+
+    @app.middleware("http")
+    async def profile_request(request: Request, call_next):
+        is_admin = is_admin_request(request)
+        trigger = REQUEST_PROFILER.trigger_for(
+            header_requested=settings.PROFILE_HEADER in request.headers,
+            is_admin=is_admin
+        )
+        session = REQUEST_PROFILER.start() if trigger else None
+        if session is None:
+            return await call_next(request)
+        
+        status_code = None
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+        finally:
+            profile_id = REQUEST_PROFILER.finish(session, {
+                'method': request.method,
+                'path': request.url.path,
+                'trigger': trigger,
+                'status_code': status_code
+            })
+        # Profile ids lead to admin-only downloads; anonymous sampled requests do not see them
+        if profile_id and is_admin:
+            response.headers['X-Profile-Id'] = profile_id
+        return response
+
+
+@app.middleware("http")
+async def sample_allocations(request: Request, call_next):
+    """Record per-request allocation sites while an admin sampling window is open"""
+    if not ALLOCATION_SAMPLER.active:
+        return await call_next(request)
+    before = ALLOCATION_SAMPLER.snapshot()
+    response = await call_next(request)
+    ALLOCATION_SAMPLER.record(before)
+    return response
+
+
 # Model paths
 MODEL_BASE_PATH = Path("models/v2_enhanced")
 PILLAR_MODEL_PATH = Path("models/v2")
@@ -129,6 +199,13 @@ DNA_ANALYZER = None
 TEMPORAL_MODEL = None
 INDUSTRY_MODEL = None
 FEATURE_CONFIG = {}
+EXPLAINER_WARMER = None
+PLOT_STORE = None
+SHAP_SUMMARIES = None
+
+# Memory accounting for the admin memory report
+MEMORY_LEDGER = LoadLedger()
+ALLOCATION_SAMPLER = AllocationSampler()
 
 # Feature definitions
 CAPITAL_FEATURES = [
@@ -166,7 +243,7 @@ ALL_FEATURES = CAPITAL_FEATURES + ADVANTAGE_FEATURES + MARKET_FEATURES + PEOPLE_
 class StartupMetrics(BaseModel):
     """Input schema for startup metrics with enhanced validation"""
     # Capital metrics
-    funding_stage: str = Field(..., description="Current funding stage", pattern="^(pre_seed|seed|series_a|series_b|series_c|growth)$")
+    funding_stage: str = Field(..., description="Current funding stage", pattern=FUNDING_STAGE.pattern())
     total_capital_raised_usd: confloat(ge=0, le=1e10) = Field(..., description="Total capital raised in USD")
     cash_on_hand_usd: confloat(ge=0, le=1e10) = Field(..., description="Current cash reserves")
     monthly_burn_usd: confloat(ge=0, le=1e8) = Field(..., description="Monthly burn rate")
@@ -176,7 +253,7 @@ class StartupMetrics(BaseModel):
     gross_margin_percent: confloat(ge=-100, le=100) = Field(..., description="Gross margin percentage")
     burn_multiple: Optional[confloat(ge=0, le=100)] = Field(None, description="Burn multiple")
     ltv_cac_ratio: confloat(ge=0, le=100) = Field(default=0, description="LTV/CAC ratio")
-    investor_tier_primary: str = Field(..., pattern="^(tier_1|tier_2|tier_3|none)$", description="Primary investor tier")
+    investor_tier_primary: str = Field(..., pattern=INVESTOR_TIER.pattern(), description="Primary investor tier")
     has_debt: bool = Field(..., description="Has debt financing")
     
     # Advantage metrics
@@ -188,7 +265,7 @@ class StartupMetrics(BaseModel):
     switching_cost_score: confloat(ge=1, le=5) = Field(..., description="Switching cost (1-5)")
     brand_strength_score: confloat(ge=1, le=5) = Field(..., description="Brand strength (1-5)")
     scalability_score: confloat(ge=1, le=5) = Field(..., description="Scalability score (1-5)")
-    product_stage: str = Field(..., pattern="^(concept|mvp|beta|launch|growth|mature)$", description="Product stage")
+    product_stage: str = Field(..., pattern=PRODUCT_STAGE.pattern(), description="Product stage")
     product_retention_30d: confloat(ge=0, le=1) = Field(..., description="30-day retention")
     product_retention_90d: confloat(ge=0, le=1) = Field(..., description="90-day retention")
     
@@ -319,6 +396,12 @@ class AdvancedPredictionResponse(BaseModel):
     key_insights: List[str] = Field(default_factory=list)
 
 
+# Training-time stage encoding; the dataset's "Series C+" covers growth-stage companies
+STAGE_NUMERIC = FUNDING_STAGE.table(
+    {'pre_seed': 0, 'seed': 1, 'series_a': 2, 'series_b': 3, 'series_c': 4, 'growth': 4}
+)
+
+
 # Helper functions
 def create_engineered_features(df: pd.DataFrame) -> pd.DataFrame:
     """Create engineered features matching training pipeline"""
@@ -369,8 +452,7 @@ def create_engineered_features(df: pd.DataFrame) -> pd.DataFrame:
     df['team_risk'] = df['key_person_dependency'].astype(int)
     
     # Stage encoding
-    stage_map = {'Pre-seed': 0, 'Seed': 1, 'Series A': 2, 'Series B': 3, 'Series C+': 4}
-    df['stage_numeric'] = df['funding_stage'].map(stage_map)
+    df['stage_numeric'] = STAGE_NUMERIC[FUNDING_STAGE.codes(df['funding_stage'])]
     
     # Interaction features
     df['stage_revenue_fit'] = df['stage_numeric'] * df['annual_revenue_run_rate'] / 1e6
@@ -384,8 +466,9 @@ def load_stage_models():
     global STAGE_MODEL
     try:
         if STAGE_MODEL_PATH.exists():
-            STAGE_MODEL = StageHierarchicalModel()
-            STAGE_MODEL.load_models(STAGE_MODEL_PATH)
+            with MEMORY_LEDGER.track("stage_hierarchical"):
+                STAGE_MODEL = StageHierarchicalModel()
+                STAGE_MODEL.load_models(STAGE_MODEL_PATH)
             logger.info("Stage-based hierarchical models loaded successfully")
         else:
             logger.warning("Stage-based models not found, using base models only")
@@ -402,8 +485,9 @@ def load_advanced_models():
         # Load DNA Pattern Analyzer
         dna_path = Path("models/dna_analyzer")
         if dna_path.exists():
-            DNA_ANALYZER = StartupDNAAnalyzer()
-            DNA_ANALYZER.load(dna_path)
+            with MEMORY_LEDGER.track("dna"):
+                DNA_ANALYZER = StartupDNAAnalyzer()
+                DNA_ANALYZER.load(dna_path)
             logger.info("DNA pattern analyzer loaded successfully")
     except Exception as e:
         logger.error(f"Failed to load DNA analyzer: {e}")
@@ -412,8 +496,9 @@ def load_advanced_models():
         # Load Temporal Models
         temporal_path = Path("models/temporal")
         if temporal_path.exists():
-            TEMPORAL_MODEL = TemporalPredictionModel()
-            TEMPORAL_MODEL.load(temporal_path)
+            with MEMORY_LEDGER.track("temporal"):
+                TEMPORAL_MODEL = TemporalPredictionModel()
+                TEMPORAL_MODEL.load(temporal_path)
             logger.info("Temporal models loaded successfully")
     except Exception as e:
         logger.error(f"Failed to load temporal models: {e}")
@@ -422,8 +507,9 @@ def load_advanced_models():
         # Load Industry-Specific Models
         industry_path = Path("models/industry_specific")
         if industry_path.exists():
-            INDUSTRY_MODEL = IndustrySpecificModel()
-            INDUSTRY_MODEL.load(industry_path)
+            with MEMORY_LEDGER.track("industry"):
+                INDUSTRY_MODEL = IndustrySpecificModel(cache_size=settings.MODEL_CACHE_SIZE)
+                INDUSTRY_MODEL.load(industry_path, preload_top_n=settings.INDUSTRY_PRELOAD_TOP_N)
             logger.info("Industry-specific models loaded successfully")
     except Exception as e:
         logger.error(f"Failed to load industry models: {e}")
@@ -432,40 +518,43 @@ def load_advanced_models():
 def load_models():
     """Load all models into memory"""
     global MODELS, PILLAR_MODELS
+    import catboost as cb
     logger.info("Loading models...")
     
     try:
-        # Load ensemble models
-        for variant in ['conservative', 'aggressive', 'balanced', 'deep']:
-            model_path = MODEL_BASE_PATH / f"{variant}_model.cbm"
-            if model_path.exists():
-                MODELS[variant] = cb.CatBoostClassifier()
-                MODELS[variant].load_model(str(model_path))
-                logger.info(f"Loaded {variant} model")
+        with MEMORY_LEDGER.track("v2_enhanced"):
+            # Load ensemble models
+            for variant in ['conservative', 'aggressive', 'balanced', 'deep']:
+                model_path = MODEL_BASE_PATH / f"{variant}_model.cbm"
+                if model_path.exists():
+                    MODELS[variant] = cb.CatBoostClassifier()
+                    MODELS[variant].load_model(str(model_path))
+                    logger.info(f"Loaded {variant} model")
         
-        # Load meta-learners
-        for meta in ['logistic', 'nn']:
-            model_path = MODEL_BASE_PATH / f"meta_{meta}.pkl"
-            if model_path.exists():
-                MODELS[f"meta_{meta}"] = joblib.load(model_path)
-                logger.info(f"Loaded meta_{meta} model")
+            # Load meta-learners
+            for meta in ['logistic', 'nn']:
+                model_path = MODEL_BASE_PATH / f"meta_{meta}.pkl"
+                if model_path.exists():
+                    MODELS[f"meta_{meta}"] = joblib.load(model_path)
+                    logger.info(f"Loaded meta_{meta} model")
         
-        # Load CatBoost meta
-        meta_cb_path = MODEL_BASE_PATH / "meta_catboost_meta.cbm"
-        if meta_cb_path.exists():
-            MODELS['meta_catboost'] = cb.CatBoostClassifier()
-            MODELS['meta_catboost'].load_model(str(meta_cb_path))
-            logger.info("Loaded meta_catboost model")
+            # Load CatBoost meta
+            meta_cb_path = MODEL_BASE_PATH / "meta_catboost_meta.cbm"
+            if meta_cb_path.exists():
+                MODELS['meta_catboost'] = cb.CatBoostClassifier()
+                MODELS['meta_catboost'].load_model(str(meta_cb_path))
+                logger.info("Loaded meta_catboost model")
         
-        # Load v2 CAMP pillar models
-        for pillar in ['capital', 'advantage', 'market', 'people']:
-            model_path = PILLAR_MODEL_PATH / f"{pillar}_model.cbm"
-            if model_path.exists():
-                PILLAR_MODELS[pillar] = cb.CatBoostClassifier()
-                PILLAR_MODELS[pillar].load_model(str(model_path))
-                logger.info(f"Loaded {pillar} pillar model")
-            else:
-                logger.warning(f"Pillar model not found: {model_path}")
+        with MEMORY_LEDGER.track("v2_pillars"):
+            # Load v2 CAMP pillar models
+            for pillar in ['capital', 'advantage', 'market', 'people']:
+                model_path = PILLAR_MODEL_PATH / f"{pillar}_model.cbm"
+                if model_path.exists():
+                    PILLAR_MODELS[pillar] = cb.CatBoostClassifier()
+                    PILLAR_MODELS[pillar].load_model(str(model_path))
+                    logger.info(f"Loaded {pillar} pillar model")
+                else:
+                    logger.warning(f"Pillar model not found: {model_path}")
         
         logger.info(f"Successfully loaded {len(MODELS)} ensemble models and {len(PILLAR_MODELS)} pillar models")
         
@@ -474,28 +563,51 @@ def load_models():
         raise
 
 
+def loaded_model_families() -> Dict[str, Any]:
+    """Loaded model objects grouped by family, for memory reporting"""
+    return {
+        'v2_enhanced': MODELS or None,
+        'v2_pillars': PILLAR_MODELS or None,
+        'stage_hierarchical': STAGE_MODEL,
+        'industry': INDUSTRY_MODEL,
+        'temporal': TEMPORAL_MODEL,
+        'dna': DNA_ANALYZER
+    }
+
+
+STAGE_WEIGHTS = {
+    "pre_seed": {"capital": 0.15, "advantage": 0.30, "market": 0.20, "people": 0.35},
+    "seed": {"capital": 0.20, "advantage": 0.30, "market": 0.25, "people": 0.25},
+    "series_a": {"capital": 0.25, "advantage": 0.25, "market": 0.30, "people": 0.20},
+    "series_b": {"capital": 0.25, "advantage": 0.25, "market": 0.30, "people": 0.20},
+    "series_c": {"capital": 0.30, "advantage": 0.20, "market": 0.30, "people": 0.20}
+}
+
+STAGE_THRESHOLDS = {
+    "pre_seed": {"capital": 0.30, "advantage": 0.40, "market": 0.30, "people": 0.50},
+    "seed": {"capital": 0.35, "advantage": 0.45, "market": 0.40, "people": 0.50},
+    "series_a": {"capital": 0.45, "advantage": 0.50, "market": 0.50, "people": 0.45},
+    "series_b": {"capital": 0.50, "advantage": 0.55, "market": 0.55, "people": 0.50},
+    "series_c": {"capital": 0.55, "advantage": 0.60, "market": 0.60, "people": 0.55}
+}
+
+
+def _stage_rule(table: Dict[str, Dict[str, float]], funding_stage: str) -> Dict[str, float]:
+    """Look up a per-stage rule for any stage spelling; growth uses Series C, unknown uses Seed"""
+    stage = FUNDING_STAGE.normalize(funding_stage)
+    if stage == "growth":
+        stage = "series_c"
+    return dict(table.get(stage, table["seed"]))
+
+
 def get_stage_weights(funding_stage: str) -> Dict[str, float]:
     """Get pillar weights based on funding stage"""
-    weights = {
-        "Pre-seed": {"capital": 0.15, "advantage": 0.30, "market": 0.20, "people": 0.35},
-        "Seed": {"capital": 0.20, "advantage": 0.30, "market": 0.25, "people": 0.25},
-        "Series A": {"capital": 0.25, "advantage": 0.25, "market": 0.30, "people": 0.20},
-        "Series B": {"capital": 0.25, "advantage": 0.25, "market": 0.30, "people": 0.20},
-        "Series C": {"capital": 0.30, "advantage": 0.20, "market": 0.30, "people": 0.20}
-    }
-    return weights.get(funding_stage, weights["Seed"])
+    return _stage_rule(STAGE_WEIGHTS, funding_stage)
 
 
 def get_stage_thresholds(funding_stage: str) -> Dict[str, float]:
     """Get minimum pillar thresholds based on funding stage"""
-    thresholds = {
-        "Pre-seed": {"capital": 0.30, "advantage": 0.40, "market": 0.30, "people": 0.50},
-        "Seed": {"capital": 0.35, "advantage": 0.45, "market": 0.40, "people": 0.50},
-        "Series A": {"capital": 0.45, "advantage": 0.50, "market": 0.50, "people": 0.45},
-        "Series B": {"capital": 0.50, "advantage": 0.55, "market": 0.55, "people": 0.50},
-        "Series C": {"capital": 0.55, "advantage": 0.60, "market": 0.60, "people": 0.55}
-    }
-    return thresholds.get(funding_stage, thresholds["Seed"])
+    return _stage_rule(STAGE_THRESHOLDS, funding_stage)
 
 
 def check_critical_failures(data: Dict[str, Any]) -> List[str]:
@@ -539,7 +651,7 @@ def calculate_risk_adjusted_score(base_score: float, pillar_name: str, data: Dic
     elif pillar_name == "capital":
         if data.get('has_debt', False) and data.get('debt_to_equity_ratio', 0) > 2:
             adjusted -= 0.1
-        if data.get('investor_tier_primary') not in ['Tier 1', 'Tier 2']:
+        if INVESTOR_TIER.normalize(data.get('investor_tier_primary')) not in ('tier_1', 'tier_2'):
             adjusted -= 0.05
     
     elif pillar_name == "advantage":
@@ -820,6 +932,34 @@ async def startup_event():
     load_models()
     load_stage_models()
     load_advanced_models()
+    if settings.ENABLE_EXPLANATION_API:
+        start_explainer_warmup()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop plot rendering workers and industry prediction threads"""
+    if PLOT_STORE is not None:
+        PLOT_STORE.shutdown()
+    if INDUSTRY_MODEL is not None:
+        INDUSTRY_MODEL.shutdown()
+
+
+def start_explainer_warmup():
+    """Build the SHAP explainers in the background; safe to call repeatedly"""
+    global EXPLAINER_WARMER
+    if EXPLAINER_WARMER is None:
+        # Imported lazily: shap and matplotlib dominate worker import time
+        from shap_explainer import ExplainerWarmer, FLASHExplainer
+        EXPLAINER_WARMER = ExplainerWarmer(
+            lambda: FLASHExplainer(
+                models_dir=settings.PILLAR_MODEL_PATH, cache_dir=settings.EXPLAINER_CACHE_DIR,
+                backend=settings.EXPLAINER_BACKEND, approximate=settings.EXPLAINER_APPROXIMATE,
+                thread_count=settings.EXPLAINER_THREAD_COUNT
+            )
+        )
+    EXPLAINER_WARMER.start()
+    return EXPLAINER_WARMER
 
 
 @app.get("/", response_model=Dict[str, str])
@@ -841,6 +981,7 @@ async def health_check():
         "status": "healthy" if len(MODELS) > 0 else "unhealthy",
         "models_loaded": len(MODELS),
         "pillar_models_loaded": len(PILLAR_MODELS),
+        "explainer": EXPLAINER_WARMER.state if EXPLAINER_WARMER else "idle",
         "version": "2.0.0",
         "timestamp": datetime.now().isoformat()
     }
@@ -1091,6 +1232,20 @@ async def predict_advanced(request: Request, metrics: StartupMetrics):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/similar")
+@rate_limit(max_requests=100, window=3600)
+async def similar_startups(request: Request, metrics: StartupMetrics, k: int = 10):
+    """Most similar successful and failed startups in DNA space, with their outcome mix"""
+    if not 1 <= k <= 50:
+        raise HTTPException(status_code=400, detail="k must be between 1 and 50")
+    if DNA_ANALYZER is None or DNA_ANALYZER.similarity_index is None:
+        raise HTTPException(status_code=503, detail="DNA similarity index not loaded; "
+                                                    "build it with python dna_similarity_index.py --data <training csv>")
+
+    df = pd.DataFrame([metrics.dict()])
+    return {"k": k, **DNA_ANALYZER.find_similar_startups(df, k=k)[0]}
+
+
 @app.post("/batch_predict")
 async def batch_predict(metrics_list: List[StartupMetrics]):
     """Batch prediction endpoint"""
@@ -1105,73 +1260,97 @@ async def batch_predict(metrics_list: List[StartupMetrics]):
     return {"predictions": predictions, "count": len(predictions)}
 
 
+def explanation_features(metrics: StartupMetrics) -> Dict[str, Any]:
+    """
+    Map API fields to the explainer's pillar model features. The raw fields
+    are included too: the CatBoost pillar models are trained on them directly.
+    """
+    return {
+        **metrics.dict(),
+        
+        # Capital features
+        'funding_total_usd': metrics.total_capital_raised_usd,
+        'funding_rounds': 2 if metrics.funding_stage in ['series_a', 'series_b'] else 1,
+        'last_funding_amount_usd': metrics.total_capital_raised_usd * 0.6,  # Estimate
+        'burn_rate': metrics.monthly_burn_usd,
+        'runway_months': metrics.runway_months,
+        'revenue_growth_rate': metrics.revenue_growth_rate_percent / 100,
+        'gross_margin': metrics.gross_margin_percent / 100,
+        'revenue_per_employee': metrics.annual_revenue_run_rate / max(metrics.team_size_full_time, 1),
+        'customer_acquisition_cost': 1000,  # Default CAC
+        'lifetime_value': metrics.ltv_cac_ratio * 1000,  # Derive from ratio
+        'ltv_cac_ratio': metrics.ltv_cac_ratio,
+        
+        # Advantage features
+        'has_patent': 1 if metrics.patent_count > 0 else 0,
+        'tech_stack_complexity': 7,  # Default complexity
+        'product_market_fit_score': 0.7,  # Default PMF
+        'competitive_advantage_score': metrics.tech_differentiation_score / 5,
+        'time_to_market_days': 180,  # Default 6 months
+        'nps_score': 40,  # Default NPS
+        'is_b2b': 1 if metrics.sector in ['enterprise', 'fintech', 'healthcare'] else 0,
+        'is_saas': 1 if 'saas' in metrics.sector.lower() else 0,
+        
+        # Market features
+        'market_size_billions': metrics.tam_size_usd / 1e9,
+        'market_growth_rate': metrics.market_growth_rate_percent / 100,
+        'market_maturity_score': 0.5,  # Default
+        'competitor_count': metrics.competition_intensity * 20,
+        'market_share': 0.02,  # Default 2% share
+        'market_concentration': 0.3,  # Default
+        'is_emerging_market': 0,  # Default
+        'regulatory_complexity_score': 0.3,  # Default complexity
+        
+        # People features
+        'team_size': metrics.team_size_full_time,
+        'founder_experience_years': metrics.years_experience_avg,
+        'founder_previous_exits': metrics.prior_successful_exits_count,
+        'technical_team_ratio': 0.5,  # Default 50% technical
+        'advisor_count': metrics.advisors_count,
+        'board_size': 5,  # Default board size
+        'employee_growth_rate': metrics.user_growth_rate_percent / 100,
+        'leadership_stability_score': 0.8,  # Default
+        'diversity_score': metrics.team_diversity_percent / 100,
+        'has_technical_cofounder': 1,  # Default yes
+        'founder_domain_expertise': 1 if metrics.domain_expertise_years_avg > 5 else 0
+    }
+
+
+def explainer_warming_response(warmer) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"status": warmer.state, "error": warmer.error},
+        headers={"Retry-After": "5"}
+    )
+
+
 @app.post("/explain")
 @rate_limit(max_requests=50, window=3600)
-async def explain_prediction(request: Request, metrics: StartupMetrics):
-    """Get SHAP-based explanation for a prediction with rate limiting"""
+async def explain_prediction(request: Request, metrics: StartupMetrics, plot_format: Optional[str] = None):
+    """
+    Get SHAP-based explanation for a prediction with rate limiting.
+    Plots are returned as URLs rendered on demand by /explain/plots.
+    """
+    plot_format = plot_format or settings.PLOT_FORMAT
+    if plot_format not in ('svg', 'png'):
+        raise HTTPException(status_code=400, detail="plot_format must be svg or png")
     try:
         # Log request
         logger.info(f"Explanation request from {request.client.host}")
-        # Initialize explainer if not already done
-        if not hasattr(app.state, 'explainer'):
-            app.state.explainer = FLASHExplainer(models_dir="models/v2")
+        # Explainers are built in the background; report progress instead of blocking
+        warmer = start_explainer_warmup()
+        explainer = warmer.explainer
+        if explainer is None:
+            return explainer_warming_response(warmer)
         
-        # Convert metrics to feature dict
-        feature_dict = {}
-        
-        # Map API fields to model features
-        feature_mapping = {
-            # Capital features
-            'funding_total_usd': metrics.total_capital_raised_usd,
-            'funding_rounds': 2 if metrics.funding_stage in ['series_a', 'series_b'] else 1,
-            'last_funding_amount_usd': metrics.total_capital_raised_usd * 0.6,  # Estimate
-            'burn_rate': metrics.monthly_burn_usd,
-            'runway_months': metrics.runway_months,
-            'revenue_growth_rate': metrics.revenue_growth_rate_percent / 100,
-            'gross_margin': metrics.gross_margin_percent / 100,
-            'revenue_per_employee': metrics.annual_revenue_run_rate / max(metrics.team_size_full_time, 1),
-            'customer_acquisition_cost': 1000,  # Default CAC
-            'lifetime_value': metrics.ltv_cac_ratio * 1000,  # Derive from ratio
-            'ltv_cac_ratio': metrics.ltv_cac_ratio,
-            
-            # Advantage features
-            'has_patent': 1 if metrics.patent_count > 0 else 0,
-            'tech_stack_complexity': 7,  # Default complexity
-            'product_market_fit_score': 0.7,  # Default PMF
-            'competitive_advantage_score': metrics.tech_differentiation_score / 5,
-            'time_to_market_days': 180,  # Default 6 months
-            'nps_score': 40,  # Default NPS
-            'is_b2b': 1 if metrics.sector in ['enterprise', 'fintech', 'healthcare'] else 0,
-            'is_saas': 1 if 'saas' in metrics.sector.lower() else 0,
-            
-            # Market features
-            'market_size_billions': metrics.market_size_usd / 1e9,
-            'market_growth_rate': metrics.market_growth_rate_percent / 100,
-            'market_maturity_score': 0.5,  # Default
-            'competitor_count': metrics.competitor_intensity * 20,
-            'market_share': 0.02,  # Default 2% share
-            'market_concentration': 0.3,  # Default
-            'is_emerging_market': 0,  # Default
-            'regulatory_complexity_score': 0.3,  # Default complexity
-            
-            # People features
-            'team_size': metrics.team_size_full_time,
-            'founder_experience_years': metrics.years_experience_avg,
-            'founder_previous_exits': metrics.prior_successful_exits_count,
-            'technical_team_ratio': 0.5,  # Default 50% technical
-            'advisor_count': metrics.advisors_count,
-            'board_size': 5,  # Default board size
-            'employee_growth_rate': metrics.user_growth_rate_percent / 100,
-            'leadership_stability_score': 0.8,  # Default
-            'diversity_score': metrics.team_diversity_percent / 100,
-            'has_technical_cofounder': 1,  # Default yes
-            'founder_domain_expertise': 1 if metrics.domain_expertise_years_avg > 5 else 0
-        }
+        feature_mapping = explanation_features(metrics)
         
-        # Generate explanation
-        explanation_result = app.state.explainer.explain_prediction(
-            feature_mapping, 
-            include_plots=True
+        # Generate explanation; SHAP and the plot store write run off the event loop
+        explanation_result = await run_in_threadpool(
+            explainer.explain_prediction, feature_mapping, include_plots=False
+        )
+        explanation_result['plots'] = await run_in_threadpool(
+            explanation_plot_urls, explanation_result, plot_format
         )
         
         # Also get the regular prediction for context
@@ -1188,6 +1367,124 @@ async def explain_prediction(request: Request, metrics: StartupMetrics):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/explain/batch")
+@rate_limit(max_requests=50, window=3600)
+async def explain_batch(request: Request, metrics_list: List[StartupMetrics]):
+    """SHAP explanations and insights for many startups, computed in one pass per model"""
+    if not 1 <= len(metrics_list) <= settings.MAX_EXPLAIN_BATCH_SIZE:
+        raise HTTPException(status_code=400,
+                            detail=f"Batch size must be between 1 and {settings.MAX_EXPLAIN_BATCH_SIZE}")
+    
+    warmer = start_explainer_warmup()
+    explainer = warmer.explainer
+    if explainer is None:
+        return explainer_warming_response(warmer)
+    
+    try:
+        # SHAP is CPU-bound; run it off the event loop so other requests keep being served
+        explanations = await run_in_threadpool(
+            explainer.explain_batch, [explanation_features(metrics) for metrics in metrics_list]
+        )
+    except Exception as e:
+        logger.error(f"Batch explanation error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    return {"explanations": explanations, "count": len(explanations)}
+
+
+def get_plot_store():
+    global PLOT_STORE
+    if PLOT_STORE is None:
+        from explanation_plots import PlotStore
+        PLOT_STORE = PlotStore(Path(settings.PLOT_CACHE_DIR), max_workers=settings.PLOT_RENDER_WORKERS,
+                               max_explanations=settings.PLOT_CACHE_MAX_EXPLANATIONS)
+    return PLOT_STORE
+
+
+def explanation_plot_urls(explanation: Dict, plot_format: str) -> Dict[str, str]:
+    """Store an explanation's plot inputs and return content-addressed plot URLs"""
+    from shap_explainer import available_plots
+    
+    digest = get_plot_store().put(explanation)
+    names = available_plots(explanation['pillar_explanations'], explanation['meta_explanation'])
+    return {name: f"/explain/plots/{digest}/{name}.{plot_format}" for name in names}
+
+
+@app.get("/explain/plots/{digest}/{filename}")
+async def explanation_plot(request: Request, digest: str, filename: str):
+    """Render (once) and serve one explanation plot; URLs are immutable, so clients revalidate by ETag"""
+    from shap_explainer import PLOT_FORMATS
+    
+    name, _, plot_format = filename.rpartition('.')
+    store = get_plot_store()
+    try:
+        store.check(digest, name, plot_format)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Plot not found")
+    
+    etag = f'"{digest}-{name}-{plot_format}"'
+    cache_headers = {"ETag": etag, "Cache-Control": "public, max-age=31536000, immutable"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+    
+    try:
+        path = await asyncio.wrap_future(store.render(digest, name, plot_format))
+        # Read here rather than streamed later, so an image evicted meanwhile is a 404 too
+        image = Path(path).read_bytes()
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Plot not found")
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except OSError:
+        # The explanation or image was evicted between the check and the read
+        raise HTTPException(status_code=404, detail="Plot not found")
+    return Response(image, media_type=PLOT_FORMATS[plot_format], headers=cache_headers)
+
+
+def get_shap_summaries():
+    """The precomputed SHAP summary store, opened on first use and reopened when the summaries are recomputed"""
+    global SHAP_SUMMARIES
+    if SHAP_SUMMARIES is None or not SHAP_SUMMARIES.is_current():
+        from shap_summaries import MANIFEST, ShapSummaryStore
+        if not (Path(settings.SHAP_SUMMARY_DIR) / MANIFEST).exists():
+            raise HTTPException(status_code=404, detail="SHAP summaries have not been computed; run shap_summaries.py")
+        SHAP_SUMMARIES = ShapSummaryStore(settings.SHAP_SUMMARY_DIR)
+    return SHAP_SUMMARIES
+
+
+def shap_summary_query(query, *args, **kwargs) -> Dict:
+    """Run a summary query, mapping unknown models/features to 404 and unknown segments to 400"""
+    try:
+        return query(*args, **kwargs)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"Unknown model or feature: {e.args[0]}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/explain/summary/{model}")
+async def shap_summary_importance(model: str, stage: Optional[str] = None, sector: Optional[str] = None,
+                                  top_n: Optional[int] = None):
+    """Global or stage/sector segment feature importance from the precomputed SHAP values"""
+    return shap_summary_query(get_shap_summaries().importance, model, stage=stage, sector=sector, top_n=top_n)
+
+
+@app.get("/explain/summary/{model}/dependence/{feature}")
+async def shap_summary_dependence(model: str, feature: str, stage: Optional[str] = None,
+                                  sector: Optional[str] = None, bins: int = 20):
+    """Mean SHAP value of one feature across its values"""
+    if not 1 <= bins <= 100:
+        raise HTTPException(status_code=400, detail="bins must be between 1 and 100")
+    return shap_summary_query(get_shap_summaries().dependence, model, feature,
+                              stage=stage, sector=sector, bins=bins)
+
+
+@app.get("/explain/summary/{model}/interactions")
+async def shap_summary_interactions(model: str, stage: Optional[str] = None, sector: Optional[str] = None,
+                                    top_n: int = 10):
+    """Strongest feature interactions in the global or segment SHAP interaction values"""
+    return shap_summary_query(get_shap_summaries().interactions, model, stage=stage, sector=sector, top_n=top_n)
+
+
 @app.get("/test_response")
 async def test_response():
     """Test endpoint to verify response structure"""
@@ -1227,6 +1524,65 @@ async def get_features():
     }
 
 
+@app.get("/admin/profiles")
+async def list_profiles(request: Request):
+    """List recently captured request profiles (admin only)"""
+    require_admin(request)
+    return {
+        "enabled": settings.ENABLE_PROFILING,
+        "mode": settings.PROFILE_MODE,
+        "sample_rate": settings.PROFILE_SAMPLE_RATE,
+        "profiles": PROFILE_STORE.list()
+    }
+
+
+@app.get("/admin/profiles/{profile_id}")
+async def download_profile(request: Request, profile_id: str, format: str = "raw"):
+    """Download a stored profile as raw pstats/collapsed stacks or a text report (admin only)"""
+    require_admin(request)
+    metadata = PROFILE_STORE.get(profile_id)
+    if metadata is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    path = PROFILE_STORE.path_for(metadata)
+    if format == "text" and metadata['mode'] == 'cprofile':
+        return PlainTextResponse(RequestProfiler.format_stats(path))
+    return FileResponse(path, filename=metadata['file'], media_type="application/octet-stream")
+
+
+@app.get("/admin/memory")
+async def memory_report(request: Request):
+    """Per-family model footprint: disk size, in-memory size and RSS growth at load (admin only)"""
+    require_admin(request)
+    return build_report(loaded_model_families(), MEMORY_LEDGER)
+
+
+@app.get("/admin/models/cache")
+async def model_cache_report(request: Request):
+    """Industry model cache hits, misses, evictions and load times (admin only)"""
+    require_admin(request)
+    if INDUSTRY_MODEL is None:
+        raise HTTPException(status_code=503, detail="Industry models not loaded")
+    return {'industry': INDUSTRY_MODEL.cache_stats()}
+
+
+@app.post("/admin/memory/tracemalloc")
+async def start_allocation_sampling(request: Request, requests: int = 20):
+    """Open a tracemalloc window covering the next N requests (admin only)"""
+    require_admin(request)
+    if not 1 <= requests <= 1000:
+        raise HTTPException(status_code=400, detail="requests must be between 1 and 1000")
+    ALLOCATION_SAMPLER.start(max_requests=requests)
+    return ALLOCATION_SAMPLER.report()
+
+
+@app.get("/admin/memory/tracemalloc")
+async def allocation_sampling_report(request: Request, top: int = 20):
+    """Top per-request allocation sites from the current or last sampling window (admin only)"""
+    require_admin(request)
+    return ALLOCATION_SAMPLER.report(top=top)
+
+
 if __name__ == "__main__":
     import uvicorn
     
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark full-batch against streaming DNA pattern training
+Builds a larger dataset by resampling the training CSV, then trains both ways
+and compares wall time, peak traced memory and the fitted pattern space
+"""
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from dna_pattern_analysis import StartupDNAAnalyzer, csv_chunks
+
+
+def resampled_dataset(source: str, rows: int, path: Path) -> None:
+    """Write `rows` bootstrap rows of `source` with small numeric jitter and unique ids"""
+    df = pd.read_csv(source)
+    rng = np.random.default_rng(0)
+    sample = df.iloc[rng.integers(0, len(df), rows)].reset_index(drop=True)
+    numeric = [c for c in sample.select_dtypes('number').columns if c != 'success']
+    sample[numeric] = sample[numeric] * rng.normal(1, 0.02, (rows, len(numeric)))
+    sample['startup_id'] = [f"s{i}" for i in range(rows)]
+    sample.to_csv(path, index=False)
+
+
+def full_batch(path: Path) -> StartupDNAAnalyzer:
+    df = pd.read_csv(path).set_index('startup_id')
+    analyzer = StartupDNAAnalyzer()
+    analyzer.train(df.drop(columns=['success', 'startup_name'], errors='ignore'), df['success'])
+    return analyzer
+
+
+def streaming(path: Path, chunksize: int) -> StartupDNAAnalyzer:
+    analyzer = StartupDNAAnalyzer()
+    analyzer.train_streaming(csv_chunks(path, chunksize=chunksize))
+    return analyzer
+
+
+def measure(label: str, fn) -> dict:
+    tracemalloc.start()
+    started = time.perf_counter()
+    analyzer = fn()
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'trainer': label, 'seconds': seconds, 'peak_mb': peak / 2**20, 'analyzer': analyzer}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DNA pattern training benchmark")
+    parser.add_argument('--data', default='data/final_100k_dataset_45features.csv')
+    parser.add_argument('--rows', type=int, default=500_000)
+    parser.add_argument('--chunksize', type=int, default=50_000)
+    args = parser.parse_args()
+
+    if not Path(args.data).exists():
+        args.data = 'data/final_sample_1000.csv'
+
+    with tempfile.TemporaryDirectory(prefix='dna_bench_') as workdir:
+        path = Path(workdir) / 'dna_training.csv'
+        resampled_dataset(args.data, args.rows, path)
+        results = [
+            measure('full_batch', lambda: full_batch(path)),
+            measure(f'streaming ({args.chunksize} rows)', lambda: streaming(path, args.chunksize))
+        ]
+
+    full, streamed = (result.pop('analyzer') for result in results)
+    table = pd.DataFrame(results).set_index('trainer')
+    print(f"Data: {args.rows} rows resampled from {args.data}")
+    print(table.round(2).to_string())
+    variance_gap = np.abs(full.pca.explained_variance_ratio_ - streamed.pca.explained_variance_ratio_).max()
+    print(f"Max explained-variance-ratio difference: {variance_gap:.2e}")
+    print(f"Patterns: full_batch={sorted(full.pattern_library)} streaming={sorted(streamed.pattern_library)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark SHAP explainer backends on the CatBoost pillar and meta models
+Times explainer construction, single-row and batch SHAP computation per model
+for shap's TreeExplainer and CatBoost's native exact and approximate modes,
+and compares each backend's values with the shap library's
+"""
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from shap_explainer import PILLARS, FLASHExplainer, _model_input, _positive_class
+
+BACKENDS = {
+    'shap': dict(backend='shap'),
+    'catboost': dict(backend='catboost'),
+    'catboost_approximate': dict(backend='catboost', approximate=True)
+}
+
+
+def median_seconds(fn, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def model_inputs(explainer: FLASHExplainer, rows: list) -> dict:
+    """Each model's input matrix for the rows, meta inputs taken from one explanation pass"""
+    inputs = {
+        pillar: _model_input(explainer.models[pillar], names, [[row.get(f, 0) for f in names] for row in rows])
+        for pillar, names in explainer.feature_names.items() if pillar in explainer.models
+    }
+    if 'meta' in explainer.models:
+        meta_names = explainer._meta_feature_names()
+        meta_values = [explanation['meta_explanation']['feature_values'] for explanation in explainer.explain_batch(rows)]
+        inputs['meta'] = _model_input(explainer.models['meta'], meta_names, meta_values)
+    return inputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SHAP explainer backend benchmark")
+    parser.add_argument('--models', default='models/v2')
+    parser.add_argument('--data', default='data/final_100k_dataset_45features.csv')
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--threads', type=int, default=-1, help="CatBoost thread count (-1 = all cores)")
+    parser.add_argument('--repeats', type=int, default=10)
+    args = parser.parse_args()
+
+    if not Path(args.data).exists():
+        args.data = 'data/final_sample_1000.csv'
+    rows = pd.read_csv(args.data, nrows=args.rows).to_dict('records')
+
+    explainers, build_seconds = {}, {}
+    for name, options in BACKENDS.items():
+        started = time.perf_counter()
+        explainers[name] = FLASHExplainer(args.models, thread_count=args.threads, **options)
+        build_seconds[name] = time.perf_counter() - started
+
+    inputs = model_inputs(explainers['shap'], rows)
+    reference = {model: _positive_class(explainers['shap'].explainers[model].shap_values(X))
+                 for model, X in inputs.items()}
+
+    results = []
+    for name, explainer in explainers.items():
+        for model, X in inputs.items():
+            shap_values = explainer.explainers[model].shap_values
+            single = X[:1]
+            values = _positive_class(shap_values(X))
+            results.append({
+                'backend': name,
+                'model': model,
+                'build_s': build_seconds[name],
+                'single_row_ms': median_seconds(lambda: shap_values(single), args.repeats) * 1000,
+                f'batch_{len(rows)}_ms': median_seconds(lambda: shap_values(X), args.repeats) * 1000,
+                'max_abs_diff': float(np.abs(values - reference[model]).max()),
+                'correlation': float(np.corrcoef(values.ravel(), reference[model].ravel())[0, 1])
+            })
+
+    print(f"Models: {args.models} ({', '.join(m for m in PILLARS + ['meta'] if m in inputs)}), "
+          f"data: {args.data} ({len(rows)} rows), threads={args.threads}")
+    print(pd.DataFrame(results).set_index(['backend', 'model']).round(4).to_string())
+
+
+if __name__ == "__main__":
+    main()
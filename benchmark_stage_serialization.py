@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark joblib pickles against native-format stage models
+Trains the stage hierarchy once, saves it both ways and compares
+on-disk size, load time and prediction latency
+"""
+import argparse
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from stage_hierarchical_models import StageHierarchicalModel
+from train_stage_hierarchical_models import load_and_prepare_data
+
+
+def median_seconds(fn, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def directory_bytes(path: Path) -> int:
+    return sum(f.stat().st_size for f in Path(path).rglob('*') if f.is_file())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stage model serialization benchmark")
+    parser.add_argument('--data', default='data/final_100k_dataset_45features.csv')
+    parser.add_argument('--rows', type=int, default=20000, help="training rows to sample")
+    parser.add_argument('--repeats', type=int, default=20)
+    args = parser.parse_args()
+
+    if not Path(args.data).exists():
+        args.data = 'data/final_sample_1000.csv'
+    X, y, _ = load_and_prepare_data(args.data)
+    if len(X) > args.rows:
+        X, y = X.sample(args.rows, random_state=42), y.sample(args.rows, random_state=42)
+
+    model = StageHierarchicalModel()
+    model.train_stage_models(X, y)
+    model.train_meta_model(X, y, n_folds=0)
+
+    workdir = Path(tempfile.mkdtemp(prefix='stage_bench_'))
+    batch = X.head(1000)
+    single = X.head(1)
+    results = []
+    try:
+        for label, native in (('pickle', False), ('native', True)):
+            target = workdir / label
+            model.save_models(target, native=native)
+
+            def load():
+                loaded = StageHierarchicalModel()
+                loaded.load_models(target)
+                return loaded
+
+            loaded = load()
+            loaded.predict_proba(single)  # warm-up
+            results.append({
+                'format': label,
+                'disk_kb': directory_bytes(target) / 1024,
+                'load_ms': median_seconds(load, max(3, args.repeats // 4)) * 1000,
+                'single_row_ms': median_seconds(lambda: loaded.predict_proba(single), args.repeats) * 1000,
+                'batch_1000_ms': median_seconds(lambda: loaded.predict_proba(batch), args.repeats) * 1000,
+                'predictions': loaded.predict_proba(batch)[:, 1]
+            })
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    max_diff = abs(results[0]['predictions'] - results[1]['predictions']).max()
+    table = pd.DataFrame(results).drop(columns='predictions').set_index('format')
+    print(f"Data: {args.data} ({len(X)} training rows)")
+    print(table.round(2).to_string())
+    print(f"Max |pickle - native| probability difference: {max_diff:.2e}")
+
+
+if __name__ == "__main__":
+    main()
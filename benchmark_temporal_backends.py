@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark temporal model backends for one horizon
+Trains each backend on the same temporal features and reports training time,
+inference latency and held-out AUC side by side
+"""
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import roc_auc_score
+from threadpoolctl import threadpool_limits
+
+from temporal_models import HORIZONS, TEMPORAL_BACKENDS, TemporalPredictionModel
+
+
+def median_seconds(fn, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def resample(df: pd.DataFrame, rows: int, seed: int) -> pd.DataFrame:
+    """Bootstrap rows with small numeric jitter, standing in for a larger dataset"""
+    rng = np.random.default_rng(seed)
+    sample = df.iloc[rng.integers(0, len(df), rows)].reset_index(drop=True)
+    numeric = [c for c in sample.select_dtypes('number').columns if c != 'success']
+    sample[numeric] = sample[numeric] * rng.normal(1, 0.02, (rows, len(numeric)))
+    return sample
+
+
+def load_splits(data: str, rows: int):
+    """Train/test split of the source rows first, so resampled duplicates never cross it"""
+    df = pd.read_csv(data)
+    if len(df) >= rows:
+        df = df.sample(rows, random_state=42)
+        return df.iloc[:int(rows * 0.8)], df.iloc[int(rows * 0.8):]
+    test_mask = np.random.default_rng(42).random(len(df)) < 0.2
+    return resample(df[~test_mask], int(rows * 0.8), seed=1), resample(df[test_mask], int(rows * 0.2), seed=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Temporal backend benchmark")
+    parser.add_argument('--data', default='data/final_100k_dataset_45features.csv')
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--horizon', default='short_term', choices=HORIZONS)
+    parser.add_argument('--backends', default='gradient_boosting,hist_gradient_boosting,catboost')
+    parser.add_argument('--threads', type=int, default=None, help="thread cap for training and inference")
+    parser.add_argument('--repeats', type=int, default=20)
+    args = parser.parse_args()
+
+    if not Path(args.data).exists():
+        args.data = 'data/final_sample_1000.csv'
+    train, test = load_splits(args.data, args.rows)
+
+    results = []
+    for backend in args.backends.split(','):
+        if backend not in TEMPORAL_BACKENDS:
+            parser.error(f"unknown backend {backend!r}")
+        model = TemporalPredictionModel(backends={args.horizon: backend}, thread_count=args.threads)
+        X_train = model.build_temporal_features(train).frame(args.horizon)
+        X_test = model.build_temporal_features(test).frame(args.horizon)
+        estimator = TEMPORAL_BACKENDS[backend](args.threads)
+
+        with threadpool_limits(limits=args.threads):
+            started = time.perf_counter()
+            estimator.fit(X_train, train['success'])
+            train_seconds = time.perf_counter() - started
+
+            single, batch = X_test.head(1), X_test.head(1000)
+            estimator.predict_proba(single)  # warm-up
+            results.append({
+                'backend': backend,
+                'train_s': train_seconds,
+                'single_row_ms': median_seconds(lambda: estimator.predict_proba(single), args.repeats) * 1000,
+                'batch_1000_ms': median_seconds(lambda: estimator.predict_proba(batch), args.repeats) * 1000,
+                'auc': roc_auc_score(test['success'], estimator.predict_proba(X_test)[:, 1])
+            })
+
+    print(f"Data: {args.data} ({len(train)} train / {len(test)} test rows), horizon={args.horizon}, "
+          f"threads={args.threads or 'default'}")
+    print(pd.DataFrame(results).set_index('backend').round(4).to_string())
+
+
+if __name__ == "__main__":
+    main()
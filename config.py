@@ -36,7 +36,13 @@ class Settings:
     # Model Settings
     MODEL_BASE_PATH: str = os.getenv("MODEL_BASE_PATH", "models/v2_enhanced")
     PILLAR_MODEL_PATH: str = os.getenv("PILLAR_MODEL_PATH", "models/v2")
-    MODEL_CACHE_SIZE: int = int(os.getenv("MODEL_CACHE_SIZE", "5"))
+    MODEL_CACHE_SIZE: int = int(os.getenv("MODEL_CACHE_SIZE", "5"))  # resident industry models (0 = unbounded)
+    INDUSTRY_PRELOAD_TOP_N: int = int(os.getenv("INDUSTRY_PRELOAD_TOP_N", "0"))
+    # Temporal model backend per horizon, e.g. "short_term=hist_gradient_boosting" (unset = defaults)
+    TEMPORAL_BACKENDS: str = os.getenv("TEMPORAL_BACKENDS", "")
+    TEMPORAL_THREAD_COUNT: Optional[int] = int(os.getenv("TEMPORAL_THREAD_COUNT", "0")) or None
+    # Threads shared by parallel stage/industry/temporal segment training (0 = all cores)
+    TRAINING_CPU_BUDGET: int = int(os.getenv("TRAINING_CPU_BUDGET", "0"))
     
     # Logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
@@ -52,14 +58,40 @@ class Settings:
     # Feature Flags
     ENABLE_EXPLANATION_API: bool = os.getenv("ENABLE_EXPLANATION_API", "true").lower() == "true"
     ENABLE_BATCH_PREDICTIONS: bool = os.getenv("ENABLE_BATCH_PREDICTIONS", "false").lower() == "true"
+    # Built SHAP explainers, keyed by model file hash and shap version
+    EXPLAINER_CACHE_DIR: str = os.getenv("EXPLAINER_CACHE_DIR", "models/explainer_cache")
+    # "catboost" computes CatBoost models' SHAP values natively, "shap" uses shap.TreeExplainer
+    EXPLAINER_BACKEND: str = os.getenv("EXPLAINER_BACKEND", "catboost")
+    EXPLAINER_APPROXIMATE: bool = os.getenv("EXPLAINER_APPROXIMATE", "false").lower() == "true"
+    EXPLAINER_THREAD_COUNT: int = int(os.getenv("EXPLAINER_THREAD_COUNT", "-1"))  # -1 = all cores
+    # Explanation plots, rendered on demand and cached by explanation hash
+    PLOT_CACHE_DIR: str = os.getenv("PLOT_CACHE_DIR", "plot_cache")
+    PLOT_FORMAT: str = os.getenv("PLOT_FORMAT", "svg")  # svg or png
+    PLOT_RENDER_WORKERS: int = int(os.getenv("PLOT_RENDER_WORKERS", "2"))  # 0 = render in the request thread
+    PLOT_CACHE_MAX_EXPLANATIONS: int = int(os.getenv("PLOT_CACHE_MAX_EXPLANATIONS", "1000"))
+    # Dataset-wide SHAP arrays written by shap_summaries.py
+    SHAP_SUMMARY_DIR: str = os.getenv("SHAP_SUMMARY_DIR", "models/shap_summaries")
     
     # Validation Limits
     MAX_REQUEST_SIZE: int = int(os.getenv("MAX_REQUEST_SIZE", "1048576"))  # 1MB
     MAX_BATCH_SIZE: int = int(os.getenv("MAX_BATCH_SIZE", "100"))
+    # /explain/batch takes whole portfolios; one SHAP pass per model keeps large batches cheap
+    MAX_EXPLAIN_BATCH_SIZE: int = int(os.getenv("MAX_EXPLAIN_BATCH_SIZE", "1000"))
     
     # API Keys (for production)
     API_KEYS: List[str] = [k.strip() for k in os.getenv("API_KEYS", "").split(",") if k.strip()]
-    
+    ADMIN_API_KEYS: List[str] = [k.strip() for k in os.getenv("ADMIN_API_KEYS", "").split(",") if k.strip()]
+    # Open admin endpoints without a key when none are configured (local use only)
+    ADMIN_ALLOW_UNAUTHENTICATED: bool = os.getenv("ADMIN_ALLOW_UNAUTHENTICATED", "false").lower() == "true"
+
+    # Request Profiling (admin only, disabled by default)
+    ENABLE_PROFILING: bool = os.getenv("ENABLE_PROFILING", "false").lower() == "true"
+    PROFILE_HEADER: str = "X-Profile-Request"
+    PROFILE_MODE: str = os.getenv("PROFILE_MODE", "cprofile")  # cprofile or sampling
+    PROFILE_SAMPLE_RATE: float = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+    PROFILE_DIR: str = os.getenv("PROFILE_DIR", "profiles")
+    PROFILE_MAX_FILES: int = int(os.getenv("PROFILE_MAX_FILES", "50"))
+
     @classmethod
     def is_production(cls) -> bool:
         """Check if running in production"""
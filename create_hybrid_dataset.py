@@ -2,24 +2,72 @@
 """
 Create a large-scale hybrid dataset using real company data from public sources
 combined with intelligently generated metrics based on industry patterns.
+
+Metrics are drawn column by column with NumPy for whole blocks of companies at
+once, so millions of rows take seconds; output is reproducible from the seed.
 """
-import numpy as np
-import pandas as pd
+import argparse
 import json
-import random
-from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional
-import requests
 import time
+from datetime import datetime
+from typing import Dict, Iterator, List
+
+import numpy as np
+import pandas as pd
+
+# Well-known companies placed at the start of every dataset
+KNOWN_COMPANIES = [
+    # Fortune 500 tech companies (public data)
+    {"name": "Microsoft", "sector": "SaaS", "founded": 1975, "stage": "Public"},
+    {"name": "Apple", "sector": "Other", "founded": 1976, "stage": "Public"},
+    {"name": "Amazon", "sector": "E-commerce", "founded": 1994, "stage": "Public"},
+    {"name": "Google", "sector": "AI/ML", "founded": 1998, "stage": "Public"},
+    {"name": "Meta", "sector": "Other", "founded": 2004, "stage": "Public"},
+    # Well-known unicorns
+    {"name": "Stripe", "sector": "FinTech", "founded": 2010, "stage": "Series C+"},
+    {"name": "SpaceX", "sector": "Other", "founded": 2002, "stage": "Series C+"},
+    {"name": "Databricks", "sector": "AI/ML", "founded": 2013, "stage": "Series C+"},
+    {"name": "Canva", "sector": "SaaS", "founded": 2013, "stage": "Series C+"},
+    {"name": "Discord", "sector": "Other", "founded": 2015, "stage": "Series C+"},
+]
+
+# Common startup name patterns
+NAME_PREFIXES = ["Cloud", "Data", "Smart", "Next", "First", "Prime", "Core", "Edge",
+                 "Quantum", "Rapid", "Swift", "Bright", "Clear", "Pure", "True"]
+NAME_SUFFIXES = ["Tech", "Labs", "Works", "Hub", "Base", "Flow", "Mind", "Soft",
+                 "Solutions", "Systems", "Platform", "Network", "Digital", "AI"]
+NAME_DOMAINS = ["Health", "Fin", "Ed", "Bio", "Cyber", "Green", "Auto", "Space",
+                "Food", "Travel", "Real Estate", "Legal", "HR", "Marketing"]
+
+# Realistic stage distribution, Pre-seed to Series C+
+STAGE_WEIGHTS = [0.15, 0.30, 0.30, 0.20, 0.05]
+# Sector distribution based on market reality, in sector profile order
+SECTOR_WEIGHTS = [0.25, 0.15, 0.10, 0.10, 0.15, 0.05, 0.08, 0.05, 0.05, 0.02]
+
+# Companies generated per block; blocks draw from their own seeded streams
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+
+def _table(mapping: Dict, keys: List[str], default=np.nan) -> np.ndarray:
+    """Lookup array indexed by category code"""
+    return np.array([mapping.get(key, default) for key in keys])
+
+
+def _choose(rng: np.random.Generator, labels: List, probabilities: np.ndarray) -> np.ndarray:
+    """One draw per row from labels with per-row probabilities of shape (rows, labels)"""
+    cumulative = np.cumsum(probabilities, axis=1)
+    picks = (rng.random((len(probabilities), 1)) > cumulative[:, :-1]).sum(axis=1)
+    return np.asarray(labels, dtype=object)[picks]
 
-# Set seed for reproducibility
-np.random.seed(42)
-random.seed(42)
 
 class HybridDatasetGenerator:
     """Generate hybrid dataset with real companies and synthetic metrics."""
     
-    def __init__(self):
+    def __init__(self, seed: int = 42, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        # Output depends only on (seed, chunk_rows, row count)
+        self.seed = seed
+        self.chunk_rows = chunk_rows
+        
         # Sector profiles based on real industry data
         self.sector_profiles = {
             "SaaS": {
@@ -128,429 +176,387 @@ class HybridDatasetGenerator:
             }
         }
         
-        # Real company data sources (simplified for demonstration)
-        self.real_companies = self._load_real_companies()
+        self.sectors = list(self.sector_profiles)
+        self.stages = list(self.stage_profiles)
+        
+        # Base performance by stage
+        self.stage_base_performance = {
+            "Pre-seed": 0.5,
+            "Seed": 0.55,
+            "Series A": 0.65,
+            "Series B": 0.75,
+            "Series C+": 0.85
+        }
+        # Sector performance multipliers
+        self.sector_performance = {
+            "AI/ML": 1.1,
+            "SaaS": 1.05,
+            "FinTech": 1.0,
+            "HealthTech": 0.95,
+            "E-commerce": 0.9,
+            "Other": 0.85
+        }
+        # Monthly burn as a share of funding raised
+        self.stage_burn_ratio = {
+            "Pre-seed": 0.08,
+            "Seed": 0.06,
+            "Series A": 0.05,
+            "Series B": 0.04,
+            "Series C+": 0.03
+        }
+        # Revenue as multiple of burn
+        self.stage_revenue_multiple = {
+            "Pre-seed": 0.1,
+            "Seed": 0.3,
+            "Series A": 0.8,
+            "Series B": 1.5,
+            "Series C+": 2.5
+        }
+        # Founding year range, in years before the current year
+        self.stage_age_years = {
+            "Pre-seed": (0, 2),
+            "Seed": (1, 4),
+            "Series A": (2, 7),
+            "Series B": (4, 10),
+            "Series C+": (6, 20)
+        }
+        # Total Addressable Market by sector
+        self.sector_tam = {
+            "AI/ML": (1e10, 5e11),
+            "FinTech": (5e10, 1e12),
+            "HealthTech": (1e11, 5e12),
+            "E-commerce": (5e11, 2e12),
+            "SaaS": (1e10, 5e11),
+            "Other": (1e9, 1e11)
+        }
+        # Base success rates by stage (industry averages)
+        self.stage_success_rate = {
+            "Pre-seed": 0.10,
+            "Seed": 0.20,
+            "Series A": 0.35,
+            "Series B": 0.50,
+            "Series C+": 0.70
+        }
     
-    def _load_real_companies(self) -> List[Dict]:
-        """Load real company data from various sources."""
+    def _generate_companies(self, rng: np.random.Generator, start: int, n: int) -> pd.DataFrame:
+        """
+        Names, sectors, founding years and stages of companies start..start+n.
+        Stages and sectors are returned as codes into self.stages / self.sectors.
+        """
         # This is a simplified version. In production, you would:
         # 1. Load from Crunchbase CSV exports
         # 2. Parse AngelList data
         # 3. Scrape public LinkedIn company pages
         # 4. Use SEC EDGAR API for public companies
         
-        # For now, we'll create a realistic distribution of company types
-        companies = []
-        
-        # Fortune 500 tech companies (public data)
-        tech_giants = [
-            {"name": "Microsoft", "sector": "SaaS", "founded": 1975, "stage": "Public"},
-            {"name": "Apple", "sector": "Other", "founded": 1976, "stage": "Public"},
-            {"name": "Amazon", "sector": "E-commerce", "founded": 1994, "stage": "Public"},
-            {"name": "Google", "sector": "AI/ML", "founded": 1998, "stage": "Public"},
-            {"name": "Meta", "sector": "Other", "founded": 2004, "stage": "Public"},
-        ]
-        
-        # Well-known unicorns
-        unicorns = [
-            {"name": "Stripe", "sector": "FinTech", "founded": 2010, "stage": "Series C+"},
-            {"name": "SpaceX", "sector": "Other", "founded": 2002, "stage": "Series C+"},
-            {"name": "Databricks", "sector": "AI/ML", "founded": 2013, "stage": "Series C+"},
-            {"name": "Canva", "sector": "SaaS", "founded": 2013, "stage": "Series C+"},
-            {"name": "Discord", "sector": "Other", "founded": 2015, "stage": "Series C+"},
-        ]
-        
-        # Generate variations and similar companies
-        sectors = list(self.sector_profiles.keys())
-        stages = ["Pre-seed", "Seed", "Series A", "Series B", "Series C+"]
-        
-        # Common startup name patterns
-        prefixes = ["Cloud", "Data", "Smart", "Next", "First", "Prime", "Core", "Edge", 
-                   "Quantum", "Rapid", "Swift", "Bright", "Clear", "Pure", "True"]
-        suffixes = ["Tech", "Labs", "Works", "Hub", "Base", "Flow", "Mind", "Soft",
-                   "Solutions", "Systems", "Platform", "Network", "Digital", "AI"]
-        domains = ["Health", "Fin", "Ed", "Bio", "Cyber", "Green", "Auto", "Space",
-                  "Food", "Travel", "Real Estate", "Legal", "HR", "Marketing"]
-        
-        # Generate 100,000 companies with realistic distributions
-        print("Generating company list...")
-        
-        # Add known companies
-        companies.extend(tech_giants)
-        companies.extend(unicorns)
-        
-        # Generate the rest
-        for i in range(99990):
-            # Create realistic company names
-            if random.random() < 0.3:
-                # Domain-specific name
-                name = f"{random.choice(domains)}{random.choice(suffixes)}"
-            elif random.random() < 0.6:
-                # Prefix-suffix pattern
-                name = f"{random.choice(prefixes)}{random.choice(suffixes)}"
-            else:
-                # Creative name
-                name = f"{random.choice(prefixes)}{random.choice(domains)}"
-            
-            # Add unique identifier to avoid duplicates
-            name = f"{name}_{i}"
-            
-            # Realistic stage distribution
-            stage_weights = [0.15, 0.30, 0.30, 0.20, 0.05]  # Pre-seed to Series C+
-            stage = np.random.choice(stages, p=stage_weights)
-            
-            # Sector distribution based on market reality
-            sector_weights = [0.25, 0.15, 0.10, 0.10, 0.15, 0.05, 0.08, 0.05, 0.05, 0.02]
-            sector = np.random.choice(sectors, p=sector_weights)
-            
-            # Founding year distribution (more recent = more likely)
-            current_year = datetime.now().year
-            if stage == "Pre-seed":
-                founded = random.randint(current_year - 2, current_year)
-            elif stage == "Seed":
-                founded = random.randint(current_year - 4, current_year - 1)
-            elif stage == "Series A":
-                founded = random.randint(current_year - 7, current_year - 2)
-            elif stage == "Series B":
-                founded = random.randint(current_year - 10, current_year - 4)
-            else:  # Series C+
-                founded = random.randint(current_year - 20, current_year - 6)
-            
-            companies.append({
-                "name": name,
-                "sector": sector,
-                "founded": founded,
-                "stage": stage
-            })
-            
-            if (i + 1) % 10000 == 0:
-                print(f"  Generated {i + 11} companies...")
-        
+        # Create realistic company names: domain-specific, prefix-suffix or creative
+        pattern = rng.random(n)
+        second = rng.random(n)
+        prefix = np.asarray(NAME_PREFIXES, dtype=object)[rng.integers(0, len(NAME_PREFIXES), n)]
+        suffix = np.asarray(NAME_SUFFIXES, dtype=object)[rng.integers(0, len(NAME_SUFFIXES), n)]
+        domain = np.asarray(NAME_DOMAINS, dtype=object)[rng.integers(0, len(NAME_DOMAINS), n)]
+        domain_name = pattern < 0.3
+        first = np.where(domain_name, domain, prefix)
+        last = np.where(domain_name | (second < 0.6), suffix, domain)
+        # Add unique identifier to avoid duplicates
+        serial = pd.Series(np.arange(start, start + n) - len(KNOWN_COMPANIES)).astype(str)
+        names = pd.Series(first + last) + "_" + serial
+        
+        stage = rng.choice(len(self.stages), size=n, p=STAGE_WEIGHTS)
+        sector = rng.choice(len(self.sectors), size=n, p=SECTOR_WEIGHTS)
+        
+        # Founding year distribution (more recent = more likely)
+        current_year = datetime.now().year
+        oldest = _table({s: a[1] for s, a in self.stage_age_years.items()}, self.stages)[stage]
+        newest = _table({s: a[0] for s, a in self.stage_age_years.items()}, self.stages)[stage]
+        founded = current_year - rng.integers(newest, oldest + 1)
+        
+        companies = pd.DataFrame({"name": names, "sector": sector, "founded": founded, "stage": stage})
+        
+        # Add known companies at the start of the dataset
+        known = max(0, min(len(KNOWN_COMPANIES) - start, n))
+        if known:
+            listed = pd.DataFrame(KNOWN_COMPANIES[start:start + known])
+            companies.loc[:known - 1, "name"] = listed["name"].to_numpy()
+            companies.loc[:known - 1, "founded"] = listed["founded"].to_numpy()
+            companies.loc[:known - 1, "sector"] = [self.sectors.index(s) for s in listed["sector"]]
+            # Public companies get stage code -1
+            companies.loc[:known - 1, "stage"] = [self.stages.index(s) if s in self.stages else -1
+                                                  for s in listed["stage"]]
         return companies
     
-    def generate_company_metrics(self, company: Dict) -> Dict:
-        """Generate realistic metrics for a company based on its profile."""
-        sector = company["sector"]
-        stage = company["stage"]
+    def generate_company_metrics(self, rng: np.random.Generator, companies: pd.DataFrame) -> pd.DataFrame:
+        """Generate realistic metrics for a block of companies based on their profiles."""
+        n = len(companies)
+        sector_code = companies["sector"].to_numpy()
+        stage_code = companies["stage"].to_numpy()
+        sector = np.asarray(self.sectors, dtype=object)[sector_code]
+        stage = np.asarray(self.stages, dtype=object)[stage_code]
+        
+        def by_stage(key):
+            return np.array([self.stage_profiles[s][key] for s in self.stages])[stage_code]
         
-        # Handle public companies differently
-        if stage == "Public":
-            return self._generate_public_company_metrics(company)
+        def by_sector(key):
+            return np.array([self.sector_profiles[s][key] for s in self.sectors])[sector_code]
         
-        sector_profile = self.sector_profiles[sector]
-        stage_profile = self.stage_profiles[stage]
+        def uniform(ranges):
+            return rng.uniform(ranges[:, 0], ranges[:, 1])
         
-        # Determine company performance archetype
-        performance = self._determine_performance_archetype(sector, stage)
+        # Determine company performance archetype on a 0-1 scale
+        performance = self._determine_performance_archetype(rng, sector_code, stage_code)
         
         # Generate correlated metrics
         metrics = {
-            "startup_id": f"id_{hash(company['name']) % 1000000}",
-            "startup_name": company["name"],
+            "startup_id": "id_" + (pd.util.hash_pandas_object(companies["name"], index=False).to_numpy()
+                                   % 1000000).astype(str).astype(object),
+            "startup_name": companies["name"].to_numpy(),
             "sector": sector,
-            "founding_year": company["founded"],
+            "founding_year": companies["founded"].to_numpy(),
             "funding_stage": stage,
         }
         
         # Capital metrics
-        total_funding = np.random.uniform(*stage_profile["funding_range"])
-        burn_rate = self._calculate_burn_rate(total_funding, stage, performance)
-        revenue = self._calculate_revenue(burn_rate, stage, performance, sector)
+        total_funding = uniform(by_stage("funding_range"))
+        burn_rate = self._calculate_burn_rate(total_funding, stage_code, performance)
+        revenue = self._calculate_revenue(rng, burn_rate, stage_code, performance, sector)
         
-        cash_on_hand = int(total_funding * np.random.uniform(0.3, 0.7))
-        runway_months = cash_on_hand / burn_rate if burn_rate > 0 else 24
+        cash_on_hand = (total_funding * rng.uniform(0.3, 0.7, n)).astype(np.int64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            runway_months = np.where(burn_rate > 0, cash_on_hand / burn_rate, 24)
+            burn_multiple = np.where(revenue > 0, burn_rate * 12 / revenue, 100)
+        revenue_growth = uniform(by_sector("growth_rate")) * performance * 100
         
         metrics.update({
-            "total_capital_raised_usd": int(total_funding),
+            "total_capital_raised_usd": total_funding.astype(np.int64),
             "cash_on_hand_usd": cash_on_hand,
-            "monthly_burn_usd": int(burn_rate),
-            "annual_revenue_run_rate": int(revenue),
-            "revenue_growth_rate_percent": self._calculate_growth_rate(performance, sector),
-            "gross_margin_percent": np.random.uniform(*sector_profile["gross_margin"]) * 100,
-            "burn_multiple": burn_rate * 12 / revenue if revenue > 0 else 100,
+            "monthly_burn_usd": burn_rate.astype(np.int64),
+            "annual_revenue_run_rate": revenue.astype(np.int64),
+            "revenue_growth_rate_percent": revenue_growth,
+            "gross_margin_percent": uniform(by_sector("gross_margin")) * 100,
+            "burn_multiple": burn_multiple,
             "runway_months": runway_months,
-            "ltv_cac_ratio": np.random.uniform(*sector_profile["ltv_cac"]) * performance,
-            "investor_tier_primary": self._assign_investor_tier(stage, performance),
-            "has_debt": random.random() < 0.3,
+            "ltv_cac_ratio": uniform(by_sector("ltv_cac")) * performance,
+            "investor_tier_primary": self._assign_investor_tier(rng, stage_code, performance),
+            "has_debt": rng.random(n) < 0.3,
         })
         
         # Market metrics
-        tam = self._calculate_tam(sector)
-        customer_count = np.random.randint(*stage_profile["customer_range"])
+        tam_ranges = _table(self.sector_tam, self.sectors, default=(1e9, 1e11))
+        tam = uniform(tam_ranges[sector_code])
+        customer_ranges = by_stage("customer_range")
+        customer_count = rng.integers(customer_ranges[:, 0], customer_ranges[:, 1])
         
         metrics.update({
-            "tam_size_usd": int(tam),
-            "sam_size_usd": int(tam * np.random.uniform(0.05, 0.20)),
-            "som_size_usd": int(tam * np.random.uniform(0.001, 0.05)),
-            "market_growth_rate_percent": np.random.uniform(*sector_profile["market_growth"]) * 100,
+            "tam_size_usd": tam.astype(np.int64),
+            "sam_size_usd": (tam * rng.uniform(0.05, 0.20, n)).astype(np.int64),
+            "som_size_usd": (tam * rng.uniform(0.001, 0.05, n)).astype(np.int64),
+            "market_growth_rate_percent": uniform(by_sector("market_growth")) * 100,
             "customer_count": customer_count,
-            "customer_concentration_percent": self._calculate_concentration(customer_count),
-            "user_growth_rate_percent": metrics["revenue_growth_rate_percent"] * np.random.uniform(0.8, 1.2),
+            "customer_concentration_percent": self._calculate_concentration(rng, customer_count),
+            "user_growth_rate_percent": revenue_growth * rng.uniform(0.8, 1.2, n),
             "net_dollar_retention_percent": 100 + (performance - 0.5) * 40,
-            "competition_intensity": np.random.uniform(2, 5),
-            "competitors_named_count": np.random.randint(5, 50),
-            "dau_mau_ratio": np.random.uniform(0.1, 0.6) * performance,
+            "competition_intensity": rng.uniform(2, 5, n),
+            "competitors_named_count": rng.integers(5, 50, n),
+            "dau_mau_ratio": rng.uniform(0.1, 0.6, n) * performance,
         })
         
         # People metrics
-        team_size = np.random.randint(*stage_profile["team_size"])
+        team_ranges = by_stage("team_size")
         
         metrics.update({
-            "founders_count": np.random.choice([1, 2, 3, 4], p=[0.2, 0.5, 0.25, 0.05]),
-            "team_size_full_time": team_size,
-            "years_experience_avg": np.random.uniform(3, 15) * performance,
-            "domain_expertise_years_avg": np.random.uniform(2, 12) * performance,
-            "prior_startup_experience_count": np.random.randint(0, 5),
-            "prior_successful_exits_count": np.random.choice([0, 1, 2], p=[0.7, 0.25, 0.05]),
-            "board_advisor_experience_score": np.random.uniform(1, 5) * performance,
-            "advisors_count": np.random.randint(0, 10),
-            "team_diversity_percent": np.random.uniform(20, 80),
-            "key_person_dependency": random.random() < 0.3,
+            "founders_count": rng.choice([1, 2, 3, 4], size=n, p=[0.2, 0.5, 0.25, 0.05]),
+            "team_size_full_time": rng.integers(team_ranges[:, 0], team_ranges[:, 1]),
+            "years_experience_avg": rng.uniform(3, 15, n) * performance,
+            "domain_expertise_years_avg": rng.uniform(2, 12, n) * performance,
+            "prior_startup_experience_count": rng.integers(0, 5, n),
+            "prior_successful_exits_count": rng.choice([0, 1, 2], size=n, p=[0.7, 0.25, 0.05]),
+            "board_advisor_experience_score": rng.uniform(1, 5, n) * performance,
+            "advisors_count": rng.integers(0, 10, n),
+            "team_diversity_percent": rng.uniform(20, 80, n),
+            "key_person_dependency": rng.random(n) < 0.3,
         })
         
         # Advantage metrics
-        is_tech_heavy = sector in ["AI/ML", "SaaS", "Cybersecurity", "BioTech"]
+        is_tech_heavy = np.isin(sector, ["AI/ML", "SaaS", "Cybersecurity", "BioTech"])
+        is_regulated = np.isin(sector, ["FinTech", "HealthTech", "BioTech"])
+        patents = rng.choice([0, 1, 2, 5, 10], size=n, p=[0.5, 0.2, 0.15, 0.1, 0.05])
         
         metrics.update({
-            "patent_count": np.random.choice([0, 1, 2, 5, 10], p=[0.5, 0.2, 0.15, 0.1, 0.05]) if is_tech_heavy else 0,
-            "network_effects_present": random.random() < (0.3 if performance > 0.7 else 0.1),
-            "has_data_moat": random.random() < (0.4 if is_tech_heavy else 0.2),
-            "regulatory_advantage_present": random.random() < (0.3 if sector in ["FinTech", "HealthTech", "BioTech"] else 0.1),
-            "tech_differentiation_score": np.random.uniform(1, 5) * performance,
-            "switching_cost_score": np.random.uniform(1, 5) * (performance + 0.2),
-            "brand_strength_score": np.random.uniform(1, 5) * performance,
-            "scalability_score": np.random.uniform(0.3, 1.0) * performance,
-            "product_stage": self._assign_product_stage(stage),
-            "product_retention_30d": np.random.uniform(0.4, 0.9) * performance,
-            "product_retention_90d": np.random.uniform(0.2, 0.7) * performance,
+            "patent_count": np.where(is_tech_heavy, patents, 0),
+            "network_effects_present": rng.random(n) < np.where(performance > 0.7, 0.3, 0.1),
+            "has_data_moat": rng.random(n) < np.where(is_tech_heavy, 0.4, 0.2),
+            "regulatory_advantage_present": rng.random(n) < np.where(is_regulated, 0.3, 0.1),
+            "tech_differentiation_score": rng.uniform(1, 5, n) * performance,
+            "switching_cost_score": rng.uniform(1, 5, n) * (performance + 0.2),
+            "brand_strength_score": rng.uniform(1, 5, n) * performance,
+            "scalability_score": rng.uniform(0.3, 1.0, n) * performance,
+            "product_stage": self._assign_product_stage(rng, stage_code),
+            "product_retention_30d": rng.uniform(0.4, 0.9, n) * performance,
+            "product_retention_90d": rng.uniform(0.2, 0.7, n) * performance,
         })
         
         # Success label based on performance and randomness
-        success_probability = self._calculate_success_probability(performance, stage, sector)
-        metrics["success"] = random.random() < success_probability
+        success_probability = self._calculate_success_probability(performance, stage_code, sector)
+        metrics["success"] = rng.random(n) < success_probability
         
-        return metrics
+        return pd.DataFrame(metrics)
     
-    def _determine_performance_archetype(self, sector: str, stage: str) -> float:
+    def _determine_performance_archetype(self, rng: np.random.Generator, sector_code: np.ndarray,
+                                         stage_code: np.ndarray) -> np.ndarray:
         """Determine company performance on a 0-1 scale."""
-        # Base performance by stage
-        stage_base = {
-            "Pre-seed": 0.5,
-            "Seed": 0.55,
-            "Series A": 0.65,
-            "Series B": 0.75,
-            "Series C+": 0.85
-        }
-        
-        # Sector multipliers
-        sector_mult = {
-            "AI/ML": 1.1,
-            "SaaS": 1.05,
-            "FinTech": 1.0,
-            "HealthTech": 0.95,
-            "E-commerce": 0.9,
-            "Other": 0.85
-        }
-        
-        base = stage_base.get(stage, 0.5)
-        mult = sector_mult.get(sector, 1.0)
+        base = _table(self.stage_base_performance, self.stages, default=0.5)[stage_code]
+        mult = _table(self.sector_performance, self.sectors, default=1.0)[sector_code]
         
         # Add randomness
-        performance = base * mult * np.random.uniform(0.5, 1.5)
+        performance = base * mult * rng.uniform(0.5, 1.5, len(stage_code))
         return np.clip(performance, 0.1, 1.0)
     
-    def _calculate_burn_rate(self, funding: float, stage: str, performance: float) -> float:
+    def _calculate_burn_rate(self, funding: np.ndarray, stage_code: np.ndarray,
+                             performance: np.ndarray) -> np.ndarray:
         """Calculate monthly burn rate based on funding and stage."""
-        stage_burn_ratio = {
-            "Pre-seed": 0.08,
-            "Seed": 0.06,
-            "Series A": 0.05,
-            "Series B": 0.04,
-            "Series C+": 0.03
-        }
-        
-        base_ratio = stage_burn_ratio.get(stage, 0.05)
+        base_ratio = _table(self.stage_burn_ratio, self.stages, default=0.05)[stage_code]
         # High performers burn more efficiently
         efficiency = 1.0 - (performance - 0.5) * 0.3
         
         return funding * base_ratio * efficiency
     
-    def _calculate_revenue(self, burn: float, stage: str, performance: float, sector: str) -> float:
+    def _calculate_revenue(self, rng: np.random.Generator, burn: np.ndarray, stage_code: np.ndarray,
+                           performance: np.ndarray, sector: np.ndarray) -> np.ndarray:
         """Calculate revenue based on burn rate and company profile."""
-        if stage == "Pre-seed" and random.random() > 0.3:
-            return 0
-        
-        # Revenue as multiple of burn
-        base_multiple = {
-            "Pre-seed": 0.1,
-            "Seed": 0.3,
-            "Series A": 0.8,
-            "Series B": 1.5,
-            "Series C+": 2.5
-        }
-        
-        multiple = base_multiple.get(stage, 1.0) * performance
+        multiple = _table(self.stage_revenue_multiple, self.stages, default=1.0)[stage_code] * performance
         
         # Some sectors have better unit economics
-        if sector in ["SaaS", "FinTech"]:
-            multiple *= 1.3
-        
-        return burn * multiple * 12  # Annualized
-    
-    def _calculate_growth_rate(self, performance: float, sector: str) -> float:
-        """Calculate revenue growth rate."""
-        base_growth = self.sector_profiles[sector]["growth_rate"]
-        return np.random.uniform(*base_growth) * performance * 100
-    
-    def _calculate_tam(self, sector: str) -> float:
-        """Calculate Total Addressable Market by sector."""
-        tam_ranges = {
-            "AI/ML": (1e10, 5e11),
-            "FinTech": (5e10, 1e12),
-            "HealthTech": (1e11, 5e12),
-            "E-commerce": (5e11, 2e12),
-            "SaaS": (1e10, 5e11),
-            "Other": (1e9, 1e11)
-        }
+        multiple = np.where(np.isin(sector, ["SaaS", "FinTech"]), multiple * 1.3, multiple)
         
-        tam_range = tam_ranges.get(sector, (1e9, 1e11))
-        return np.random.uniform(*tam_range)
+        # Most pre-seed companies have no revenue yet
+        pre_revenue = (stage_code == self.stages.index("Pre-seed")) & (rng.random(len(burn)) > 0.3)
+        return np.where(pre_revenue, 0, burn * multiple * 12)  # Annualized
     
-    def _calculate_concentration(self, customers: int) -> float:
+    def _calculate_concentration(self, rng: np.random.Generator, customers: np.ndarray) -> np.ndarray:
         """Calculate customer concentration percentage."""
-        if customers < 10:
-            return np.random.uniform(50, 90)
-        elif customers < 100:
-            return np.random.uniform(20, 50)
-        elif customers < 1000:
-            return np.random.uniform(10, 30)
-        else:
-            return np.random.uniform(5, 20)
+        low = np.select([customers < 10, customers < 100, customers < 1000], [50, 20, 10], 5)
+        high = np.select([customers < 10, customers < 100, customers < 1000], [90, 50, 30], 20)
+        return rng.uniform(low, high)
     
-    def _assign_investor_tier(self, stage: str, performance: float) -> str:
+    def _assign_investor_tier(self, rng: np.random.Generator, stage_code: np.ndarray,
+                              performance: np.ndarray) -> np.ndarray:
         """Assign investor tier based on stage and performance."""
-        if stage == "Pre-seed":
-            return np.random.choice(["Angel", "Unknown"], p=[0.7, 0.3])
-        elif stage == "Seed":
-            if performance > 0.7:
-                return np.random.choice(["Tier1", "Tier2", "Angel"], p=[0.3, 0.5, 0.2])
-            else:
-                return np.random.choice(["Tier2", "Angel", "Unknown"], p=[0.4, 0.4, 0.2])
-        else:  # Series A+
-            if performance > 0.8:
-                return np.random.choice(["Tier1", "Tier2"], p=[0.7, 0.3])
-            else:
-                return np.random.choice(["Tier1", "Tier2", "Unknown"], p=[0.3, 0.5, 0.2])
+        tiers = ["Tier1", "Tier2", "Angel", "Unknown"]
+        pre_seed = stage_code == self.stages.index("Pre-seed")
+        seed = stage_code == self.stages.index("Seed")
+        probabilities = np.select(
+            [pre_seed[:, None],
+             (seed & (performance > 0.7))[:, None],
+             seed[:, None],
+             (performance > 0.8)[:, None]],
+            [np.array([0.0, 0.0, 0.7, 0.3]),
+             np.array([0.3, 0.5, 0.2, 0.0]),
+             np.array([0.0, 0.4, 0.4, 0.2]),
+             np.array([0.7, 0.3, 0.0, 0.0])],
+            np.array([0.3, 0.5, 0.0, 0.2])  # Series A+
+        )
+        return _choose(rng, tiers, probabilities)
     
-    def _assign_product_stage(self, funding_stage: str) -> str:
+    def _assign_product_stage(self, rng: np.random.Generator, stage_code: np.ndarray) -> np.ndarray:
         """Assign product stage based on funding stage."""
-        if funding_stage == "Pre-seed":
-            return np.random.choice(["Concept", "Beta"], p=[0.7, 0.3])
-        elif funding_stage == "Seed":
-            return np.random.choice(["Beta", "GA"], p=[0.6, 0.4])
-        else:
-            return "GA"
+        pre_seed = stage_code == self.stages.index("Pre-seed")
+        seed = stage_code == self.stages.index("Seed")
+        probabilities = np.select(
+            [pre_seed[:, None], seed[:, None]],
+            [np.array([0.7, 0.3, 0.0]), np.array([0.0, 0.6, 0.4])],
+            np.array([0.0, 0.0, 1.0])
+        )
+        return _choose(rng, ["Concept", "Beta", "GA"], probabilities)
     
-    def _calculate_success_probability(self, performance: float, stage: str, sector: str) -> float:
+    def _calculate_success_probability(self, performance: np.ndarray, stage_code: np.ndarray,
+                                       sector: np.ndarray) -> np.ndarray:
         """Calculate probability of success."""
-        # Base success rates by stage (industry averages)
-        base_rates = {
-            "Pre-seed": 0.10,
-            "Seed": 0.20,
-            "Series A": 0.35,
-            "Series B": 0.50,
-            "Series C+": 0.70
-        }
-        
-        base = base_rates.get(stage, 0.25)
+        base = _table(self.stage_success_rate, self.stages, default=0.25)[stage_code]
         
         # Adjust by performance
         adjusted = base * (0.5 + performance)
         
         # Sector adjustments
-        if sector in ["AI/ML", "SaaS", "FinTech"]:
-            adjusted *= 1.2
-        elif sector in ["BioTech", "HealthTech"]:
-            adjusted *= 0.9
+        adjusted = np.select(
+            [np.isin(sector, ["AI/ML", "SaaS", "FinTech"]), np.isin(sector, ["BioTech", "HealthTech"])],
+            [adjusted * 1.2, adjusted * 0.9],
+            adjusted
+        )
         
         return np.clip(adjusted, 0.05, 0.95)
     
-    def _generate_public_company_metrics(self, company: Dict) -> Dict:
+    def _generate_public_company_metrics(self, rng: np.random.Generator, companies: pd.DataFrame) -> pd.DataFrame:
         """Generate metrics for public companies (ultimate success)."""
-        sector = company["sector"]
+        n = len(companies)
+        sector = np.asarray(self.sectors, dtype=object)[companies["sector"].to_numpy()]
         
         # Public companies are successful by definition
         metrics = {
-            "startup_id": f"id_{hash(company['name']) % 1000000}",
-            "startup_name": company["name"],
+            "startup_id": "id_" + (pd.util.hash_pandas_object(companies["name"], index=False).to_numpy()
+                                   % 1000000).astype(str).astype(object),
+            "startup_name": companies["name"].to_numpy(),
             "sector": sector,
-            "founding_year": company["founded"],
+            "founding_year": companies["founded"].to_numpy(),
             "funding_stage": "Series C+",  # Treat as late stage
-            "total_capital_raised_usd": int(np.random.uniform(1e8, 1e10)),
-            "cash_on_hand_usd": int(np.random.uniform(1e8, 1e10)),
+            "total_capital_raised_usd": rng.uniform(1e8, 1e10, n).astype(np.int64),
+            "cash_on_hand_usd": rng.uniform(1e8, 1e10, n).astype(np.int64),
             "monthly_burn_usd": 0,  # Profitable
-            "annual_revenue_run_rate": int(np.random.uniform(1e8, 1e11)),
-            "revenue_growth_rate_percent": np.random.uniform(10, 50),
-            "gross_margin_percent": np.random.uniform(60, 90),
-            "burn_multiple": 0,
-            "runway_months": 999,  # Infinite
-            "ltv_cac_ratio": np.random.uniform(3, 10),
+            "annual_revenue_run_rate": rng.uniform(1e8, 1e11, n).astype(np.int64),
+            "revenue_growth_rate_percent": rng.uniform(10, 50, n),
+            "gross_margin_percent": rng.uniform(60, 90, n),
+            "burn_multiple": 0.0,
+            "runway_months": 999.0,  # Infinite
+            "ltv_cac_ratio": rng.uniform(3, 10, n),
             "investor_tier_primary": "Tier1",
             "has_debt": True,
-            "tam_size_usd": int(np.random.uniform(1e11, 1e13)),
-            "sam_size_usd": int(np.random.uniform(1e10, 1e12)),
-            "som_size_usd": int(np.random.uniform(1e9, 1e11)),
-            "market_growth_rate_percent": np.random.uniform(10, 30),
-            "customer_count": int(np.random.uniform(1e5, 1e8)),
-            "customer_concentration_percent": np.random.uniform(5, 15),
-            "user_growth_rate_percent": np.random.uniform(10, 50),
-            "net_dollar_retention_percent": np.random.uniform(110, 150),
-            "competition_intensity": np.random.uniform(3, 5),
-            "competitors_named_count": np.random.randint(10, 100),
-            "dau_mau_ratio": np.random.uniform(0.3, 0.8),
-            "founders_count": np.random.randint(1, 3),
-            "team_size_full_time": int(np.random.uniform(1000, 100000)),
-            "years_experience_avg": np.random.uniform(10, 20),
-            "domain_expertise_years_avg": np.random.uniform(10, 20),
-            "prior_startup_experience_count": np.random.randint(1, 5),
-            "prior_successful_exits_count": np.random.randint(1, 3),
-            "board_advisor_experience_score": np.random.uniform(4, 5),
-            "advisors_count": np.random.randint(5, 20),
-            "team_diversity_percent": np.random.uniform(40, 80),
+            "tam_size_usd": rng.uniform(1e11, 1e13, n).astype(np.int64),
+            "sam_size_usd": rng.uniform(1e10, 1e12, n).astype(np.int64),
+            "som_size_usd": rng.uniform(1e9, 1e11, n).astype(np.int64),
+            "market_growth_rate_percent": rng.uniform(10, 30, n),
+            "customer_count": rng.uniform(1e5, 1e8, n).astype(np.int64),
+            "customer_concentration_percent": rng.uniform(5, 15, n),
+            "user_growth_rate_percent": rng.uniform(10, 50, n),
+            "net_dollar_retention_percent": rng.uniform(110, 150, n),
+            "competition_intensity": rng.uniform(3, 5, n),
+            "competitors_named_count": rng.integers(10, 100, n),
+            "dau_mau_ratio": rng.uniform(0.3, 0.8, n),
+            "founders_count": rng.integers(1, 3, n),
+            "team_size_full_time": rng.uniform(1000, 100000, n).astype(np.int64),
+            "years_experience_avg": rng.uniform(10, 20, n),
+            "domain_expertise_years_avg": rng.uniform(10, 20, n),
+            "prior_startup_experience_count": rng.integers(1, 5, n),
+            "prior_successful_exits_count": rng.integers(1, 3, n),
+            "board_advisor_experience_score": rng.uniform(4, 5, n),
+            "advisors_count": rng.integers(5, 20, n),
+            "team_diversity_percent": rng.uniform(40, 80, n),
             "key_person_dependency": False,
-            "patent_count": np.random.randint(10, 1000),
-            "network_effects_present": sector in ["SaaS", "E-commerce"],
+            "patent_count": rng.integers(10, 1000, n),
+            "network_effects_present": np.isin(sector, ["SaaS", "E-commerce"]),
             "has_data_moat": True,
-            "regulatory_advantage_present": sector in ["FinTech", "HealthTech"],
-            "tech_differentiation_score": np.random.uniform(4, 5),
-            "switching_cost_score": np.random.uniform(4, 5),
-            "brand_strength_score": np.random.uniform(4, 5),
-            "scalability_score": np.random.uniform(0.8, 1.0),
+            "regulatory_advantage_present": np.isin(sector, ["FinTech", "HealthTech"]),
+            "tech_differentiation_score": rng.uniform(4, 5, n),
+            "switching_cost_score": rng.uniform(4, 5, n),
+            "brand_strength_score": rng.uniform(4, 5, n),
+            "scalability_score": rng.uniform(0.8, 1.0, n),
             "product_stage": "GA",
-            "product_retention_30d": np.random.uniform(0.7, 0.95),
-            "product_retention_90d": np.random.uniform(0.5, 0.85),
+            "product_retention_30d": rng.uniform(0.7, 0.95, n),
+            "product_retention_90d": rng.uniform(0.5, 0.85, n),
             "success": True
         }
         
-        return metrics
+        return pd.DataFrame(metrics, index=companies.index)
     
-    def generate_dataset(self, n_companies: int = 100000) -> pd.DataFrame:
-        """Generate the full dataset."""
-        print(f"Generating dataset for {n_companies} companies...")
-        
-        all_metrics = []
-        
-        for i, company in enumerate(self.real_companies[:n_companies]):
-            metrics = self.generate_company_metrics(company)
-            all_metrics.append(metrics)
-            
-            if (i + 1) % 10000 == 0:
-                print(f"  Processed {i + 1} companies...")
-        
-        df = pd.DataFrame(all_metrics)
-        
-        # Add some post-processing
-        print("Post-processing dataset...")
+    def _generate_chunk(self, rng: np.random.Generator, start: int, n: int) -> pd.DataFrame:
+        companies = self._generate_companies(rng, start, n)
+        public = companies["stage"].to_numpy() < 0
+        if not public.any():
+            df = self.generate_company_metrics(rng, companies)
+        else:
+            private = companies[~public]
+            df = pd.concat([
+                self._generate_public_company_metrics(rng, companies[public]),
+                self.generate_company_metrics(rng, private).set_axis(private.index)
+            ]).sort_index()
         
         # Ensure logical consistency
         df.loc[df['annual_revenue_run_rate'] == 0, 'ltv_cac_ratio'] = 0
@@ -558,6 +564,23 @@ class HybridDatasetGenerator:
         
         # Calculate additional metrics
         df['capital_efficiency'] = df['annual_revenue_run_rate'] / (df['total_capital_raised_usd'] + 1)
+        df.index = pd.RangeIndex(start, start + n)
+        return df
+    
+    def iter_dataset(self, n_companies: int = 100000) -> Iterator[pd.DataFrame]:
+        """Generate the dataset block by block, for datasets too large to hold in memory."""
+        n_chunks = max(1, -(-n_companies // self.chunk_rows))
+        streams = np.random.SeedSequence(self.seed).spawn(n_chunks)
+        for i, stream in enumerate(streams):
+            start = i * self.chunk_rows
+            yield self._generate_chunk(np.random.default_rng(stream), start,
+                                       min(self.chunk_rows, n_companies - start))
+    
+    def generate_dataset(self, n_companies: int = 100000) -> pd.DataFrame:
+        """Generate the full dataset."""
+        print(f"Generating dataset for {n_companies} companies...")
+        
+        df = pd.concat(self.iter_dataset(n_companies))
         
         print(f"Dataset generation complete!")
         print(f"Total companies: {len(df)}")
@@ -566,42 +589,73 @@ class HybridDatasetGenerator:
         
         return df
 
+
+def summarize(chunks: Iterator[pd.DataFrame], on_chunk=None) -> Dict:
+    """Summary statistics accumulated over dataset blocks"""
+    rows = successes = 0
+    sectors, stages = pd.Series(dtype=int), pd.Series(dtype=int)
+    sums = {"avg_funding": 0.0, "avg_revenue": 0.0, "avg_team_size": 0.0, "avg_burn_multiple": 0.0}
+    burn_rows = 0
+    for chunk in chunks:
+        if on_chunk is not None:
+            on_chunk(chunk)
+        rows += len(chunk)
+        successes += int(chunk['success'].sum())
+        sectors = sectors.add(chunk['sector'].value_counts(), fill_value=0)
+        stages = stages.add(chunk['funding_stage'].value_counts(), fill_value=0)
+        sums["avg_funding"] += chunk['total_capital_raised_usd'].sum()
+        sums["avg_revenue"] += chunk['annual_revenue_run_rate'].sum()
+        sums["avg_team_size"] += chunk['team_size_full_time'].sum()
+        burn = chunk.loc[chunk['burn_multiple'] < 100, 'burn_multiple']
+        sums["avg_burn_multiple"] += burn.sum()
+        burn_rows += len(burn)
+    
+    averages = {key: float(total / rows) for key, total in sums.items() if key != "avg_burn_multiple"}
+    averages["avg_burn_multiple"] = float(sums["avg_burn_multiple"] / max(burn_rows, 1))
+    return {
+        "total_companies": rows,
+        "success_rate": successes / rows,
+        "sectors": {key: int(value) for key, value in sectors.sort_values(ascending=False).items()},
+        "stages": {key: int(value) for key, value in stages.sort_values(ascending=False).items()},
+        "avg_metrics": averages
+    }
+
+
 def main():
     """Generate and save the hybrid dataset."""
-    generator = HybridDatasetGenerator()
+    parser = argparse.ArgumentParser(description="Generate the hybrid startup dataset")
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument('--output', default='data/hybrid_100k_companies.csv')
+    parser.add_argument('--sample-output', default='data/hybrid_sample_1000.csv')
+    parser.add_argument('--summary-output', default='data/hybrid_dataset_summary.json')
+    args = parser.parse_args()
     
-    # Generate 100k company dataset
-    df = generator.generate_dataset(100000)
+    generator = HybridDatasetGenerator(seed=args.seed, chunk_rows=args.chunk_rows)
+    started = time.perf_counter()
     
-    # Save to CSV
-    output_path = "/Users/sf/Desktop/FLASH/data/hybrid_100k_companies.csv"
-    df.to_csv(output_path, index=False)
-    print(f"\nDataset saved to: {output_path}")
+    # Blocks are written as they are generated, so memory stays bounded by the block size
+    written = []
     
-    # Save a sample for quick inspection
-    sample_path = "/Users/sf/Desktop/FLASH/data/hybrid_sample_1000.csv"
-    df.sample(1000).to_csv(sample_path, index=False)
-    print(f"Sample saved to: {sample_path}")
+    def save(chunk: pd.DataFrame) -> None:
+        chunk.to_csv(args.output, mode='a' if written else 'w', header=not written, index=False)
+        if not written:
+            # Save a sample for quick inspection
+            chunk.sample(min(1000, len(chunk)), random_state=args.seed).to_csv(args.sample_output, index=False)
+        written.append(len(chunk))
+        print(f"  Written {sum(written)} of {args.rows} companies ({time.perf_counter() - started:.1f}s)")
     
-    # Generate summary statistics
-    summary = {
-        "total_companies": len(df),
-        "success_rate": float(df['success'].mean()),
-        "sectors": df['sector'].value_counts().to_dict(),
-        "stages": df['funding_stage'].value_counts().to_dict(),
-        "avg_metrics": {
-            "avg_funding": float(df['total_capital_raised_usd'].mean()),
-            "avg_revenue": float(df['annual_revenue_run_rate'].mean()),
-            "avg_team_size": float(df['team_size_full_time'].mean()),
-            "avg_burn_multiple": float(df[df['burn_multiple'] < 100]['burn_multiple'].mean())
-        }
-    }
+    summary = summarize(generator.iter_dataset(args.rows), on_chunk=save)
+    print(f"\nDataset saved to: {args.output}")
+    print(f"Sample saved to: {args.sample_output}")
     
-    with open("/Users/sf/Desktop/FLASH/data/hybrid_dataset_summary.json", 'w') as f:
+    with open(args.summary_output, 'w') as f:
         json.dump(summary, f, indent=2)
     
     print("\nDataset Summary:")
     print(json.dumps(summary, indent=2))
 
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -6,19 +6,123 @@ Identifies and predicts success based on growth DNA patterns
 
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple, Any, Optional
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
-from sklearn.decomposition import PCA
-from sklearn.metrics.pairwise import cosine_similarity
+from typing import Callable, Dict, Iterable, List, Tuple, Any, Optional
 import joblib
 import logging
 from pathlib import Path
 from datetime import datetime
 import json
+import tempfile
 
 logger = logging.getLogger(__name__)
 
+# Growth score bounds: a score above a bound moves up one category
+GROWTH_BOUNDS = np.array([0.4, 0.6, 0.8])
+GROWTH_CATEGORIES = np.array(['slow', 'steady', 'rapid', 'hypergrowth'], dtype=object)
+
+# (dna column, comparison, threshold, message)
+RISK_FACTOR_RULES = [
+    ('capital_efficiency', '<', 0.3, 'High burn rate relative to growth'),
+    ('pmf_strength', '<', 0.4, 'Weak product-market fit signals'),
+    ('founder_success_gene', '<', 0.1, 'Limited founder track record'),
+    ('customer_efficiency', '<', 0.2, 'Poor unit economics')
+]
+
+SUCCESS_INDICATOR_RULES = [
+    ('growth_velocity', '>', 0.7, 'Strong revenue growth momentum'),
+    ('capital_efficiency', '>', 0.7, 'Excellent capital efficiency'),
+    ('pmf_strength', '>', 0.7, 'Strong product-market fit'),
+    ('founder_success_gene', '>', 0.5, 'Experienced founding team'),
+    ('network_dna', '>', 0.5, 'Network effects present')
+]
+
+
+# Stored training DNA is float32: half the footprint and ample precision for similarity
+PATTERN_DTYPE = np.float32
+
+
+def save_pattern_array(patterns, path: Path, name: str) -> Path:
+    """Save a pattern matrix as a float32 .npy file, replacing any legacy joblib pickle"""
+    target = Path(path) / f"{name}.npy"
+    # Rewriting the file a memmap reads from would truncate it under the mapping
+    if not (isinstance(patterns, np.memmap) and patterns.filename
+            and Path(patterns.filename).resolve() == target.resolve()):
+        np.save(target, np.ascontiguousarray(patterns, dtype=PATTERN_DTYPE))
+    legacy = Path(path) / f"{name}.pkl"
+    if legacy.exists():
+        legacy.unlink()
+    return target
+
+
+def allocate_pattern_array(path: Path, name: str, shape: Tuple[int, ...], dtype=PATTERN_DTYPE) -> np.memmap:
+    """Preallocate a .npy file of the given shape, memory-mapped so it can be filled chunk by chunk"""
+    return np.lib.format.open_memmap(Path(path) / f"{name}.npy", mode='w+', dtype=dtype, shape=shape)
+
+
+def load_pattern_array(path: Path, name: str, mmap: bool = True) -> np.ndarray:
+    """
+    Load a pattern matrix, memory-mapped read-only so every worker shares the
+    same page-cache copy. Falls back to analyzers saved as joblib pickles.
+    """
+    path = Path(path)
+    if (path / f"{name}.npy").exists():
+        return np.load(path / f"{name}.npy", mmap_mode='r' if mmap else None)
+    if (path / f"{name}.pkl").exists():
+        return np.asarray(joblib.load(path / f"{name}.pkl"), dtype=PATTERN_DTYPE)
+    logger.warning(f"No stored {name} in {path}")
+    return np.zeros((0, 0), dtype=PATTERN_DTYPE)
+
+
+def cluster_sums(labels: np.ndarray, values: np.ndarray, n_clusters: int) -> np.ndarray:
+    """Column sums of `values` per cluster label, shape (n_clusters, n_columns)"""
+    return np.stack([np.bincount(labels, weights=column, minlength=n_clusters) for column in values.T], axis=1)
+
+
+def csv_chunks(path: Path, chunksize: int = 100_000, target: str = 'success',
+               index_col: str = 'startup_id') -> Callable[[], Iterable[Tuple[pd.DataFrame, pd.Series]]]:
+    """Re-iterable (X, y) chunk source over a CSV file for train_streaming"""
+    def chunks():
+        for chunk in pd.read_csv(path, chunksize=chunksize):
+            if index_col in chunk.columns:
+                chunk = chunk.set_index(index_col)
+            yield chunk.drop(columns=[target]), chunk[target]
+    return chunks
+
+
+class DNAProjection:
+    """
+    StandardScaler + PCA collapsed into one affine map (reduced = dna @ weights + offset),
+    plus KMeans centroids for distance and cluster lookup by a single matrix multiply.
+    Produces the same values as the sklearn transform chain without per-call validation.
+    """
+    
+    def __init__(self, scaler, pca, clusters=None):
+        n_features = pca.components_.shape[1]
+        mean = scaler.mean_ if scaler.mean_ is not None else np.zeros(n_features)
+        scale = scaler.scale_ if scaler.scale_ is not None else np.ones(n_features)
+        components = pca.components_
+        if pca.whiten:
+            components = components / np.sqrt(pca.explained_variance_)[:, None]
+        
+        # ((x - mean) / scale - pca_mean) @ C.T  ==  x @ (C / scale).T - (mean / scale + pca_mean) @ C.T
+        self.weights = np.ascontiguousarray((components / scale).T)
+        self.offset = -(mean / scale + pca.mean_) @ components.T
+        self.centroids = None
+        if clusters is not None:
+            self.centroids = np.ascontiguousarray(clusters.cluster_centers_.T)
+            self.centroid_norms = (clusters.cluster_centers_ ** 2).sum(axis=1)
+    
+    def project(self, dna) -> np.ndarray:
+        dna = np.asarray(dna, dtype=float)
+        if not np.isfinite(dna).all():
+            raise ValueError("DNA features contain NaN or infinity")
+        return dna @ self.weights + self.offset
+    
+    def cluster_distances(self, reduced: np.ndarray) -> np.ndarray:
+        """Euclidean distance from each reduced row to each centroid (KMeans.transform)"""
+        squared = (reduced ** 2).sum(axis=1)[:, None] - 2 * reduced @ self.centroids + self.centroid_norms
+        return np.sqrt(np.maximum(squared, 0))
+
 
 class StartupDNAAnalyzer:
     """
@@ -27,12 +131,20 @@ class StartupDNAAnalyzer:
     """
     
     def __init__(self):
+        from sklearn.preprocessing import StandardScaler
+        from sklearn.decomposition import PCA
+        
         self.pattern_library = {}
         self.pattern_clusters = None
         self.scaler = StandardScaler()
         self.pca = PCA(n_components=10)
         self.success_patterns = []
         self.failure_patterns = []
+        self.similarity_index = None
+        self.projection = None
+        self.pattern_stats = None
+        self.pattern_work_dir = None
+        self._scratch_dir = None
         
         # Key DNA components
         self.dna_components = {
@@ -158,33 +270,43 @@ class StartupDNAAnalyzer:
         # Cluster successful patterns
         n_patterns = min(6, len(success_dna) // 100)
         if n_patterns > 1:
+            from sklearn.cluster import KMeans
             kmeans = KMeans(n_clusters=n_patterns, random_state=42, n_init=10)
             success_clusters = kmeans.fit_predict(success_dna)
             self.pattern_clusters = kmeans
             
-            # Analyze each cluster
-            patterns = {}
-            for i in range(n_patterns):
-                cluster_mask = success_clusters == i
-                cluster_features = dna_features[success_mask][cluster_mask]
-                
-                # Calculate cluster characteristics
-                pattern_profile = {
-                    'size': cluster_mask.sum(),
-                    'avg_growth': cluster_features['growth_velocity'].mean(),
-                    'avg_efficiency': cluster_features['capital_efficiency'].mean(),
-                    'avg_retention': cluster_features.get('pmf_strength', pd.Series([0.5])).mean(),
-                    'dominant_features': self._get_dominant_features(cluster_features)
-                }
-                
-                # Match to known pattern types
-                pattern_name = self._match_pattern_type(pattern_profile)
-                patterns[pattern_name] = pattern_profile
-                
-            return patterns
+            # Per-cluster counts and DNA sums, kept so new cohorts can be folded in later
+            self.pattern_stats = {
+                'counts': np.bincount(success_clusters, minlength=n_patterns),
+                'dna_sums': cluster_sums(success_clusters, dna_features[success_mask].to_numpy(dtype=float), n_patterns),
+                'dna_columns': list(dna_features.columns)
+            }
+            return self._pattern_library_from_stats()
         
         return {}
     
+    def _pattern_library_from_stats(self) -> Dict:
+        """Cluster profiles matched to known pattern types, from the running cluster statistics"""
+        counts = self.pattern_stats['counts']
+        means = self.pattern_stats['dna_sums'] / np.maximum(counts, 1)[:, None]
+        
+        patterns = {}
+        for i in range(len(counts)):
+            cluster_means = pd.Series(means[i], index=self.pattern_stats['dna_columns'])
+            pattern_profile = {
+                'size': int(counts[i]),
+                'avg_growth': float(cluster_means['growth_velocity']),
+                'avg_efficiency': float(cluster_means['capital_efficiency']),
+                'avg_retention': float(cluster_means.get('pmf_strength', 0.5)),
+                'dominant_features': cluster_means.nlargest(3).index.tolist()
+            }
+            
+            # Match to known pattern types
+            pattern_name = self._match_pattern_type(pattern_profile)
+            patterns[pattern_name] = pattern_profile
+            
+        return patterns
+    
     def _get_dominant_features(self, cluster_features: pd.DataFrame) -> List[str]:
         """Identify the most dominant features in a cluster"""
         feature_means = cluster_features.mean()
@@ -208,97 +330,131 @@ class StartupDNAAnalyzer:
                 
         return best_match
     
+    def compile_projection(self) -> DNAProjection:
+        """Precompute the fused scaler/PCA/centroid projection from the fitted models"""
+        if self.projection is None:
+            self.projection = DNAProjection(self.scaler, self.pca, self.pattern_clusters)
+        return self.projection
+    
+    def reduce_dna(self, startup_features: pd.DataFrame) -> np.ndarray:
+        """DNA features of each startup projected into the fitted PCA space"""
+        dna = self.extract_dna_features(startup_features)
+        if self.projection is not None:
+            return self.projection.project(dna)
+        return self.pca.transform(self.scaler.transform(dna))
+    
+    def build_similarity_index(self, X: pd.DataFrame, y: pd.Series) -> None:
+        """Index every startup's reduced DNA by outcome; ids come from the frame index"""
+        from dna_similarity_index import SimilarityIndex
+        self.similarity_index = SimilarityIndex.build(self.reduce_dna(X), y.to_numpy() == 1, ids=X.index)
+    
+    def find_similar_startups(self, startup_features: pd.DataFrame, k: int = 10) -> List[Dict]:
+        """Most similar successful and failed training startups, per input row"""
+        if self.similarity_index is None:
+            raise ValueError("DNA analyzer has no similarity index; train it or run dna_similarity_index.py")
+        return self.similarity_index.query(self.reduce_dna(startup_features), k=k)
+    
     def calculate_dna_similarity(self, startup_dna: np.ndarray, pattern_dna: np.ndarray) -> float:
         """Calculate similarity between a startup's DNA and a success pattern"""
+        from sklearn.metrics.pairwise import cosine_similarity
         return cosine_similarity(startup_dna.reshape(1, -1), pattern_dna.reshape(1, -1))[0, 0]
     
     def predict_growth_trajectory(self, startup_features: pd.DataFrame) -> Dict:
-        """Predict the likely growth trajectory based on DNA analysis"""
-        # Extract DNA features
-        dna = self.extract_dna_features(startup_features)
-        
-        # Normalize
-        dna_normalized = self.scaler.transform(dna)
-        dna_reduced = self.pca.transform(dna_normalized)
-        
-        # Find closest pattern
-        if self.pattern_clusters is not None:
-            closest_pattern = self.pattern_clusters.predict(dna_reduced)[0]
-            pattern_distance = np.min(self.pattern_clusters.transform(dna_reduced))
-            
-            # Calculate success probability based on pattern matching
-            pattern_confidence = 1 / (1 + pattern_distance)
-            
-            # Identify growth trajectory characteristics
-            pattern_names = list(self.pattern_library.keys())
-            pattern_type = pattern_names[closest_pattern] if closest_pattern < len(pattern_names) else 'unknown'
-            
-            trajectory = {
-                'pattern_type': pattern_type,
-                'confidence': float(pattern_confidence),
-                'growth_prediction': self._predict_growth_rate(dna),
-                'risk_factors': self._identify_risk_factors(dna),
-                'success_indicators': self._identify_success_indicators(dna)
-            }
-        else:
-            trajectory = {
+        """Predict the likely growth trajectory of the first startup based on DNA analysis"""
+        if len(startup_features) == 0:
+            raise ValueError("predict_growth_trajectory needs at least one startup")
+        trajectory = self.predict_growth_trajectories(startup_features.head(1))[0]
+        if trajectory is None:
+            raise ValueError("DNA features contain NaN or infinity")
+        return trajectory
+    
+    def predict_growth_trajectories(self, startup_features: pd.DataFrame) -> List[Optional[Dict]]:
+        """
+        Predict one growth trajectory per startup in a single vectorized pass.
+        Startups whose DNA features are not all finite get None; the rest are still scored.
+        """
+        if self.pattern_clusters is None:
+            return [{
                 'pattern_type': 'unknown',
                 'confidence': 0.5,
                 'growth_prediction': 'moderate',
                 'risk_factors': [],
                 'success_indicators': []
+            } for _ in range(len(startup_features))]
+        if len(startup_features) == 0:
+            return []
+        
+        self.compile_projection()
+        dna = self.extract_dna_features(startup_features)
+        finite = np.isfinite(dna.to_numpy(dtype=float)).all(axis=1)
+        trajectories: List[Optional[Dict]] = [None] * len(dna)
+        if not finite.any():
+            return trajectories
+        dna = dna[finite]
+        dna_reduced = self.projection.project(dna)
+        
+        # Find closest pattern: one distance row per startup
+        distances = self.projection.cluster_distances(dna_reduced)
+        closest_pattern = distances.argmin(axis=1)
+        pattern_distance = distances.min(axis=1)
+        
+        # Calculate success probability based on pattern matching
+        pattern_confidence = 1 / (1 + pattern_distance)
+        
+        # Clusters beyond the named library map to the trailing 'unknown' slot
+        pattern_names = np.array(list(self.pattern_library.keys()) + ['unknown'], dtype=object)
+        pattern_types = pattern_names[np.minimum(closest_pattern, len(pattern_names) - 1)]
+        
+        growth_predictions = self._predict_growth_rate(dna)
+        risk_factors = self._identify_risk_factors(dna)
+        success_indicators = self._identify_success_indicators(dna)
+        
+        for position, pattern_type, confidence, growth, risks, indicators in zip(
+            np.flatnonzero(finite), pattern_types, pattern_confidence, growth_predictions,
+            risk_factors, success_indicators
+        ):
+            trajectories[position] = {
+                'pattern_type': pattern_type,
+                'confidence': float(confidence),
+                'growth_prediction': growth,
+                'risk_factors': risks,
+                'success_indicators': indicators
             }
-            
-        return trajectory
+        return trajectories
     
-    def _predict_growth_rate(self, dna: pd.DataFrame) -> str:
-        """Predict growth rate category based on DNA"""
-        growth_score = dna['growth_velocity'].mean() * 0.4 + dna['user_velocity'].mean() * 0.3 + dna['team_growth_rate'].mean() * 0.3
-        
-        if growth_score > 0.8:
-            return 'hypergrowth'
-        elif growth_score > 0.6:
-            return 'rapid'
-        elif growth_score > 0.4:
-            return 'steady'
-        else:
-            return 'slow'
+    def _predict_growth_rate(self, dna: pd.DataFrame) -> List[str]:
+        """Predict growth rate category per startup based on DNA"""
+        growth_score = (dna['growth_velocity'] * 0.4 + dna['user_velocity'] * 0.3 +
+                        dna['team_growth_rate'] * 0.3).to_numpy(dtype=float)
+        
+        # Missing scores fall through to 'slow'; a score must exceed a bound to move up
+        growth_score = np.nan_to_num(growth_score, nan=-np.inf)
+        categories = GROWTH_CATEGORIES[np.digitize(growth_score, GROWTH_BOUNDS, right=True)]
+        return categories.tolist()
     
-    def _identify_risk_factors(self, dna: pd.DataFrame) -> List[str]:
-        """Identify risk factors from DNA analysis"""
-        risks = []
-        
-        if dna['capital_efficiency'].mean() < 0.3:
-            risks.append('High burn rate relative to growth')
-        if dna['pmf_strength'].mean() < 0.4:
-            risks.append('Weak product-market fit signals')
-        if dna['founder_success_gene'].mean() < 0.1:
-            risks.append('Limited founder track record')
-        if dna['customer_efficiency'].mean() < 0.2:
-            risks.append('Poor unit economics')
-            
-        return risks
+    def _flag_rows(self, dna: pd.DataFrame, rules: List[Tuple[str, str, float, str]]) -> List[List[str]]:
+        """Messages of every (column, comparison, threshold, message) rule each row triggers"""
+        messages = np.array([rule[3] for rule in rules], dtype=object)
+        triggered = np.column_stack([
+            dna[column].to_numpy(dtype=float) < threshold if comparison == '<'
+            else dna[column].to_numpy(dtype=float) > threshold
+            for column, comparison, threshold, _ in rules
+        ])
+        return [messages[row].tolist() for row in triggered]
     
-    def _identify_success_indicators(self, dna: pd.DataFrame) -> List[str]:
-        """Identify positive indicators from DNA analysis"""
-        indicators = []
-        
-        if dna['growth_velocity'].mean() > 0.7:
-            indicators.append('Strong revenue growth momentum')
-        if dna['capital_efficiency'].mean() > 0.7:
-            indicators.append('Excellent capital efficiency')
-        if dna['pmf_strength'].mean() > 0.7:
-            indicators.append('Strong product-market fit')
-        if dna['founder_success_gene'].mean() > 0.5:
-            indicators.append('Experienced founding team')
-        if dna['network_dna'].mean() > 0.5:
-            indicators.append('Network effects present')
-            
-        return indicators
+    def _identify_risk_factors(self, dna: pd.DataFrame) -> List[List[str]]:
+        """Identify risk factors per startup from DNA analysis"""
+        return self._flag_rows(dna, RISK_FACTOR_RULES)
+    
+    def _identify_success_indicators(self, dna: pd.DataFrame) -> List[List[str]]:
+        """Identify positive indicators per startup from DNA analysis"""
+        return self._flag_rows(dna, SUCCESS_INDICATOR_RULES)
     
     def train(self, X_train: pd.DataFrame, y_train: pd.Series) -> None:
         """Train the DNA pattern analyzer"""
         logger.info("Training DNA Pattern Analyzer...")
+        self.projection = None
+        self.pattern_stats = None
         
         # Extract DNA features
         dna_features = self.extract_dna_features(X_train)
@@ -308,14 +464,190 @@ class StartupDNAAnalyzer:
         
         # Store successful patterns for comparison
         success_mask = y_train == 1
-        self.success_patterns = dna_features[success_mask].values
-        self.failure_patterns = dna_features[~success_mask].values
+        self.success_patterns = dna_features[success_mask].to_numpy(dtype=PATTERN_DTYPE)
+        self.failure_patterns = dna_features[~success_mask].to_numpy(dtype=PATTERN_DTYPE)
+        
+        # Nearest-neighbour index for similar-startup lookups
+        self.compile_projection()
+        self.build_similarity_index(X_train, y_train)
         
         logger.info(f"Identified {len(self.pattern_library)} growth patterns")
         for pattern, profile in self.pattern_library.items():
             logger.info(f"  {pattern}: {profile['size']} companies, "
                        f"avg_growth={profile['avg_growth']:.2f}")
     
+    def train_streaming(self, chunks: Callable[[], Iterable[Tuple[pd.DataFrame, pd.Series]]],
+                        n_components: int = 10, max_patterns: int = 6,
+                        work_dir: Optional[Path] = None) -> None:
+        """
+        Train from chunked input without holding the dataset in memory.
+        `chunks` is called once per pass and yields (X, y) chunks, e.g. csv_chunks(path).
+        Uses a streaming StandardScaler, IncrementalPCA and MiniBatchKMeans; stored
+        patterns are written chunk by chunk into memory-mapped .npy files in `work_dir`
+        (a temporary directory by default).
+        """
+        from sklearn.preprocessing import StandardScaler
+        from sklearn.decomposition import IncrementalPCA
+        from sklearn.cluster import MiniBatchKMeans
+        
+        logger.info("Training DNA Pattern Analyzer from chunks...")
+        self.scaler = StandardScaler()
+        self.pca = IncrementalPCA(n_components=n_components)
+        self.pattern_clusters = None
+        self.pattern_stats = None
+        self.projection = None
+        self.pattern_work_dir = Path(work_dir) if work_dir is not None else None
+        
+        # Pass 1: standardization statistics, row counts and id width for preallocation
+        n_rows, n_success, n_dna, id_width = 0, 0, 0, 1
+        for X, y in chunks():
+            dna = self.extract_dna_features(X)
+            self.scaler.partial_fit(dna)
+            n_rows += len(X)
+            n_success += int((y == 1).sum())
+            n_dna = dna.shape[1]
+            if len(X):
+                id_width = max(id_width, int(X.index.astype(str).str.len().max()))
+        
+        # Pass 2: principal components (IncrementalPCA needs n_components rows per batch)
+        for X, y in chunks():
+            if len(X) >= n_components:
+                self.pca.partial_fit(self.scaler.transform(self.extract_dna_features(X)))
+        
+        # Pass 3: mini-batch k-means over successful startups
+        n_patterns = min(max_patterns, n_success // 100)
+        if n_patterns > 1:
+            kmeans = MiniBatchKMeans(n_clusters=n_patterns, random_state=42, n_init=3)
+            for X, y in chunks():
+                success = (y == 1).to_numpy()
+                if success.sum() >= n_patterns:
+                    reduced = self.pca.transform(self.scaler.transform(self.extract_dna_features(X[success])))
+                    kmeans.partial_fit(reduced)
+            self.pattern_clusters = kmeans
+        self.compile_projection()
+        
+        # Pass 4: cluster statistics, plus stored patterns and similarity index points
+        # written straight into files sized from the pass 1 counts
+        work_dir = self._pattern_dir()
+        success_patterns = allocate_pattern_array(work_dir, 'success_patterns', (n_success, n_dna))
+        failure_patterns = allocate_pattern_array(work_dir, 'failure_patterns', (n_rows - n_success, n_dna))
+        points = allocate_pattern_array(work_dir, 'index_points', (n_rows, self.pca.n_components_))
+        outcomes = allocate_pattern_array(work_dir, 'index_outcomes', (n_rows,), dtype=bool)
+        ids = allocate_pattern_array(work_dir, 'index_ids', (n_rows,), dtype=f'<U{id_width}')
+        
+        row, success_row = 0, 0
+        for X, y in chunks():
+            dna = self.extract_dna_features(X)
+            reduced = self.projection.project(dna)
+            success = (y == 1).to_numpy()
+            if self.pattern_clusters is not None:
+                self._fold_into_clusters(dna[success], reduced[success], update_centers=False)
+            n_chunk, n_chunk_success = len(X), int(success.sum())
+            failure_row = row - success_row
+            success_patterns[success_row:success_row + n_chunk_success] = dna[success].to_numpy(dtype=PATTERN_DTYPE)
+            failure_patterns[failure_row:failure_row + n_chunk - n_chunk_success] = \
+                dna[~success].to_numpy(dtype=PATTERN_DTYPE)
+            points[row:row + n_chunk] = reduced
+            outcomes[row:row + n_chunk] = success
+            ids[row:row + n_chunk] = X.index.astype(str)
+            row += n_chunk
+            success_row += n_chunk_success
+        
+        self.pattern_library = self._pattern_library_from_stats() if self.pattern_stats else {}
+        for patterns in (success_patterns, failure_patterns):
+            patterns.flush()
+        self.success_patterns = load_pattern_array(work_dir, 'success_patterns')
+        self.failure_patterns = load_pattern_array(work_dir, 'failure_patterns')
+        
+        from dna_similarity_index import SimilarityIndex
+        self.similarity_index = SimilarityIndex.build(points, outcomes, ids=ids)
+        # The KD-trees hold their own copy of the points; the scratch files can go
+        del points, outcomes, ids
+        for name in ('index_points', 'index_outcomes', 'index_ids'):
+            (work_dir / f"{name}.npy").unlink()
+        logger.info(f"Identified {len(self.pattern_library)} growth patterns "
+                    f"from {len(self.similarity_index)} startups")
+    
+    def partial_fit(self, X_new: pd.DataFrame, y_new: pd.Series) -> None:
+        """
+        Fold a new cohort into the trained analyzer: successful startups update the
+        cluster centres and profiles, and every startup joins the stored patterns and
+        similarity index. The scaler and PCA stay fixed so existing results remain comparable.
+        """
+        if self.pattern_clusters is None or self.pattern_stats is None:
+            raise ValueError("partial_fit needs a trained analyzer with cluster statistics")
+        
+        self.compile_projection()
+        dna = self.extract_dna_features(X_new)
+        reduced = self.projection.project(dna)
+        success = (y_new == 1).to_numpy()
+        
+        self._fold_into_clusters(dna[success], reduced[success], update_centers=True)
+        self.projection = None
+        self.compile_projection()
+        self.pattern_library = self._pattern_library_from_stats()
+        
+        self.success_patterns = self._append_patterns('success_patterns', self.success_patterns, dna[success])
+        self.failure_patterns = self._append_patterns('failure_patterns', self.failure_patterns, dna[~success])
+        if self.similarity_index is not None:
+            self.similarity_index = self.similarity_index.extend(reduced, success, ids=X_new.index)
+        logger.info(f"Folded {len(X_new)} startups ({int(success.sum())} successful) into the DNA patterns")
+    
+    def _pattern_dir(self) -> Path:
+        """Directory for memory-mapped pattern files: the configured work dir or a private temp dir"""
+        if self.pattern_work_dir is not None:
+            self.pattern_work_dir.mkdir(parents=True, exist_ok=True)
+            return self.pattern_work_dir
+        if self._scratch_dir is None:
+            # Removed with the analyzer; open mappings stay readable after the files are unlinked
+            self._scratch_dir = tempfile.TemporaryDirectory(prefix='dna_patterns_')
+        return Path(self._scratch_dir.name)
+    
+    def _append_patterns(self, name: str, stored: np.ndarray, new_dna: pd.DataFrame) -> np.ndarray:
+        """Stored patterns followed by the new rows, copied file to file into a preallocated memmap"""
+        if len(new_dna) == 0:
+            return stored
+        n_stored = len(stored)
+        work_dir = self._pattern_dir()
+        combined = allocate_pattern_array(work_dir, f"{name}-{n_stored + len(new_dna)}",
+                                          (n_stored + len(new_dna), new_dna.shape[1]))
+        if n_stored:
+            combined[:n_stored] = stored
+        combined[n_stored:] = new_dna.to_numpy(dtype=PATTERN_DTYPE)
+        combined.flush()
+        # The previous cohort's file is superseded (its mapping stays valid until released)
+        if isinstance(stored, np.memmap) and stored.filename and Path(stored.filename).stem.startswith(f"{name}-"):
+            Path(stored.filename).unlink(missing_ok=True)
+        return combined
+    
+    def _fold_into_clusters(self, dna: pd.DataFrame, reduced: np.ndarray, update_centers: bool) -> None:
+        """Assign successful startups to their nearest cluster and update the running statistics"""
+        n_clusters = len(self.pattern_clusters.cluster_centers_)
+        if self.pattern_stats is None:
+            self.pattern_stats = {
+                'counts': np.zeros(n_clusters, dtype=np.int64),
+                'dna_sums': np.zeros((n_clusters, dna.shape[1])),
+                'dna_columns': list(dna.columns)
+            }
+        if len(reduced) == 0:
+            return
+        
+        labels = self.projection.cluster_distances(reduced).argmin(axis=1)
+        new_counts = np.bincount(labels, minlength=n_clusters)
+        if update_centers:
+            # Running-mean step per centre, as in mini-batch k-means
+            centers = np.array(self.pattern_clusters.cluster_centers_, dtype=float)
+            reduced_sums = cluster_sums(labels, reduced, n_clusters)
+            total = self.pattern_stats['counts'] + new_counts
+            moved = new_counts > 0
+            centers[moved] += (reduced_sums[moved] - new_counts[moved, None] * centers[moved]) / total[moved, None]
+            self.pattern_clusters.cluster_centers_ = centers
+        
+        self.pattern_stats['counts'] = self.pattern_stats['counts'] + new_counts
+        self.pattern_stats['dna_sums'] = self.pattern_stats['dna_sums'] + cluster_sums(
+            labels, dna.to_numpy(dtype=float), n_clusters
+        )
+    
     def save(self, path: Path) -> None:
         """Save the DNA analyzer"""
         path = Path(path)
@@ -329,8 +661,14 @@ class StartupDNAAnalyzer:
         
         # Save patterns
         joblib.dump(self.pattern_library, path / 'pattern_library.pkl')
-        joblib.dump(self.success_patterns, path / 'success_patterns.pkl')
-        joblib.dump(self.failure_patterns, path / 'failure_patterns.pkl')
+        save_pattern_array(self.success_patterns, path, 'success_patterns')
+        save_pattern_array(self.failure_patterns, path, 'failure_patterns')
+        if self.similarity_index is not None:
+            self.similarity_index.save(path)
+        if self.pattern_stats is not None:
+            np.savez(path / 'pattern_stats.npz', counts=self.pattern_stats['counts'],
+                     dna_sums=self.pattern_stats['dna_sums'],
+                     dna_columns=np.array(self.pattern_stats['dna_columns']))
         
         # Save configuration
         config = {
@@ -354,8 +692,23 @@ class StartupDNAAnalyzer:
         
         # Load patterns
         self.pattern_library = joblib.load(path / 'pattern_library.pkl')
-        self.success_patterns = joblib.load(path / 'success_patterns.pkl')
-        self.failure_patterns = joblib.load(path / 'failure_patterns.pkl')
+        self.success_patterns = load_pattern_array(path, 'success_patterns')
+        self.failure_patterns = load_pattern_array(path, 'failure_patterns')
+        
+        from dna_similarity_index import SimilarityIndex
+        self.similarity_index = SimilarityIndex.load(path)
+        
+        self.pattern_stats = None
+        if (path / 'pattern_stats.npz').exists():
+            with np.load(path / 'pattern_stats.npz') as stats:
+                self.pattern_stats = {
+                    'counts': stats['counts'],
+                    'dna_sums': stats['dna_sums'],
+                    'dna_columns': stats['dna_columns'].tolist()
+                }
+        
+        self.projection = None
+        self.compile_projection()
         
         # Load configuration
         with open(path / 'dna_config.json', 'r') as f:
@@ -366,32 +719,45 @@ class StartupDNAAnalyzer:
         logger.info(f"DNA analyzer loaded from {path}")
 
 
-def train_dna_analyzer():
-    """Train the DNA pattern analyzer on the dataset"""
+def train_dna_analyzer(data_path: str = "data/final_100k_dataset_45features.csv",
+                       chunksize: Optional[int] = None):
+    """
+    Train the DNA pattern analyzer on the dataset.
+    With a chunksize the CSV is streamed instead of loaded whole (see train_streaming).
+    """
     logger.info("Starting DNA Pattern Analysis Training")
-    
-    # Load data
-    df = pd.read_csv("data/final_100k_dataset_45features.csv")
-    
-    # Prepare features
-    exclude_cols = ['success', 'startup_id', 'startup_name']
-    feature_cols = [col for col in df.columns if col not in exclude_cols]
-    
-    X = df[feature_cols]
-    y = df['success']
-    
-    # Train DNA analyzer
     analyzer = StartupDNAAnalyzer()
-    analyzer.train(X, y)
+    
+    if chunksize:
+        analyzer.train_streaming(csv_chunks(data_path, chunksize=chunksize))
+        X, _ = next(csv_chunks(data_path, chunksize=1000)())
+    else:
+        # Load data
+        df = pd.read_csv(data_path)
+        # Similar-startup lookups report neighbours by startup_id
+        if 'startup_id' in df.columns:
+            df = df.set_index('startup_id')
+        
+        # Prepare features
+        exclude_cols = ['success', 'startup_id', 'startup_name']
+        feature_cols = [col for col in df.columns if col not in exclude_cols]
+        
+        X = df[feature_cols]
+        y = df['success']
+        
+        # Train DNA analyzer
+        analyzer.train(X, y)
     
     # Save analyzer
     analyzer.save(Path("models/dna_analyzer"))
     
     # Test on a few examples
     sample = X.sample(5)
-    for idx, row in sample.iterrows():
-        trajectory = analyzer.predict_growth_trajectory(pd.DataFrame([row]))
+    for idx, trajectory in zip(sample.index, analyzer.predict_growth_trajectories(sample)):
         logger.info(f"\nSample {idx}:")
+        if trajectory is None:
+            logger.info("  Non-finite DNA features, not scored")
+            continue
         logger.info(f"  Pattern: {trajectory['pattern_type']}")
         logger.info(f"  Growth: {trajectory['growth_prediction']}")
         logger.info(f"  Risks: {trajectory['risk_factors']}")
@@ -401,4 +767,9 @@ def train_dna_analyzer():
 
 
 if __name__ == "__main__":
-    train_dna_analyzer()
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser(description="Train the DNA pattern analyzer")
+    parser.add_argument('--data', default="data/final_100k_dataset_45features.csv")
+    parser.add_argument('--chunksize', type=int, default=None, help="stream the CSV in chunks of this many rows")
+    args = parser.parse_args()
+    train_dna_analyzer(args.data, args.chunksize)
\ No newline at end of file
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+DNA Similarity Index for FLASH
+Nearest-neighbour search over the PCA-reduced DNA of every training startup,
+split into successful and failed companies. Built offline next to the DNA
+analyzer and memory-mapped at load so workers share the pages.
+"""
+
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import joblib
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = 'similarity_index.joblib'
+OUTCOMES = ('success', 'failure')
+RESULT_KEYS = {'success': 'similar_successes', 'failure': 'similar_failures'}
+
+
+class SimilarityIndex:
+    """
+    One KD-tree per outcome over PCA-reduced DNA vectors.
+
+    Querying both trees for k neighbours returns the k most similar successful
+    and failed companies; merging the two lists by distance gives the exact
+    k nearest neighbours overall, from which the outcome mix is taken.
+    """
+
+    def __init__(self, trees: Dict, ids: Dict):
+        self.trees = trees
+        self.ids = ids
+
+    @classmethod
+    def build(cls, points: np.ndarray, outcomes, ids=None, leaf_size: int = 40) -> 'SimilarityIndex':
+        """Build the index from reduced DNA vectors and binary outcomes (1 = success)"""
+        from sklearn.neighbors import KDTree
+
+        # Points may be a memory-mapped file; KDTree copies each outcome's rows as float64
+        points = np.asarray(points)
+        outcomes = np.asarray(outcomes).astype(bool)
+        # Fixed-width strings rather than objects so the ids memory-map with the trees
+        ids = np.asarray(ids if ids is not None else np.arange(len(points))).astype(str, copy=False)
+
+        trees, outcome_ids = {}, {}
+        for outcome, mask in zip(OUTCOMES, (outcomes, ~outcomes)):
+            if mask.any():
+                trees[outcome] = KDTree(points[mask], leaf_size=leaf_size)
+                outcome_ids[outcome] = ids[mask]
+        return cls(trees, outcome_ids)
+
+    def extend(self, points: np.ndarray, outcomes, ids=None) -> 'SimilarityIndex':
+        """New index over the stored startups plus new ones (KD-trees are rebuilt, not mutated)"""
+        stored_points = [np.asarray(self.trees[outcome].get_arrays()[0]) for outcome in self.trees]
+        stored_outcomes = [np.full(len(self.ids[outcome]), outcome == 'success') for outcome in self.trees]
+        stored_ids = [np.asarray(self.ids[outcome]) for outcome in self.trees]
+        points = np.atleast_2d(np.asarray(points, dtype=float))
+        ids = np.asarray(ids if ids is not None else np.arange(len(self), len(self) + len(points))).astype(str)
+        return SimilarityIndex.build(
+            np.vstack(stored_points + [points]),
+            np.concatenate(stored_outcomes + [np.asarray(outcomes).astype(bool)]),
+            ids=np.concatenate(stored_ids + [ids])
+        )
+
+    def __len__(self) -> int:
+        return sum(len(ids) for ids in self.ids.values())
+
+    def save(self, path: Path) -> Path:
+        path = Path(path) / INDEX_FILE
+        joblib.dump({'trees': self.trees, 'ids': self.ids}, path)
+        return path
+
+    @classmethod
+    def load(cls, path: Path, mmap: bool = True) -> Optional['SimilarityIndex']:
+        """Load a saved index (None if the directory has none), memory-mapping its arrays"""
+        path = Path(path) / INDEX_FILE
+        if not path.exists():
+            return None
+        state = joblib.load(path, mmap_mode='r' if mmap else None)
+        return cls(state['trees'], state['ids'])
+
+    def query(self, points: np.ndarray, k: int = 10) -> List[Dict]:
+        """k most similar successful and failed companies plus the outcome mix, per query row"""
+        points = np.atleast_2d(np.asarray(points, dtype=float))
+        neighbours = {}
+        for outcome in OUTCOMES:
+            if outcome in self.trees:
+                distances, positions = self.trees[outcome].query(points, k=min(k, len(self.ids[outcome])))
+                neighbours[outcome] = (distances, self.ids[outcome][positions])
+            else:
+                neighbours[outcome] = (np.zeros((len(points), 0)), np.zeros((len(points), 0), dtype=str))
+
+        # Exact overall k nearest: the closest k among both outcomes' k nearest
+        all_distances = np.hstack([neighbours[outcome][0] for outcome in OUTCOMES])
+        all_success = np.hstack([np.full(neighbours[outcome][0].shape, outcome == 'success') for outcome in OUTCOMES])
+        nearest = np.argsort(all_distances, axis=1, kind='stable')[:, :k]
+        successes = np.take_along_axis(all_success, nearest, axis=1).sum(axis=1)
+        n_neighbours = nearest.shape[1]
+
+        results = []
+        for row in range(len(points)):
+            result = {
+                RESULT_KEYS[outcome]: [
+                    {'startup_id': str(startup_id), 'distance': float(distance), 'similarity': float(1 / (1 + distance))}
+                    for startup_id, distance in zip(ids[row], distances[row])
+                ]
+                for outcome, (distances, ids) in neighbours.items()
+            }
+            result['outcome_mix'] = {
+                'neighbors': int(n_neighbours),
+                'successes': int(successes[row]),
+                'failures': int(n_neighbours - successes[row]),
+                'success_rate': float(successes[row] / n_neighbours) if n_neighbours else None
+            }
+            results.append(result)
+        return results
+
+
+def main():
+    """Rebuild the similarity index of a saved DNA analyzer from the training data"""
+    import argparse
+    import time
+
+    import pandas as pd
+
+    from dna_pattern_analysis import StartupDNAAnalyzer
+
+    parser = argparse.ArgumentParser(description="Build the DNA nearest-neighbour index offline")
+    parser.add_argument('--data', default='data/final_100k_dataset_45features.csv')
+    parser.add_argument('--model-dir', default='models/dna_analyzer')
+    parser.add_argument('--k', type=int, default=10)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    analyzer = StartupDNAAnalyzer()
+    analyzer.load(args.model_dir)
+
+    df = pd.read_csv(args.data)
+    if 'startup_id' in df.columns:
+        df = df.set_index('startup_id')
+    analyzer.build_similarity_index(df, df['success'])
+    analyzer.similarity_index.save(args.model_dir)
+
+    sample = df.sample(min(200, len(df)), random_state=0)
+    reduced = analyzer.reduce_dna(sample)
+    started = time.perf_counter()
+    for row in reduced:
+        analyzer.similarity_index.query(row, k=args.k)
+    per_query_ms = (time.perf_counter() - started) / len(reduced) * 1000
+    print(f"Indexed {len(analyzer.similarity_index)} startups; "
+          f"single-startup query (k={args.k}): {per_query_ms:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Explanation Plot Store for FLASH
+Keeps SHAP explanations on disk under a content hash and renders their plots on
+demand in worker processes, caching each rendered image next to its explanation
+"""
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict
+
+from shap_explainer import PLOT_BUILDERS, PLOT_FORMATS, render_plot
+
+logger = logging.getLogger(__name__)
+
+DIGEST_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+# Rasters stay small; SVG output does not depend on the resolution
+PNG_DPI = 72
+
+
+def explanation_digest(explanation: Dict) -> str:
+    """Content hash of the numeric parts of an explanation the plots are drawn from"""
+    payload = json.dumps(
+        {key: explanation.get(key) for key in ('pillar_explanations', 'meta_explanation')},
+        sort_keys=True, default=float
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def _write_atomic(path: Path, payload: bytes) -> None:
+    partial = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    partial.write_bytes(payload)
+    os.replace(partial, path)
+
+
+def _render_to_file(explanation_path: str, image_path: str, name: str, fmt: str) -> str:
+    """Worker-process job: render one plot of a stored explanation into the cache"""
+    with open(explanation_path, 'r') as f:
+        explanation = json.load(f)
+    image = render_plot(name, explanation['pillar_explanations'], explanation['meta_explanation'],
+                        fmt=fmt, dpi=PNG_DPI)
+    _write_atomic(Path(image_path), image)
+    return image_path
+
+
+class PlotStore:
+    """
+    Content-addressed explanation plots.
+
+    put() stores an explanation as <digest>.json; render() returns a future for the
+    image path <digest>-<plot>.<format>, rendering it in a process pool on first
+    request only. max_workers=0 renders in the calling thread. Beyond
+    max_explanations stored explanations the oldest are evicted with their images;
+    the order is kept in memory, read from file times once on the first put().
+    """
+
+    def __init__(self, directory: Path, max_workers: int = 2, max_explanations: int = 1000):
+        self.directory = Path(directory)
+        self.max_workers = max_workers
+        self.max_explanations = max_explanations
+        self._pool = None
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.RLock()
+        # Stored digests, oldest first; None until seeded from the directory
+        self._entries = None
+
+    def put(self, explanation: Dict) -> str:
+        """Store an explanation (once per content) and return its digest"""
+        digest = explanation_digest(explanation)
+        with self._lock:
+            entries = self._stored_entries()
+            if digest in entries:
+                return digest
+            path = self.directory / f"{digest}.json"
+            if not path.exists():
+                self.directory.mkdir(parents=True, exist_ok=True)
+                payload = {key: explanation.get(key) for key in ('pillar_explanations', 'meta_explanation')}
+                _write_atomic(path, json.dumps(payload, default=float).encode())
+            entries[digest] = None
+            while len(entries) > self.max_explanations:
+                self._evict(entries.popitem(last=False)[0])
+        return digest
+
+    def _stored_entries(self) -> OrderedDict:
+        if self._entries is None:
+            stored = sorted(self.directory.glob('*.json'), key=lambda p: p.stat().st_mtime)
+            self._entries = OrderedDict((path.stem, None) for path in stored)
+        return self._entries
+
+    def _evict(self, digest: str) -> None:
+        (self.directory / f"{digest}.json").unlink(missing_ok=True)
+        for name in PLOT_BUILDERS:
+            for fmt in PLOT_FORMATS:
+                self.image_path(digest, name, fmt).unlink(missing_ok=True)
+
+    def image_path(self, digest: str, name: str, fmt: str) -> Path:
+        return self.directory / f"{digest}-{name}.{fmt}"
+
+    def check(self, digest: str, name: str, fmt: str) -> Path:
+        """
+        Path of the stored explanation behind a plot request.
+        Raises KeyError for unknown explanations, plots or formats.
+        """
+        if not DIGEST_PATTERN.match(digest) or name not in PLOT_BUILDERS or fmt not in PLOT_FORMATS:
+            raise KeyError(f"{digest}/{name}.{fmt}")
+        explanation_path = self.directory / f"{digest}.json"
+        if not explanation_path.exists():
+            raise KeyError(digest)
+        return explanation_path
+
+    def render(self, digest: str, name: str, fmt: str) -> Future:
+        """
+        Future resolving to the cached image path.
+        Raises KeyError for unknown explanations, plots or formats; the future
+        fails with FileNotFoundError if the explanation is evicted meanwhile.
+        """
+        explanation_path = self.check(digest, name, fmt)
+
+        image_path = self.image_path(digest, name, fmt)
+        if image_path.exists():
+            done = Future()
+            done.set_result(str(image_path))
+            return done
+
+        args = (str(explanation_path), str(image_path), name, fmt)
+        if self.max_workers <= 0:
+            future = Future()
+            try:
+                future.set_result(_render_to_file(*args))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        with self._lock:
+            # Concurrent requests for the same image share one render
+            key = image_path.name
+            future = self._pending.get(key)
+            if future is None:
+                future = self._pending[key] = self._executor().submit(_render_to_file, *args)
+                # Runs inline if the render already finished, hence the reentrant lock
+                future.add_done_callback(lambda _: self._forget(key))
+            return future
+
+    def _forget(self, key: str) -> None:
+        with self._lock:
+            self._pending.pop(key, None)
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Spawned workers: matplotlib and model libraries are not fork-safe
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                             mp_context=multiprocessing.get_context('spawn'))
+        return self._pool
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
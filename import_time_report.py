@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Import-time report for the FLASH API
+Runs `python -X importtime -c "import api_server"` in a clean interpreter and
+summarizes where worker start-up time goes; writes IMPORT_TIME_REPORT.md
+"""
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Heavy third-party packages that should only load with the model family using them
+WATCHED_PACKAGES = [
+    'fastapi', 'pydantic', 'numpy', 'pandas', 'joblib', 'sklearn', 'catboost',
+    'xgboost', 'lightgbm', 'shap', 'matplotlib', 'seaborn'
+]
+
+BOOT_SNIPPET = (
+    "import time; t = time.perf_counter(); import api_server; "
+    "i = time.perf_counter(); api_server.load_models(); api_server.load_stage_models(); "
+    "api_server.load_advanced_models(); print(i - t, time.perf_counter() - i)"
+)
+
+
+def parse_importtime(stderr: str) -> dict:
+    """Map each imported module to its cumulative import time in milliseconds"""
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, self_us, cumulative_us, name = (part.strip() for part in line.replace('import time:', '|').split('|'))
+        timings[name] = int(cumulative_us) / 1000
+    return timings
+
+
+def measure_import(runs: int = 3) -> dict:
+    """Best-of-N import profile of api_server"""
+    best = None
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', 'import api_server'],
+            capture_output=True, text=True, check=True
+        )
+        timings = parse_importtime(result.stderr)
+        if best is None or timings['api_server'] < best['api_server']:
+            best = timings
+    return best
+
+
+def measure_boot(runs: int = 3) -> tuple:
+    """Best-of-N (import seconds, model load seconds) for a full worker boot"""
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-c', BOOT_SNIPPET], capture_output=True, text=True, check=True
+        )
+        samples.append(tuple(float(v) for v in result.stdout.split()[-2:]))
+    return min(samples, key=sum)
+
+
+def main():
+    timings = measure_import()
+    import_s, load_s = measure_boot()
+
+    lines = [
+        "# Import-Time Report",
+        "",
+        f"Generated by `python import_time_report.py` on {datetime.now():%Y-%m-%d} "
+        f"(Python {sys.version.split()[0]}, best of 3 runs).",
+        "",
+        f"- `import api_server`: **{timings['api_server']:.0f} ms**",
+        f"- Worker boot (import + `load_models` / `load_stage_models` / `load_advanced_models`): "
+        f"**{(import_s + load_s) * 1000:.0f} ms** ({import_s * 1000:.0f} ms import, {load_s * 1000:.0f} ms model loading)",
+        "",
+        "Packages loaded by `import api_server` (cumulative ms; `-` = not imported):",
+        "",
+        "| Package | Import time (ms) |",
+        "|---|---|",
+    ]
+    for package in WATCHED_PACKAGES:
+        value = timings.get(package)
+        lines.append(f"| {package} | {value:.0f} |" if value is not None else f"| {package} | - |")
+
+    report = Path('IMPORT_TIME_REPORT.md')
+    history = ''
+    if report.exists():
+        existing = report.read_text()
+        marker = existing.find('## History')
+        history = existing[marker:] if marker >= 0 else ''
+    report.write_text('\n'.join(lines) + '\n' + ('\n' + history if history else ''))
+    print('\n'.join(lines))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,26 +7,79 @@ Supports: SaaS, FinTech, HealthTech, E-commerce, AI/ML, BioTech, etc.
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Tuple, Optional
-import catboost as cb
-import xgboost as xgb
-from sklearn.ensemble import RandomForestClassifier
+from concurrent.futures import ThreadPoolExecutor
 import joblib
 import logging
+import os
+import shutil
+import threading
+import weakref
 from pathlib import Path
 import json
 
+from model_cache import LRUModelCache
+from segment_training import SegmentTrainer
+from vocabulary import SECTOR, UNKNOWN_CODE
+
 logger = logging.getLogger(__name__)
 
 
+def _fit_industry_model(industry: str, X_industry: pd.DataFrame, y_industry: pd.Series, threads: int = -1):
+    """Fit one industry's model (a segment training job)"""
+    if industry in ['SaaS', 'FinTech']:
+        # Use CatBoost for these industries
+        import catboost as cb
+        model = cb.CatBoostClassifier(
+            iterations=200,
+            learning_rate=0.05,
+            depth=5,
+            verbose=False,
+            thread_count=threads,
+            allow_writing_files=False
+        )
+    elif industry in ['BioTech', 'HealthTech']:
+        # Use Random Forest for high-variance industries
+        from sklearn.ensemble import RandomForestClassifier
+        model = RandomForestClassifier(
+            n_estimators=100,
+            max_depth=6,
+            random_state=42,
+            n_jobs=threads
+        )
+    else:
+        # Use XGBoost for others
+        import xgboost as xgb
+        model = xgb.XGBClassifier(
+            n_estimators=150,
+            learning_rate=0.05,
+            max_depth=5,
+            random_state=42,
+            n_jobs=threads,
+            verbosity=0
+        )
+    
+    model.fit(X_industry, y_industry)
+    return model
+
+
 class IndustrySpecificModel:
     """
     Models trained on industry-specific success factors
     Each industry has unique KPIs and success patterns
     """
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 0, predict_workers: Optional[int] = None):
+        # Models trained in this process; saved models are indexed by load()
+        # and read on first use into an LRU cache of at most cache_size models
         self.industry_models = {}
+        self.model_files = {}
+        self.model_cache = LRUModelCache(self._load_model_file, cache_size)
         self.industry_configs = {}
+        # Threads scoring sector groups concurrently in predict_industry, from
+        # one pool per model that is started on first use
+        self.predict_workers = predict_workers or min(4, os.cpu_count() or 1)
+        self._predict_pool = None
+        self._predict_pool_lock = threading.Lock()
         
         # Industry-specific feature weights and thresholds
         self.industry_profiles = {
@@ -265,25 +318,30 @@ class IndustrySpecificModel:
         
         return stage_score
     
-    def train_industry_models(self, X: pd.DataFrame, y: pd.Series) -> None:
-        """Train separate models for each industry"""
+    def train_industry_models(self, X: pd.DataFrame, y: pd.Series,
+                              trainer: Optional[SegmentTrainer] = None) -> None:
+        """
+        Train separate models for each industry, industries in parallel.
+        Raises SegmentTrainingError after storing the successful industries if any industry failed.
+        """
         logger.info("Training industry-specific models...")
         
         if 'sector' not in X.columns:
             logger.warning("No sector column found, cannot train industry models")
             return
         
-        industries = X['sector'].value_counts()
+        sector_codes = SECTOR.codes(X['sector'])
+        industries = pd.Series(sector_codes[sector_codes != UNKNOWN_CODE]).value_counts()
         
-        for industry in industries.index:
-            if industries[industry] < 100:  # Skip industries with too few samples
-                logger.warning(f"Skipping {industry} - insufficient data ({industries[industry]} samples)")
+        jobs = {}
+        for code, count in industries.items():
+            industry = SECTOR.values[code]
+            if count < 100:  # Skip industries with too few samples
+                logger.warning(f"Skipping {industry} - insufficient data ({count} samples)")
                 continue
             
-            logger.info(f"Training model for {industry}...")
-            
             # Filter data for this industry
-            industry_mask = X['sector'] == industry
+            industry_mask = sector_codes == code
             X_industry = X[industry_mask].copy()
             y_industry = y[industry_mask]
             
@@ -304,37 +362,12 @@ class IndustrySpecificModel:
             if 'sector' in combined_features.columns:
                 combined_features = combined_features.drop('sector', axis=1)
             
-            # Train ensemble for this industry
-            if industry in ['SaaS', 'FinTech']:
-                # Use CatBoost for these industries
-                model = cb.CatBoostClassifier(
-                    iterations=200,
-                    learning_rate=0.05,
-                    depth=5,
-                    verbose=False,
-                    thread_count=-1
-                )
-            elif industry in ['BioTech', 'HealthTech']:
-                # Use Random Forest for high-variance industries
-                model = RandomForestClassifier(
-                    n_estimators=100,
-                    max_depth=6,
-                    random_state=42,
-                    n_jobs=-1
-                )
-            else:
-                # Use XGBoost for others
-                model = xgb.XGBClassifier(
-                    n_estimators=150,
-                    learning_rate=0.05,
-                    max_depth=5,
-                    random_state=42,
-                    n_jobs=-1,
-                    verbosity=0
-                )
-            
-            model.fit(combined_features, y_industry)
+            jobs[industry] = (_fit_industry_model, (industry, combined_features, y_industry))
+        
+        trainer = trainer or SegmentTrainer()
+        for industry, model in trainer.run(jobs, label="industry").items():
             self.industry_models[industry] = model
+            combined_features, y_industry = jobs[industry][1][1:]
             
             # Store feature importance
             if hasattr(model, 'feature_importances_'):
@@ -347,8 +380,7 @@ class IndustrySpecificModel:
                     'sample_count': len(y_industry),
                     'success_rate': y_industry.mean()
                 }
-            
-            logger.info(f"Completed training for {industry}")
+        trainer.raise_failures("industry")
     
     def _select_industry_features(self, df: pd.DataFrame, industry: str) -> pd.DataFrame:
         """Select relevant features for each industry"""
@@ -402,46 +434,80 @@ class IndustrySpecificModel:
         available_features = [col for col in selected if col in df.columns]
         return df[available_features]
     
-    def predict_industry(self, X: pd.DataFrame) -> np.ndarray:
-        """Make predictions using industry-specific models"""
-        predictions = np.zeros(len(X))
+    def _industry_matrix(self, X_industry: pd.DataFrame, industry: str) -> Tuple[np.ndarray, List[str]]:
+        """Base and engineered features of one sector's rows as a float matrix, NaN filled with 0"""
+        base = self._select_industry_features(X_industry, industry)
+        engineered = self.create_industry_features(X_industry, industry)
+        names = list(base.columns) + list(engineered.columns)
         
+        # Column-major: CatBoost copies C-ordered float64 input row by row
+        matrix = np.empty((len(X_industry), len(names)), order='F')
+        matrix[:, :base.shape[1]] = base.to_numpy(dtype=float)
+        matrix[:, base.shape[1]:] = engineered.to_numpy(dtype=float)
+        matrix[np.isnan(matrix)] = 0
+        return matrix, names
+    
+    def _score_industry(self, model, X_industry: pd.DataFrame, industry: str) -> np.ndarray:
+        matrix, names = self._industry_matrix(X_industry, industry)
+        # sklearn estimators fitted on frames check feature names
+        features = pd.DataFrame(matrix, columns=names) if hasattr(model, 'feature_names_in_') else matrix
+        if hasattr(model, 'predict_proba'):
+            return model.predict_proba(features)[:, 1]
+        return model.predict(features)
+    
+    def predict_industry(self, X: pd.DataFrame) -> np.ndarray:
+        """
+        Make predictions using industry-specific models.
+        Sector groups are scored concurrently on up to predict_workers threads.
+        """
         if 'sector' not in X.columns:
             logger.warning("No sector column, using default prediction")
             return np.full(len(X), 0.5)
         
-        for industry in X['sector'].unique():
-            if industry in self.industry_models:
-                # Get rows for this industry
-                industry_mask = X['sector'] == industry
-                X_industry = X[industry_mask].copy()
-                
-                # Create features
-                industry_features = self.create_industry_features(X_industry, industry)
-                base_features = self._select_industry_features(X_industry, industry)
-                combined_features = pd.concat([base_features, industry_features], axis=1)
-                combined_features = combined_features.fillna(0)
-                
-                # Remove sector column
-                if 'sector' in combined_features.columns:
-                    combined_features = combined_features.drop('sector', axis=1)
-                
-                # Predict
-                model = self.industry_models[industry]
-                if hasattr(model, 'predict_proba'):
-                    industry_pred = model.predict_proba(combined_features)[:, 1]
-                else:
-                    industry_pred = model.predict(combined_features)
-                
-                predictions[industry_mask] = industry_pred
-            else:
-                # Use default prediction for unknown industries
-                predictions[X['sector'] == industry] = 0.5
+        # Unknown sectors and sectors without a model keep the default prediction
+        predictions = np.full(len(X), 0.5)
+        sector_codes = SECTOR.codes(X['sector'])
+        
+        groups = []
+        for code in np.unique(sector_codes[sector_codes != UNKNOWN_CODE]):
+            industry = SECTOR.values[code]
+            model = self.get_model(industry)
+            if model is not None:
+                groups.append((industry, model, np.flatnonzero(sector_codes == code)))
+        
+        def score(group):
+            industry, model, rows = group
+            return self._score_industry(model, X.iloc[rows], industry)
+        
+        if len(groups) > 1 and self.predict_workers > 1:
+            scores = list(self._predict_executor().map(score, groups))
+        else:
+            scores = [score(group) for group in groups]
+        
+        for (_, _, rows), industry_pred in zip(groups, scores):
+            predictions[rows] = industry_pred
         
         return predictions
     
+    def _predict_executor(self) -> ThreadPoolExecutor:
+        with self._predict_pool_lock:
+            if self._predict_pool is None:
+                self._predict_pool = ThreadPoolExecutor(max_workers=self.predict_workers,
+                                                        thread_name_prefix='industry-predict')
+                # Idle threads go with the model when shutdown() is never called
+                weakref.finalize(self, self._predict_pool.shutdown, wait=False)
+            return self._predict_pool
+    
+    def shutdown(self) -> None:
+        """Stop the prediction threads; a later predict_industry starts new ones"""
+        with self._predict_pool_lock:
+            if self._predict_pool is not None:
+                self._predict_pool.shutdown(wait=False)
+                self._predict_pool = None
+    
     def get_industry_insights(self, industry: str) -> Dict:
         """Get insights for a specific industry"""
+        industry = SECTOR.normalize(industry) or industry
         profile = self.industry_profiles.get(industry, self.default_profile)
         config = self.industry_configs.get(industry, {})
         
@@ -453,14 +519,64 @@ class IndustrySpecificModel:
             'sample_size': config.get('sample_count', 0)
         }
     
+    def available_industries(self) -> List[str]:
+        """Industries with a trained or saved model"""
+        return sorted(set(self.industry_models) | set(self.model_files))
+    
+    def get_model(self, industry: str):
+        """Model for an industry, loading it from disk on first use; None if there is none"""
+        if industry in self.industry_models:
+            return self.industry_models[industry]
+        if industry in self.model_files:
+            return self.model_cache.get(industry)
+        return None
+    
+    def _load_model_file(self, industry: str):
+        from native_model_io import XGBoostNativeClassifier
+        from tree_ensemble import load_artifact
+        
+        model = load_artifact(self.model_files[industry])
+        if type(model).__module__.startswith('xgboost'):
+            # Some .cbm files are raw XGBoost boosters; they take columns in frame order
+            model = XGBoostNativeClassifier(model)
+        return model
+    
+    def top_industries(self, n: int, traffic: Optional[Dict[str, int]] = None) -> List[str]:
+        """
+        The n industries with a model that see the most traffic.
+        Without request counts, training sample counts stand in for traffic.
+        """
+        if traffic is None:
+            traffic = {name: config.get('sample_count', 0) for name, config in self.industry_configs.items()}
+        ranked = sorted(self.available_industries(), key=lambda name: -traffic.get(name, 0))
+        return ranked[:max(n, 0)]
+    
+    def preload(self, industries: List[str]) -> None:
+        """Load saved models ahead of traffic"""
+        self.model_cache.preload([name for name in industries if name in self.model_files])
+    
+    def cache_stats(self) -> Dict:
+        """Hit/miss, eviction and load-time metrics of the lazily loaded models"""
+        stats = self.model_cache.stats()
+        stats['available'] = self.available_industries()
+        return stats
+    
     def save(self, path: Path) -> None:
         """Save industry models"""
         path = Path(path)
         path.mkdir(parents=True, exist_ok=True)
         
         # Save each industry model
-        for industry, model in self.industry_models.items():
+        for industry in self.available_industries():
             safe_name = industry.replace('/', '_').replace(' ', '_')
+            if industry not in self.industry_models:
+                # Saved models are copied as files, bypassing the cache so a save does not evict live models
+                source = self.model_files[industry]
+                target = path / f'industry_{safe_name}{source.suffix}'
+                if not (target.exists() and os.path.samefile(source, target)):
+                    shutil.copy(source, target)
+                continue
+            model = self.industry_models[industry]
             if hasattr(model, 'save_model'):  # CatBoost
                 model.save_model(str(path / f'industry_{safe_name}.cbm'))
             else:  # sklearn models
@@ -475,8 +591,11 @@ class IndustrySpecificModel:
         
         logger.info(f"Industry models saved to {path}")
     
-    def load(self, path: Path) -> None:
-        """Load industry models"""
+    def load(self, path: Path, preload_top_n: int = 0) -> None:
+        """
+        Index saved industry models; each is read on first use.
+        preload_top_n loads the busiest industries up front.
+        """
         path = Path(path)
         
         # Load configurations
@@ -487,18 +606,21 @@ class IndustrySpecificModel:
             with open(path / 'industry_configs.json', 'r') as f:
                 self.industry_configs = json.load(f)
         
-        # Load models
+        # Index models
+        self.model_files = {}
+        self.model_cache.clear()
         for model_file in path.glob('industry_*'):
-            if model_file.suffix == '.cbm':
-                industry = model_file.stem.replace('industry_', '').replace('_', '/')
-                model = cb.CatBoostClassifier()
-                model.load_model(str(model_file))
-                self.industry_models[industry] = model
-            elif model_file.suffix == '.pkl':
-                industry = model_file.stem.replace('industry_', '').replace('_', ' ')
-                self.industry_models[industry] = joblib.load(model_file)
-        
-        logger.info(f"Industry models loaded from {path}")
+            if model_file.suffix not in ('.cbm', '.pkl'):
+                continue
+            # File names use a filesystem-safe spelling (AI/ML -> AI_ML)
+            name = model_file.stem.replace('industry_', '', 1)
+            self.model_files[SECTOR.normalize(name) or name] = model_file
+        
+        if preload_top_n:
+            self.preload(self.top_industries(preload_top_n))
+        
+        logger.info(f"Indexed {len(self.model_files)} industry models from {path} "
+                    f"({len(self.model_cache)} preloaded)")
 
 
 def train_industry_models():
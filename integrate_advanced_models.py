@@ -19,6 +19,7 @@ def generate_api_integration_code():
 
 # ========== ADVANCED MODEL IMPORTS ==========
 from train_stage_models_quick import SimpleStageModel
+from vocabulary import normalize_stage
 from dna_pattern_analysis import StartupDNAAnalyzer
 from temporal_models import TemporalPredictionModel
 from industry_specific_models import IndustrySpecificModel
@@ -124,15 +125,8 @@ async def predict_advanced(request: Request, metrics: StartupMetrics):
         # Stage-based prediction
         stage_proba = None
         if STAGE_MODEL and 'funding_stage' in feature_dict:
-            # Map funding stage
-            stage_map = {
-                'pre_seed': 'pre_seed',
-                'seed': 'seed', 
-                'series_a': 'series_a',
-                'series_b': 'series_b',
-                'series_c': 'series_c'
-            }
-            df['funding_stage'] = stage_map.get(feature_dict.get('funding_stage', '').lower(), 'seed')
+            # Map funding stage to its canonical name
+            df['funding_stage'] = normalize_stage(feature_dict.get('funding_stage')) or 'seed'
             stage_proba = float(STAGE_MODEL.predict_proba(df))
         
         # DNA Pattern Analysis
@@ -228,7 +222,7 @@ async def compare_models(metrics: StartupMetrics):
         }
         
         if STAGE_MODEL and 'funding_stage' in feature_dict:
-            df['funding_stage'] = feature_dict.get('funding_stage', 'seed').lower()
+            df['funding_stage'] = normalize_stage(feature_dict.get('funding_stage')) or 'seed'
             comparisons["stage_model"] = float(STAGE_MODEL.predict_proba(df))
         
         if TEMPORAL_MODEL:
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Model Memory Footprint Report for FLASH
+Reports on-disk artifact sizes, estimated in-memory sizes and process RSS
+per model family, plus an optional tracemalloc window of allocation sites
+"""
+
+import json
+import logging
+import pickle
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Artifact directory for each model family served by the API
+MODEL_FAMILIES = {
+    'v2_enhanced': 'models/v2_enhanced',
+    'v2_pillars': 'models/v2',
+    'stage_hierarchical': 'models/stage_hierarchical',
+    'industry': 'models/industry_specific',
+    'temporal': 'models/temporal',
+    'dna': 'models/dna_analyzer'
+}
+
+# Estimators whose state lives in native library memory rather than Python objects
+NATIVE_MODEL_MODULES = ('catboost', 'xgboost', 'lightgbm')
+
+ARTIFACT_SUFFIXES = {'.cbm', '.pkl', '.npy', '.npz', '.json', '.txt', '.ubj', '.bin'}
+
+
+def process_rss_bytes() -> int:
+    """Current resident set size of this process"""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    # Fall back to peak RSS where /proc is unavailable (kilobytes on Linux, bytes on macOS)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def artifact_sizes(base_path: Path = Path('.')) -> Dict[str, Dict]:
+    """On-disk size of every artifact, grouped by model family"""
+    report = {}
+    for family, directory in MODEL_FAMILIES.items():
+        family_path = Path(base_path) / directory
+        files = {}
+        if family_path.exists():
+            for path in sorted(family_path.rglob('*')):
+                if path.is_file() and path.suffix in ARTIFACT_SUFFIXES:
+                    files[str(path.relative_to(family_path))] = path.stat().st_size
+        report[family] = {
+            'path': str(family_path),
+            'total_bytes': sum(files.values()),
+            'files': files
+        }
+    return report
+
+
+def estimate_object_bytes(obj: Any, _seen: Optional[set] = None) -> int:
+    """
+    Estimate the memory held by an object graph.
+    NumPy buffers are counted by nbytes; native boosting models by their
+    serialized size, which tracks the size of their in-memory tree tables.
+    """
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    if isinstance(obj, np.ndarray):
+        # Memory-mapped arrays are backed by the page cache, not private memory
+        size = 0 if isinstance(obj, np.memmap) or not obj.flags.owndata else obj.nbytes
+        if obj.dtype == object:
+            # e.g. the estimators_ array of sklearn gradient boosting
+            size += sum(estimate_object_bytes(item, _seen) for item in obj.flat)
+        return size
+    module = type(obj).__module__.split('.')[0]
+    if module in NATIVE_MODEL_MODULES or (module != 'builtins' and not hasattr(obj, '__dict__')):
+        # Native models and extension types (e.g. sklearn's Cython Tree) hide their buffers
+        try:
+            return len(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            return sys.getsizeof(obj)
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_object_bytes(k, _seen) + estimate_object_bytes(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_object_bytes(item, _seen) for item in obj)
+    elif hasattr(obj, 'memory_usage') and hasattr(obj, 'columns'):
+        size = int(obj.memory_usage(deep=True).sum())
+    elif hasattr(obj, '__dict__'):
+        size += estimate_object_bytes(vars(obj), _seen)
+    return size
+
+
+def family_memory_breakdown(obj: Any) -> Dict[str, int]:
+    """Per-member estimated memory for a loaded model family"""
+    if obj is None:
+        return {}
+    members = obj if isinstance(obj, dict) else vars(obj)
+    breakdown = {}
+    for name, value in members.items():
+        if isinstance(value, dict) and value and not isinstance(obj, dict):
+            # Flatten containers such as stage_models / industry_models one level
+            for key, item in value.items():
+                breakdown[f"{name}/{key}"] = estimate_object_bytes(item)
+        else:
+            breakdown[str(name)] = estimate_object_bytes(value)
+    return breakdown
+
+
+class LoadLedger:
+    """Records the RSS growth caused by loading each model family"""
+
+    def __init__(self):
+        self.entries = {}
+
+    @contextmanager
+    def track(self, family: str):
+        rss_before = process_rss_bytes()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry = self.entries.setdefault(family, {'rss_delta_bytes': 0, 'load_seconds': 0.0})
+            entry['rss_delta_bytes'] += process_rss_bytes() - rss_before
+            entry['load_seconds'] += time.perf_counter() - started
+
+
+class AllocationSampler:
+    """
+    Bounded tracemalloc window that snapshots the heap around each request
+    and aggregates the allocation sites that grew during it
+    """
+
+    def __init__(self):
+        self.active = False
+        self.max_requests = 0
+        self.requests_seen = 0
+        self.site_bytes = defaultdict(int)
+        self.site_counts = defaultdict(int)
+        self._lock = threading.Lock()
+        self._started_tracing = False
+
+    def start(self, max_requests: int = 20, nframes: int = 1) -> None:
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(nframes)
+                self._started_tracing = True
+            self.active = True
+            self.max_requests = max_requests
+            self.requests_seen = 0
+            self.site_bytes.clear()
+            self.site_counts.clear()
+
+    def stop(self) -> None:
+        with self._lock:
+            self.active = False
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+    def snapshot(self) -> Optional[tracemalloc.Snapshot]:
+        return tracemalloc.take_snapshot() if self.active else None
+
+    def record(self, before: tracemalloc.Snapshot) -> None:
+        """Aggregate allocation growth since `before` into the window"""
+        if not self.active or before is None:
+            return
+        after = tracemalloc.take_snapshot()
+        for stat in after.compare_to(before, 'lineno'):
+            if stat.size_diff > 0:
+                site = str(stat.traceback[0])
+                self.site_bytes[site] += stat.size_diff
+                self.site_counts[site] += stat.count_diff
+        self.requests_seen += 1
+        if self.requests_seen >= self.max_requests:
+            self.stop()
+
+    def report(self, top: int = 20) -> Dict:
+        requests = max(self.requests_seen, 1)
+        sites = sorted(self.site_bytes.items(), key=lambda item: item[1], reverse=True)[:top]
+        return {
+            'active': self.active,
+            'requests_sampled': self.requests_seen,
+            'max_requests': self.max_requests,
+            'top_sites': [
+                {
+                    'site': site,
+                    'bytes_per_request': size // requests,
+                    'blocks_per_request': self.site_counts[site] / requests
+                }
+                for site, size in sites
+            ]
+        }
+
+
+def build_report(families: Dict[str, Any], ledger: Optional[LoadLedger] = None,
+                 base_path: Path = Path('.')) -> Dict:
+    """Combine disk, in-memory and RSS measurements into one report"""
+    disk = artifact_sizes(base_path)
+    report = {'process_rss_bytes': process_rss_bytes(), 'families': {}}
+    for family in MODEL_FAMILIES:
+        breakdown = family_memory_breakdown(families.get(family))
+        report['families'][family] = {
+            'loaded': families.get(family) is not None and bool(breakdown),
+            'disk_bytes': disk[family]['total_bytes'],
+            'disk_files': disk[family]['files'],
+            'memory_bytes': sum(breakdown.values()),
+            'memory_breakdown': breakdown,
+            'rss_delta_bytes': (ledger.entries.get(family) or {}).get('rss_delta_bytes') if ledger else None,
+            'load_seconds': (ledger.entries.get(family) or {}).get('load_seconds') if ledger else None
+        }
+    return report
+
+
+def main():
+    """Load every model family in a fresh process and print the footprint report"""
+    import argparse
+    import api_server
+
+    parser = argparse.ArgumentParser(description="FLASH model memory footprint report")
+    parser.add_argument('--tracemalloc', type=int, default=0, metavar='N',
+                        help="sample allocation sites while scoring N rows of the sample dataset")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    baseline_rss = process_rss_bytes()
+    api_server.load_models()
+    api_server.load_stage_models()
+    api_server.load_advanced_models()
+
+    report = build_report(api_server.loaded_model_families(), api_server.MEMORY_LEDGER)
+    report['baseline_rss_bytes'] = baseline_rss
+
+    if args.tracemalloc:
+        report['allocations'] = sample_inference_allocations(api_server, args.tracemalloc)
+
+    print(json.dumps(report, indent=2, default=str))
+
+
+def sample_inference_allocations(api_server, n_requests: int) -> Dict:
+    """Score sample rows through every loaded model family under a tracemalloc window"""
+    import pandas as pd
+
+    sample = pd.read_csv('data/final_sample_1000.csv').head(n_requests)
+    sampler = api_server.ALLOCATION_SAMPLER
+    sampler.start(max_requests=len(sample))
+    for i in range(len(sample)):
+        before = sampler.snapshot()
+        _score_row(api_server, sample.iloc[[i]].copy())
+        sampler.record(before)
+    report = sampler.report()
+    sampler.stop()
+    return report
+
+
+def _score_row(api_server, row) -> None:
+    """Run one row through each family the way /predict_advanced does"""
+    features = api_server.create_engineered_features(row.copy())
+    scorers = [
+        lambda: [m.predict_proba(features[m.feature_names_]) for m in api_server.MODELS.values()
+                 if hasattr(m, 'feature_names_')],
+        lambda: [m.predict_proba(features[m.feature_names_]) for m in api_server.PILLAR_MODELS.values()],
+        lambda: api_server.STAGE_MODEL and api_server.STAGE_MODEL.predict_proba(row),
+        lambda: api_server.DNA_ANALYZER and api_server.DNA_ANALYZER.predict_growth_trajectory(row),
+        lambda: api_server.TEMPORAL_MODEL and api_server.TEMPORAL_MODEL.predict_temporal(row),
+        lambda: api_server.INDUSTRY_MODEL and api_server.INDUSTRY_MODEL.predict_industry(row)
+    ]
+    for scorer in scorers:
+        try:
+            scorer()
+        except Exception as e:
+            logger.debug(f"Skipping scorer during allocation sampling: {e}")
+
+
+if __name__ == "__main__":
+    main()
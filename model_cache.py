@@ -0,0 +1,124 @@
+"""
+Model Cache for FLASH
+Loads models on first use and keeps the most recently used ones resident,
+evicting the least recently used model once the cache is full
+"""
+
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Iterable, List
+
+logger = logging.getLogger(__name__)
+
+
+class LRUModelCache:
+    """
+    Thread-safe least-recently-used cache of loaded models.
+
+    `loader(key)` is called on a miss; `max_models` bounds how many models stay
+    resident (0 or less means unbounded). Hits, misses, evictions, load time and
+    per-key request counts are recorded for the admin metrics.
+    """
+
+    def __init__(self, loader: Callable[[Hashable], Any], max_models: int = 0):
+        self.loader = loader
+        self.max_models = max_models
+        self._models: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading: Dict[Hashable, Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.requests: Counter = Counter()
+        self.load_seconds: Dict[Hashable, float] = {}
+
+    def get(self, key: Hashable) -> Any:
+        """Return the model for `key`, loading it (and evicting the LRU model) on a miss"""
+        return self._fetch(key, record=True)
+
+    def preload(self, keys: Iterable[Hashable]) -> None:
+        """Load `keys` ahead of traffic; preloads count as neither requests nor misses"""
+        for key in keys:
+            self._fetch(key, record=False)
+
+    def _fetch(self, key: Hashable, record: bool) -> Any:
+        """
+        Resident model or a load. Loads run outside the lock so hits on other keys
+        are never held up by a slow disk read; concurrent misses on the same key
+        wait for the first caller's load instead of loading again.
+        """
+        with self._lock:
+            if record:
+                self.requests[key] += 1
+            if key in self._models:
+                if record:
+                    self.hits += 1
+                    self._models.move_to_end(key)
+                return self._models[key]
+            if record:
+                self.misses += 1
+            loading = self._loading.get(key)
+            if loading is not None:
+                owner = False
+            else:
+                loading = self._loading[key] = Future()
+                owner = True
+        if not owner:
+            return loading.result()
+        return self._load(key, loading)
+
+    def _load(self, key: Hashable, loading: Future) -> Any:
+        started = time.perf_counter()
+        try:
+            model = self.loader(key)
+        except BaseException as e:
+            with self._lock:
+                del self._loading[key]
+            loading.set_exception(e)
+            raise
+        elapsed = time.perf_counter() - started
+        logger.info(f"Loaded model {key} in {elapsed * 1000:.1f}ms")
+
+        with self._lock:
+            self.load_seconds[key] = self.load_seconds.get(key, 0.0) + elapsed
+            self._models[key] = model
+            while 0 < self.max_models < len(self._models):
+                evicted, _ = self._models.popitem(last=False)
+                self.evictions += 1
+                logger.info(f"Evicted model {evicted} from cache")
+            del self._loading[key]
+        loading.set_result(model)
+        return model
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._models
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    def resident(self) -> List[Hashable]:
+        """Cached keys, least recently used first"""
+        with self._lock:
+            return list(self._models)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'max_models': self.max_models,
+                'resident': list(self._models),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'load_seconds': dict(self.load_seconds),
+                'total_load_seconds': sum(self.load_seconds.values()),
+                'requests': dict(self.requests.most_common())
+            }
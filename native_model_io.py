@@ -0,0 +1,160 @@
+"""
+Native Model Serialization for FLASH
+Saves gradient boosting models in each library's own binary format and
+loads them back as lightweight predictors built on the in-place prediction APIs
+"""
+
+import logging
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# File extension used for each library's native format
+NATIVE_EXTENSIONS = {
+    'catboost': '.cbm',
+    'xgboost': '.ubj',
+    'lightgbm': '.txt'
+}
+
+
+def model_library(model: Any) -> Optional[str]:
+    """Name of the boosting library a fitted model comes from, or None"""
+    module = type(model).__module__.split('.')[0]
+    return module if module in NATIVE_EXTENSIONS else None
+
+
+def model_feature_names(model: Any) -> Optional[List[str]]:
+    """Training feature order of a fitted model, when the library recorded it"""
+    for attr in ('feature_names_', 'feature_names_in_', 'feature_name_'):
+        names = getattr(model, attr, None)
+        if names is not None and len(names):
+            return [str(name) for name in names]
+    return None
+
+
+def save_model(model: Any, directory: Path, name: str) -> Dict:
+    """
+    Save one model and return its manifest entry.
+    Boosting models use their native format; anything else falls back to joblib.
+    """
+    directory = Path(directory)
+    library = model_library(model)
+
+    if library == 'catboost':
+        filename = f"{name}.cbm"
+        model.save_model(str(directory / filename), format='cbm')
+    elif library == 'xgboost':
+        filename = f"{name}.ubj"
+        model.get_booster().save_model(str(directory / filename))
+    elif library == 'lightgbm':
+        filename = f"{name}.txt"
+        model.booster_.save_model(str(directory / filename))
+    else:
+        filename = f"{name}.pkl"
+        joblib.dump(model, directory / filename)
+
+    return {
+        'file': filename,
+        'library': library or 'joblib',
+        'feature_names': model_feature_names(model)
+    }
+
+
+def load_model(directory: Path, entry: Dict) -> Any:
+    """Load a model described by a manifest entry"""
+    path = Path(directory) / entry['file']
+    library = entry['library']
+
+    if library == 'catboost':
+        import catboost as cb
+        model = cb.CatBoostClassifier()
+        model.load_model(str(path), format='cbm')
+        return CatBoostNativeClassifier(model, entry.get('feature_names'))
+    if library == 'xgboost':
+        import xgboost as xgb
+        booster = xgb.Booster()
+        booster.load_model(str(path))
+        return XGBoostNativeClassifier(booster, entry.get('feature_names'))
+    if library == 'lightgbm':
+        import lightgbm as lgb
+        booster = lgb.Booster(model_file=str(path))
+        return LightGBMNativeClassifier(booster, entry.get('feature_names'))
+    return joblib.load(path)
+
+
+class NativeClassifier(ABC):
+    """
+    Binary classifier facade over a native booster.
+    Inputs are reordered to the training feature order and passed to the
+    library as a contiguous numeric matrix, skipping sklearn wrapper overhead.
+    """
+
+    library = None
+    input_dtype = np.float32
+
+    def __init__(self, model: Any, feature_names: Optional[List[str]] = None):
+        self.model = model
+        self.feature_names_ = feature_names
+
+    def _matrix(self, X) -> np.ndarray:
+        if isinstance(X, pd.DataFrame):
+            if self.feature_names_ is not None:
+                X = X[self.feature_names_]
+            X = X.to_numpy(dtype=self.input_dtype)
+        return np.ascontiguousarray(X, dtype=self.input_dtype)
+
+    @abstractmethod
+    def _positive_proba(self, X: np.ndarray) -> np.ndarray:
+        """Positive-class probabilities for a contiguous input matrix"""
+
+    def predict_proba(self, X) -> np.ndarray:
+        positive = np.asarray(self._positive_proba(self._matrix(X)), dtype=float).reshape(-1)
+        return np.column_stack([1 - positive, positive])
+
+    def predict(self, X) -> np.ndarray:
+        return (self.predict_proba(X)[:, 1] > 0.5).astype(int)
+
+
+class CatBoostNativeClassifier(NativeClassifier):
+    library = 'catboost'
+
+    def _positive_proba(self, X: np.ndarray) -> np.ndarray:
+        return self.model.predict(X, prediction_type='Probability')[:, 1]
+
+    @property
+    def feature_importances_(self) -> np.ndarray:
+        return self.model.get_feature_importance()
+
+
+class XGBoostNativeClassifier(NativeClassifier):
+    library = 'xgboost'
+
+    def _positive_proba(self, X: np.ndarray) -> np.ndarray:
+        # inplace_predict skips DMatrix construction; binary:logistic yields probabilities
+        return self.model.inplace_predict(X, validate_features=False)
+
+    @property
+    def feature_importances_(self) -> np.ndarray:
+        scores = self.model.get_score(importance_type='weight')
+        names = self.feature_names_ or self.model.feature_names or []
+        total = sum(scores.values()) or 1
+        return np.array([scores.get(name, 0) / total for name in names])
+
+
+class LightGBMNativeClassifier(NativeClassifier):
+    library = 'lightgbm'
+    # LightGBM compares against double-precision thresholds
+    input_dtype = np.float64
+
+    def _positive_proba(self, X: np.ndarray) -> np.ndarray:
+        return self.model.predict(X)
+
+    @property
+    def feature_importances_(self) -> np.ndarray:
+        return self.model.feature_importance()
@@ -0,0 +1,212 @@
+"""
+Per-Request Profiling for FLASH API
+Captures cProfile or sampled stack profiles for individual requests
+and keeps the most recent ones in a bounded on-disk ring buffer
+"""
+
+import cProfile
+import io
+import json
+import logging
+import marshal
+import pstats
+import random
+import re
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ('cprofile', 'sampling')
+PROFILE_ID_PATTERN = re.compile(r'^[0-9]+-[0-9a-f]{8}$')
+
+
+class SamplingProfiler:
+    """
+    Lightweight sampling profiler that periodically records the call stack
+    of a single thread and aggregates it into collapsed-stack format
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.005, max_depth: int = 64):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="flash-sampling-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                code = frame.f_code
+                stack.append(f"{Path(code.co_filename).name}:{code.co_name}:{frame.f_lineno}")
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        """Return stacks in the collapsed format consumed by flamegraph tools"""
+        return ''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfileStore:
+    """Bounded on-disk ring buffer of request profiles"""
+
+    def __init__(self, directory: Path, max_profiles: int = 50):
+        self.directory = Path(directory)
+        self.max_profiles = max_profiles
+        self._lock = threading.Lock()
+
+    def save(self, payload: bytes, extension: str, metadata: Dict) -> str:
+        """Write a profile and its metadata, evicting the oldest profiles beyond the limit"""
+        profile_id = f"{time.time_ns()}-{secrets.token_hex(4)}"
+        metadata = dict(metadata, id=profile_id, file=f"{profile_id}{extension}", size_bytes=len(payload))
+
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            (self.directory / metadata['file']).write_bytes(payload)
+            with open(self.directory / f"{profile_id}.json", 'w') as f:
+                json.dump(metadata, f, indent=2)
+            self._evict()
+
+        return profile_id
+
+    def _evict(self) -> None:
+        entries = sorted(self.directory.glob('*.json'))
+        for meta_path in entries[:max(0, len(entries) - self.max_profiles)]:
+            for path in self.directory.glob(f"{meta_path.stem}.*"):
+                path.unlink(missing_ok=True)
+
+    def list(self) -> List[Dict]:
+        """Return metadata for stored profiles, newest first"""
+        if not self.directory.exists():
+            return []
+        profiles = []
+        for meta_path in sorted(self.directory.glob('*.json'), reverse=True):
+            try:
+                with open(meta_path, 'r') as f:
+                    profiles.append(json.load(f))
+            except (OSError, ValueError):
+                # Evicted or half-written between glob and read
+                continue
+        return profiles
+
+    def get(self, profile_id: str) -> Optional[Dict]:
+        """Return metadata for one profile, or None if it is unknown or evicted"""
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            return None
+        meta_path = self.directory / f"{profile_id}.json"
+        if not meta_path.exists():
+            return None
+        with open(meta_path, 'r') as f:
+            return json.load(f)
+
+    def path_for(self, metadata: Dict) -> Path:
+        return self.directory / metadata['file']
+
+
+class RequestProfiler:
+    """
+    Decides which requests to profile and records them into a ProfileStore.
+    Only one request is profiled at a time; concurrent candidates run unprofiled.
+    """
+
+    def __init__(self, store: ProfileStore, mode: str = 'cprofile', sample_rate: float = 0.0,
+                 top_functions: int = 25):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode '{mode}', expected one of {PROFILE_MODES}")
+        self.store = store
+        self.mode = mode
+        self.sample_rate = sample_rate
+        self.top_functions = top_functions
+        self._active = threading.Lock()
+
+    def trigger_for(self, header_requested: bool, is_admin: bool) -> Optional[str]:
+        """Return why a request should be profiled, or None to skip it"""
+        if header_requested and is_admin:
+            return 'header'
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return 'sampled'
+        return None
+
+    def start(self) -> Optional[Dict]:
+        """Begin profiling the current thread; returns None if another profile is running"""
+        if not self._active.acquire(blocking=False):
+            return None
+        session = {'started': time.perf_counter(), 'timestamp': datetime.now().isoformat()}
+        if self.mode == 'cprofile':
+            session['profiler'] = cProfile.Profile()
+            session['profiler'].enable()
+        else:
+            session['profiler'] = SamplingProfiler(threading.get_ident())
+            session['profiler'].start()
+        return session
+
+    def finish(self, session: Dict, metadata: Dict) -> Optional[str]:
+        """Stop profiling and persist the result; returns the stored profile id"""
+        try:
+            profiler = session['profiler']
+            if self.mode == 'cprofile':
+                profiler.disable()
+            else:
+                profiler.stop()
+            duration_ms = (time.perf_counter() - session['started']) * 1000
+        finally:
+            self._active.release()
+
+        metadata = dict(metadata, mode=self.mode, timestamp=session['timestamp'],
+                        duration_ms=round(duration_ms, 3))
+        try:
+            if self.mode == 'cprofile':
+                stats = pstats.Stats(profiler)
+                metadata['top_functions'] = self._summarize(stats)
+                payload = self._marshal(stats)
+                return self.store.save(payload, '.prof', metadata)
+            payload = profiler.collapsed().encode()
+            metadata['samples'] = sum(profiler.stacks.values())
+            return self.store.save(payload, '.collapsed', metadata)
+        except Exception as e:
+            logger.error(f"Failed to store request profile: {e}")
+            return None
+
+    def _summarize(self, stats: pstats.Stats) -> List[Dict]:
+        """Top functions by cumulative time, for quick inspection without downloading"""
+        rows = []
+        for (filename, line, name), (cc, nc, tt, ct, _) in stats.stats.items():
+            rows.append({
+                'function': f"{Path(filename).name}:{line}({name})",
+                'calls': nc,
+                'total_time_ms': round(tt * 1000, 3),
+                'cumulative_time_ms': round(ct * 1000, 3)
+            })
+        rows.sort(key=lambda r: r['cumulative_time_ms'], reverse=True)
+        return rows[:self.top_functions]
+
+    @staticmethod
+    def _marshal(stats: pstats.Stats) -> bytes:
+        """Serialize stats in the standard pstats file format"""
+        return marshal.dumps(stats.stats)
+
+    @staticmethod
+    def format_stats(path: Path, limit: int = 50) -> str:
+        """Render a stored cProfile dump as the familiar pstats text report"""
+        buffer = io.StringIO()
+        stats = pstats.Stats(str(path), stream=buffer)
+        stats.sort_stats('cumulative').print_stats(limit)
+        return buffer.getvalue()
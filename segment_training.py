@@ -0,0 +1,117 @@
+"""
+Parallel Segment Training for FLASH
+Trains independent per-segment models (funding stages, industries, time horizons)
+in worker processes under one global CPU budget, splitting the budget's threads
+evenly across the concurrently running jobs
+"""
+
+import logging
+import multiprocessing
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# A segment job: module-level function and its positional arguments. The function
+# is called as fn(*args, threads=n) and must be importable by a spawned worker.
+SegmentJob = Tuple[Callable[..., Any], tuple]
+
+
+def _run_job(fn: Callable[..., Any], args: tuple, threads: int) -> Tuple[Any, float]:
+    """Fit one segment with native thread pools capped at `threads`"""
+    from threadpoolctl import threadpool_limits
+
+    started = time.perf_counter()
+    with threadpool_limits(limits=threads):
+        result = fn(*args, threads=threads)
+    return result, time.perf_counter() - started
+
+
+class SegmentTrainingError(RuntimeError):
+    """Some segments of a run failed to train; `failures` maps each to its error"""
+
+    def __init__(self, label: str, failures: Dict[str, str]):
+        self.failures = dict(failures)
+        super().__init__(f"{len(failures)} {label} model(s) failed to train: {', '.join(failures)}")
+
+
+class SegmentTrainer:
+    """
+    Runs segment jobs in parallel processes under a global CPU budget.
+
+    cpu_budget is the total number of threads all jobs may use together
+    (default: TRAINING_CPU_BUDGET from the settings, 0 meaning every core).
+    Up to max_workers jobs run at once, each with cpu_budget // workers threads.
+    With a budget of one core, or a single job, jobs run in this process.
+
+    A failing segment is logged and recorded in `failures`; the other segments
+    still train, and raise_failures() afterwards turns any failure into a
+    SegmentTrainingError. Per-segment wall time is recorded in `timings`.
+    """
+
+    def __init__(self, cpu_budget: Optional[int] = None, max_workers: Optional[int] = None):
+        if cpu_budget is None:
+            from config import settings
+            cpu_budget = settings.TRAINING_CPU_BUDGET
+        self.cpu_budget = cpu_budget if cpu_budget and cpu_budget > 0 else (os.cpu_count() or 1)
+        self.max_workers = max_workers
+        self.timings: Dict[str, float] = {}
+        self.failures: Dict[str, str] = {}
+
+    def plan(self, n_jobs: int) -> Tuple[int, int]:
+        """(concurrent workers, threads per job) for n_jobs jobs"""
+        workers = max(1, min(n_jobs, self.cpu_budget, self.max_workers or self.cpu_budget))
+        return workers, max(1, self.cpu_budget // workers)
+
+    def run(self, jobs: Dict[str, SegmentJob], label: str = "segment") -> Dict[str, Any]:
+        """Train every job and return {segment: result} for the segments that succeeded"""
+        self.timings, self.failures = {}, {}
+        if not jobs:
+            return {}
+
+        workers, threads = self.plan(len(jobs))
+        logger.info(f"Training {len(jobs)} {label} models: {workers} workers x {threads} threads "
+                    f"(CPU budget {self.cpu_budget})")
+        started = time.perf_counter()
+
+        results = {}
+        if workers == 1:
+            for name, (fn, args) in jobs.items():
+                try:
+                    results[name], self.timings[name] = _run_job(fn, args, threads)
+                except Exception:
+                    self._record_failure(label, name, traceback.format_exc())
+                else:
+                    self._log_timing(label, name, threads)
+        else:
+            # Spawned workers: forking after OpenMP/BLAS threads have started can deadlock
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                futures = {name: pool.submit(_run_job, fn, args, threads) for name, (fn, args) in jobs.items()}
+                for name, future in futures.items():
+                    try:
+                        results[name], self.timings[name] = future.result()
+                    except Exception as e:
+                        self._record_failure(label, name, f"{type(e).__name__}: {e}")
+                    else:
+                        self._log_timing(label, name, threads)
+
+        elapsed = time.perf_counter() - started
+        logger.info(f"Trained {len(results)}/{len(jobs)} {label} models in {elapsed:.1f}s "
+                    f"({sum(self.timings.values()):.1f}s of segment time)")
+        return results
+
+    def raise_failures(self, label: str = "segment") -> None:
+        """Raise SegmentTrainingError if any segment of the last run failed"""
+        if self.failures:
+            raise SegmentTrainingError(label, self.failures)
+
+    def _log_timing(self, label: str, name: str, threads: int) -> None:
+        logger.info(f"Trained {label} model {name} in {self.timings[name]:.1f}s ({threads} threads)")
+
+    def _record_failure(self, label: str, name: str, error: str) -> None:
+        self.failures[name] = error
+        logger.error(f"Training {label} model {name} failed: {error}")
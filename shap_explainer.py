@@ -4,48 +4,364 @@ SHAP Explainability Module for FLASH 2.0
 Provides interpretable AI insights for startup predictions
 """
 
-import shap
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 from io import BytesIO
 import base64
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 import pickle
+import hashlib
+import logging
+import os
+import threading
+import time
 from pathlib import Path
-import seaborn as sns
+from functools import lru_cache
+
+import joblib
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def _pyplot():
+    """Import and configure matplotlib on first use; it is only needed for plots"""
+    import matplotlib.pyplot as plt
+    
+    # Configure matplotlib for better quality
+    plt.rcParams['figure.dpi'] = 150
+    plt.rcParams['savefig.dpi'] = 150
+    plt.rcParams['font.size'] = 10
+    plt.rcParams['figure.figsize'] = (10, 6)
+    return plt
+
+
+def _file_digest(path: Path) -> str:
+    """Content hash of a model file, so cached explainers follow the model bytes"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _format_value(value) -> str:
+    """Feature value for labels: numbers to two decimals, categories as they are"""
+    try:
+        return f"{float(value):.2f}"
+    except (TypeError, ValueError):
+        return str(value)
+
+
+# Content types of the formats plots can be rendered in
+PLOT_FORMATS = {'svg': 'image/svg+xml', 'png': 'image/png'}
+
+# Scales SHAP values come in: boosted models explain raw log-odds, forests probabilities.
+# Explanations without an 'output_scale' predate it and are read as probabilities.
+OUTPUT_SCALES = ('log_odds', 'probability')
+SCALE_LABELS = {'log_odds': 'success log-odds', 'probability': 'success probability'}
+
+# Smallest SHAP value reported as a strength or weakness; 0.08 log-odds is
+# about 0.02 probability around a 50% prediction
+INSIGHT_THRESHOLDS = {'log_odds': 0.08, 'probability': 0.02}
+
+
+def _output_scale(explanation: Dict) -> str:
+    return explanation.get('output_scale', 'probability')
+
+
+def _impact_axis_label(scales) -> str:
+    """x-axis label for SHAP bars, naming the scale when all values share one"""
+    scales = set(scales)
+    if len(scales) != 1:
+        return 'SHAP Value'
+    return f"Impact on {SCALE_LABELS[scales.pop()].title()}"
+
+
+def _meta_waterfall_figure(plt, pillar_explanations: Dict, meta_explanation: Optional[Dict]):
+    """Meta model waterfall plot"""
+    if not meta_explanation:
+        return None
+    fig, ax = plt.subplots(figsize=(8, 4))
+    
+    # Create waterfall data
+    values = meta_explanation['shap_values']
+    features = meta_explanation['feature_names']
+    feature_values = meta_explanation['feature_values']
+    
+    # Sort by absolute impact
+    sorted_idx = np.argsort(np.abs(values))[::-1]
+    
+    # Create bar chart
+    y_pos = np.arange(len(values))
+    colors = ['#e74c3c' if v < 0 else '#2ecc71' for v in values]
+    
+    bars = ax.barh(y_pos, [values[i] for i in sorted_idx], 
+                  color=[colors[i] for i in sorted_idx])
+    
+    # Customize
+    ax.set_yticks(y_pos)
+    ax.set_yticklabels([f"{features[i]}\n({_format_value(feature_values[i])})" 
+                      for i in sorted_idx])
+    ax.set_xlabel(_impact_axis_label([_output_scale(meta_explanation)]))
+    ax.set_title('CAMP Pillar Contributions')
+    ax.axvline(x=0, color='black', linestyle='-', linewidth=0.5)
+    
+    # Add value labels
+    for i, (bar, idx) in enumerate(zip(bars, sorted_idx)):
+        width = bar.get_width()
+        ax.text(width + 0.01 if width > 0 else width - 0.01, 
+               bar.get_y() + bar.get_height()/2,
+               f'{values[idx]:.3f}', 
+               ha='left' if width > 0 else 'right', 
+               va='center', fontsize=9)
+    return fig
+
+
+def _top_features_figure(plt, pillar_explanations: Dict, meta_explanation: Optional[Dict]):
+    """Top features across all pillars"""
+    all_features = []
+    all_values = []
+    all_impacts = []
+    
+    for pillar, exp in pillar_explanations.items():
+        for i, (feat, val, impact) in enumerate(zip(
+            exp['feature_names'], 
+            exp['feature_values'], 
+            exp['shap_values']
+        )):
+            all_features.append(f"{feat}")
+            all_values.append(val)
+            all_impacts.append(impact)
+    
+    # Get top 15 by absolute impact
+    top_idx = np.argsort(np.abs(all_impacts))[-15:][::-1]
+    
+    fig, ax = plt.subplots(figsize=(10, 6))
+    y_pos = np.arange(len(top_idx))
+    impacts = [all_impacts[i] for i in top_idx]
+    colors = ['#e74c3c' if v < 0 else '#2ecc71' for v in impacts]
+    
+    bars = ax.barh(y_pos, impacts, color=colors)
+    ax.set_yticks(y_pos)
+    ax.set_yticklabels([f"{all_features[i]}\n(={_format_value(all_values[i])})" 
+                       for i in top_idx], fontsize=9)
+    ax.set_xlabel(_impact_axis_label(_output_scale(exp) for exp in pillar_explanations.values()))
+    ax.set_title('Top 15 Feature Contributions')
+    ax.axvline(x=0, color='black', linestyle='-', linewidth=0.5)
+    
+    # Add value labels
+    for bar, impact in zip(bars, impacts):
+        width = bar.get_width()
+        ax.text(width + 0.001 if width > 0 else width - 0.001, 
+               bar.get_y() + bar.get_height()/2,
+               f'{impact:.3f}', 
+               ha='left' if width > 0 else 'right', 
+               va='center', fontsize=8)
+    return fig
+
+
+def _pillar_radar_figure(plt, pillar_explanations: Dict, meta_explanation: Optional[Dict]):
+    """Pillar breakdown radar chart"""
+    pillar_predictions = {p: e['prediction'] for p, e in pillar_explanations.items()}
+    if len(pillar_predictions) != 4:
+        return None
+    fig, ax = plt.subplots(figsize=(8, 8), subplot_kw=dict(projection='polar'))
+    
+    categories = list(pillar_predictions.keys())
+    values = list(pillar_predictions.values())
+    
+    # Number of variables
+    num_vars = len(categories)
+    
+    # Compute angle for each axis
+    angles = [n / float(num_vars) * 2 * np.pi for n in range(num_vars)]
+    values += values[:1]  # Complete the circle
+    angles += angles[:1]
+    
+    # Plot
+    ax.plot(angles, values, 'o-', linewidth=2, color='#3498db')
+    ax.fill(angles, values, alpha=0.25, color='#3498db')
+    
+    # Labels
+    ax.set_xticks(angles[:-1])
+    ax.set_xticklabels([c.upper() for c in categories])
+    ax.set_ylim(0, 1)
+    ax.set_yticks([0.2, 0.4, 0.6, 0.8])
+    ax.set_yticklabels(['0.2', '0.4', '0.6', '0.8'])
+    ax.set_title('CAMP Pillar Scores', y=1.08)
+    
+    # Add value labels
+    for angle, value, cat in zip(angles[:-1], values[:-1], categories):
+        ax.text(angle, value + 0.05, f'{value:.2f}', 
+               ha='center', va='center', fontsize=10, 
+               bbox=dict(boxstyle='round,pad=0.3', 
+                        facecolor='white', edgecolor='gray'))
+    return fig
+
+
+# Plot name -> figure builder; builders return None when the explanation lacks their inputs
+PLOT_BUILDERS = {
+    'meta_waterfall': _meta_waterfall_figure,
+    'top_features': _top_features_figure,
+    'pillar_radar': _pillar_radar_figure
+}
+
+
+def available_plots(pillar_explanations: Dict, meta_explanation: Optional[Dict]) -> List[str]:
+    """Names of the plots an explanation has the inputs for"""
+    names = ['top_features']
+    if meta_explanation:
+        names.insert(0, 'meta_waterfall')
+    if len(pillar_explanations) == 4:
+        names.append('pillar_radar')
+    return names
+
+
+def render_plot(name: str, pillar_explanations: Dict, meta_explanation: Optional[Dict],
+                fmt: str = 'svg', dpi: int = 72) -> bytes:
+    """Render one explanation plot to SVG or PNG bytes"""
+    plt = _pyplot()
+    fig = PLOT_BUILDERS[name](plt, pillar_explanations, meta_explanation)
+    if fig is None:
+        raise ValueError(f"Explanation has no inputs for the {name} plot")
+    try:
+        plt.tight_layout()
+        buffer = BytesIO()
+        fig.savefig(buffer, format=fmt, dpi=dpi, bbox_inches='tight',
+                    facecolor='white', edgecolor='none')
+        return buffer.getvalue()
+    finally:
+        plt.close(fig)
+
+
+def _positive_class(shap_values) -> np.ndarray:
+    """Positive-class SHAP values as (rows, features) from any TreeExplainer output layout"""
+    if isinstance(shap_values, list):
+        shap_values = shap_values[1]  # For binary classification
+    shap_values = np.asarray(shap_values)
+    if shap_values.ndim == 3:
+        shap_values = shap_values[:, :, 1]
+    return shap_values
+
+
+PILLARS = ['capital', 'advantage', 'market', 'people']
+
+# Meta model interaction features, as built in train_flash_v2.py
+META_INTERACTIONS = {
+    'capital_x_market': ('capital', 'market'),
+    'people_x_advantage': ('people', 'advantage')
+}
+
+META_DISPLAY_NAMES = {
+    'capital': 'Capital Score',
+    'advantage': 'Advantage Score',
+    'market': 'Market Score',
+    'people': 'People Score',
+    'capital_x_market': 'Capital x Market',
+    'people_x_advantage': 'People x Advantage'
+}
+
+# 'shap' explains every model with shap.TreeExplainer; 'catboost' computes SHAP
+# values of CatBoost models natively and falls back to shap for other models
+EXPLAINER_BACKENDS = ('shap', 'catboost')
+
+
+def _is_catboost(model) -> bool:
+    return type(model).__module__.startswith('catboost')
+
+
+def _explainer_scale(explainer) -> str:
+    """Scale of an explainer's SHAP values, as in OUTPUT_SCALES"""
+    if isinstance(explainer, CatBoostShapExplainer):
+        return 'log_odds'
+    # shap.TreeExplainer records what the trees output: 'probability' for forests
+    tree_output = getattr(getattr(explainer, 'model', None), 'tree_output', None)
+    return 'probability' if tree_output == 'probability' else 'log_odds'
+
+
+def _model_input(model, feature_names: List[str], values: List[List]):
+    """Rows of feature values as model input: a frame with string categoricals for CatBoost"""
+    if not _is_catboost(model):
+        return np.array(values, dtype=float)
+    X = pd.DataFrame(values, columns=feature_names)
+    cat_columns = set(model.get_cat_feature_indices())
+    for index, column in enumerate(feature_names):
+        X[column] = X[column].astype(str) if index in cat_columns else X[column].astype(float)
+    return X
+
+
+class CatBoostShapExplainer:
+    """
+    SHAP values from CatBoost's own multi-threaded ShapValues computation,
+    without extracting the trees into shap. approximate=True uses CatBoost's
+    approximate mode: lower latency, values close to the exact ones.
+    """
+    
+    def __init__(self, model, approximate: bool = False, thread_count: int = -1):
+        self.model = model
+        self.approximate = approximate
+        self.thread_count = thread_count
+        self.cat_features = model.get_cat_feature_indices()
+    
+    def shap_values(self, X) -> np.ndarray:
+        import catboost as cb
+        
+        pool = X if isinstance(X, cb.Pool) else cb.Pool(X, cat_features=self.cat_features)
+        values = self.model.get_feature_importance(
+            pool, type='ShapValues',
+            shap_calc_type='Approximate' if self.approximate else 'Regular',
+            thread_count=self.thread_count
+        )
+        # The last column is the expected value
+        return values[:, :-1]
+    
+    def shap_interaction_values(self, X) -> np.ndarray:
+        """Per-row SHAP interaction matrices, (rows, features, features)"""
+        import catboost as cb
+        
+        pool = X if isinstance(X, cb.Pool) else cb.Pool(X, cat_features=self.cat_features)
+        values = self.model.get_feature_importance(
+            pool, type='ShapInteractionValues', thread_count=self.thread_count
+        )
+        # The last row and column hold the expected value
+        return values[:, :-1, :-1]
 
-# Configure matplotlib for better quality
-plt.rcParams['figure.dpi'] = 150
-plt.rcParams['savefig.dpi'] = 150
-plt.rcParams['font.size'] = 10
-plt.rcParams['figure.figsize'] = (10, 6)
 
 class FLASHExplainer:
     """SHAP-based explainability for FLASH predictions"""
     
-    def __init__(self, models_dir: str = "models/v2"):
+    def __init__(self, models_dir: str = "models/v2", cache_dir: Optional[str] = None,
+                 backend: str = 'shap', approximate: bool = False, thread_count: int = -1):
+        if backend not in EXPLAINER_BACKENDS:
+            raise ValueError(f"Unknown explainer backend {backend!r}, expected one of {EXPLAINER_BACKENDS}")
         self.models_dir = Path(models_dir)
+        # Built explainers (expected values, extracted trees) are cached here when set
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        # Native CatBoost SHAP settings, used by the 'catboost' backend
+        self.backend = backend
+        self.approximate = approximate
+        self.thread_count = thread_count
+        self.model_paths = {}
         self.models = self._load_models()
         self.explainers = self._create_explainers()
         self.feature_names = self._get_feature_names()
         
     def _load_models(self) -> Dict:
-        """Load all trained models"""
+        """Load the pillar and meta models, pickled or as native CatBoost .cbm files"""
         models = {}
         
-        # Load pillar models
-        for pillar in ['capital', 'advantage', 'market', 'people']:
-            model_path = self.models_dir / f"{pillar}_model.pkl"
-            if model_path.exists():
-                with open(model_path, 'rb') as f:
-                    models[pillar] = pickle.load(f)
-                    
-        # Load meta model
-        meta_path = self.models_dir / "meta_model.pkl"
-        if meta_path.exists():
-            with open(meta_path, 'rb') as f:
-                models['meta'] = pickle.load(f)
+        for name in PILLARS + ['meta']:
+            pickle_path = self.models_dir / f"{name}_model.pkl"
+            native_path = self.models_dir / f"{name}_model.cbm"
+            if pickle_path.exists():
+                with open(pickle_path, 'rb') as f:
+                    models[name] = pickle.load(f)
+                self.model_paths[name] = pickle_path
+            elif native_path.exists():
+                from catboost import CatBoostClassifier
+                models[name] = CatBoostClassifier().load_model(str(native_path))
+                self.model_paths[name] = native_path
                 
         return models
     
@@ -54,14 +370,40 @@ class FLASHExplainer:
         explainers = {}
         
         for name, model in self.models.items():
-            # Use TreeExplainer for tree-based models
-            explainers[name] = shap.TreeExplainer(model)
+            if self.backend == 'catboost' and _is_catboost(model):
+                explainers[name] = CatBoostShapExplainer(model, self.approximate, self.thread_count)
+            else:
+                # Use TreeExplainer for tree-based models
+                explainers[name] = self._cached_explainer(name, model)
             
         return explainers
     
+    def _cached_explainer(self, name: str, model):
+        """TreeExplainer for a model, read from the disk cache when one was built for the same file"""
+        import shap
+        
+        if self.cache_dir is None:
+            return shap.TreeExplainer(model)
+        
+        digest = _file_digest(self.model_paths[name])[:16]
+        cache_file = self.cache_dir / f"{name}-{digest}-shap{shap.__version__}.joblib"
+        if cache_file.exists():
+            try:
+                return joblib.load(cache_file)
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable explainer cache {cache_file}: {e}")
+        
+        explainer = shap.TreeExplainer(model)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write then rename, so concurrent workers never read a partial file
+        partial = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+        joblib.dump(explainer, partial)
+        os.replace(partial, cache_file)
+        return explainer
+    
     def _get_feature_names(self) -> Dict[str, List[str]]:
-        """Get feature names for each pillar"""
-        return {
+        """Get feature names for each pillar; CatBoost models carry their own"""
+        names = {
             'capital': [
                 'funding_total_usd', 'funding_rounds', 'last_funding_amount_usd',
                 'burn_rate', 'runway_months', 'revenue_growth_rate',
@@ -85,214 +427,109 @@ class FLASHExplainer:
                 'diversity_score', 'has_technical_cofounder', 'founder_domain_expertise'
             ]
         }
+        for pillar in PILLARS:
+            if pillar in self.models and _is_catboost(self.models[pillar]):
+                names[pillar] = list(self.models[pillar].feature_names_)
+        return names
+    
+    def _meta_feature_names(self) -> List[str]:
+        """Meta model inputs: the pillar scores, plus interactions when it was trained with them"""
+        names = list(getattr(self.models['meta'], 'feature_names_', None) or [])
+        if names and all(name in META_DISPLAY_NAMES for name in names):
+            return names
+        return list(PILLARS)
+    
+    def meta_values(self, pillar_predictions: Dict[str, np.ndarray]) -> np.ndarray:
+        """Meta model input matrix from each pillar's predicted probabilities"""
+        columns = dict(pillar_predictions)
+        for name, (left, right) in META_INTERACTIONS.items():
+            columns[name] = columns[left] * columns[right]
+        return np.column_stack([columns[name] for name in self._meta_feature_names()])
     
     def explain_prediction(self, features: Dict[str, float], 
                          include_plots: bool = True) -> Dict:
         """Generate comprehensive explanation for a prediction"""
+        explanation = self.explain_batch([features])[0]
+        
+        # Generate plots if requested
+        if include_plots:
+            explanation['plots'] = self._generate_plots(
+                explanation['pillar_explanations'], explanation['meta_explanation']
+            )
         
-        # Prepare data for each pillar
-        pillar_explanations = {}
+        return explanation
+    
+    def explain_batch(self, features_list: List[Dict[str, float]]) -> List[Dict]:
+        """
+        Explanations and insights for many startups at once.
+        Each model predicts and computes SHAP values once for the whole batch;
+        rows come back in input order without plots.
+        """
+        n_rows = len(features_list)
+        pillar_explanations = [{} for _ in range(n_rows)]
         pillar_predictions = {}
         
         for pillar, feature_list in self.feature_names.items():
-            if pillar in self.models:
+            if pillar in self.models and n_rows:
                 # Extract relevant features
-                X = np.array([[features.get(f, 0) for f in feature_list]])
+                values = [[features.get(f, 0) for f in feature_list] for features in features_list]
+                X = _model_input(self.models[pillar], feature_list, values)
                 
-                # Get prediction
-                pred = self.models[pillar].predict_proba(X)[0, 1]
-                pillar_predictions[pillar] = pred
-                
-                # Get SHAP values
-                shap_values = self.explainers[pillar].shap_values(X)
-                if isinstance(shap_values, list):
-                    shap_values = shap_values[1]  # For binary classification
+                # Get predictions and SHAP values for every row
+                preds = self.models[pillar].predict_proba(X)[:, 1]
+                pillar_predictions[pillar] = preds
+                shap_values = _positive_class(self.explainers[pillar].shap_values(X))
+                scale = _explainer_scale(self.explainers[pillar])
                 
                 # Create explanation
-                pillar_explanations[pillar] = {
-                    'prediction': float(pred),
-                    'shap_values': shap_values[0].tolist(),
-                    'feature_names': feature_list,
-                    'feature_values': [features.get(f, 0) for f in feature_list]
-                }
+                for row in range(n_rows):
+                    pillar_explanations[row][pillar] = {
+                        'prediction': float(preds[row]),
+                        'shap_values': shap_values[row].tolist(),
+                        'output_scale': scale,
+                        'feature_names': feature_list,
+                        'feature_values': values[row]
+                    }
         
         # Get meta model explanation if we have pillar predictions
-        meta_explanation = None
+        meta_explanations = [None] * n_rows
         if 'meta' in self.models and len(pillar_predictions) == 4:
-            meta_features = np.array([[
-                pillar_predictions['capital'],
-                pillar_predictions['advantage'],
-                pillar_predictions['market'],
-                pillar_predictions['people']
-            ]])
+            meta_names = self._meta_feature_names()
+            meta_values = self.meta_values(pillar_predictions)
+            meta_features = _model_input(self.models['meta'], meta_names, meta_values)
             
-            meta_pred = self.models['meta'].predict_proba(meta_features)[0, 1]
-            meta_shap = self.explainers['meta'].shap_values(meta_features)
-            if isinstance(meta_shap, list):
-                meta_shap = meta_shap[1]
+            meta_preds = self.models['meta'].predict_proba(meta_features)[:, 1]
+            meta_shap = _positive_class(self.explainers['meta'].shap_values(meta_features))
+            meta_scale = _explainer_scale(self.explainers['meta'])
             
-            meta_explanation = {
-                'prediction': float(meta_pred),
-                'shap_values': meta_shap[0].tolist(),
-                'feature_names': ['Capital Score', 'Advantage Score', 
-                                'Market Score', 'People Score'],
-                'feature_values': list(pillar_predictions.values())
-            }
-        
-        # Generate plots if requested
-        plots = {}
-        if include_plots:
-            plots = self._generate_plots(pillar_explanations, meta_explanation)
-        
-        # Generate insights
-        insights = self._generate_insights(pillar_explanations, meta_explanation)
+            for row in range(n_rows):
+                meta_explanations[row] = {
+                    'prediction': float(meta_preds[row]),
+                    'shap_values': meta_shap[row].tolist(),
+                    'output_scale': meta_scale,
+                    'feature_names': [META_DISPLAY_NAMES[name] for name in meta_names],
+                    'feature_values': meta_values[row].tolist()
+                }
         
-        return {
-            'pillar_explanations': pillar_explanations,
-            'meta_explanation': meta_explanation,
-            'plots': plots,
-            'insights': insights
-        }
+        return [
+            {
+                'pillar_explanations': pillars,
+                'meta_explanation': meta,
+                'plots': {},
+                'insights': self._generate_insights(pillars, meta)
+            }
+            for pillars, meta in zip(pillar_explanations, meta_explanations)
+        ]
     
     def _generate_plots(self, pillar_explanations: Dict, 
                        meta_explanation: Optional[Dict]) -> Dict[str, str]:
-        """Generate visualization plots"""
-        plots = {}
-        
-        # 1. Meta model waterfall plot
-        if meta_explanation:
-            fig, ax = plt.subplots(figsize=(8, 4))
-            
-            # Create waterfall data
-            values = meta_explanation['shap_values']
-            features = meta_explanation['feature_names']
-            feature_values = meta_explanation['feature_values']
-            
-            # Sort by absolute impact
-            sorted_idx = np.argsort(np.abs(values))[::-1]
-            
-            # Create bar chart
-            y_pos = np.arange(len(values))
-            colors = ['#e74c3c' if v < 0 else '#2ecc71' for v in values]
-            
-            bars = ax.barh(y_pos, [values[i] for i in sorted_idx], 
-                          color=[colors[i] for i in sorted_idx])
-            
-            # Customize
-            ax.set_yticks(y_pos)
-            ax.set_yticklabels([f"{features[i]}\n({feature_values[i]:.2f})" 
-                              for i in sorted_idx])
-            ax.set_xlabel('Impact on Success Probability')
-            ax.set_title('CAMP Pillar Contributions')
-            ax.axvline(x=0, color='black', linestyle='-', linewidth=0.5)
-            
-            # Add value labels
-            for i, (bar, idx) in enumerate(zip(bars, sorted_idx)):
-                width = bar.get_width()
-                ax.text(width + 0.01 if width > 0 else width - 0.01, 
-                       bar.get_y() + bar.get_height()/2,
-                       f'{values[idx]:.3f}', 
-                       ha='left' if width > 0 else 'right', 
-                       va='center', fontsize=9)
-            
-            plt.tight_layout()
-            plots['meta_waterfall'] = self._fig_to_base64(fig)
-            plt.close(fig)
-        
-        # 2. Top features across all pillars
-        all_features = []
-        all_values = []
-        all_impacts = []
-        
-        for pillar, exp in pillar_explanations.items():
-            for i, (feat, val, impact) in enumerate(zip(
-                exp['feature_names'], 
-                exp['feature_values'], 
-                exp['shap_values']
-            )):
-                all_features.append(f"{feat}")
-                all_values.append(val)
-                all_impacts.append(impact)
-        
-        # Get top 15 by absolute impact
-        top_idx = np.argsort(np.abs(all_impacts))[-15:][::-1]
-        
-        fig, ax = plt.subplots(figsize=(10, 6))
-        y_pos = np.arange(len(top_idx))
-        impacts = [all_impacts[i] for i in top_idx]
-        colors = ['#e74c3c' if v < 0 else '#2ecc71' for v in impacts]
-        
-        bars = ax.barh(y_pos, impacts, color=colors)
-        ax.set_yticks(y_pos)
-        ax.set_yticklabels([f"{all_features[i]}\n(={all_values[i]:.2f})" 
-                           for i in top_idx], fontsize=9)
-        ax.set_xlabel('Impact on Success Probability')
-        ax.set_title('Top 15 Feature Contributions')
-        ax.axvline(x=0, color='black', linestyle='-', linewidth=0.5)
-        
-        # Add value labels
-        for bar, impact in zip(bars, impacts):
-            width = bar.get_width()
-            ax.text(width + 0.001 if width > 0 else width - 0.001, 
-                   bar.get_y() + bar.get_height()/2,
-                   f'{impact:.3f}', 
-                   ha='left' if width > 0 else 'right', 
-                   va='center', fontsize=8)
-        
-        plt.tight_layout()
-        plots['top_features'] = self._fig_to_base64(fig)
-        plt.close(fig)
-        
-        # 3. Pillar breakdown radar chart
-        pillar_predictions = {p: e['prediction'] for p, e in pillar_explanations.items()}
-        if len(pillar_predictions) == 4:
-            fig, ax = plt.subplots(figsize=(8, 8), subplot_kw=dict(projection='polar'))
-            
-            categories = list(pillar_predictions.keys())
-            values = list(pillar_predictions.values())
-            
-            # Number of variables
-            num_vars = len(categories)
-            
-            # Compute angle for each axis
-            angles = [n / float(num_vars) * 2 * np.pi for n in range(num_vars)]
-            values += values[:1]  # Complete the circle
-            angles += angles[:1]
-            
-            # Plot
-            ax.plot(angles, values, 'o-', linewidth=2, color='#3498db')
-            ax.fill(angles, values, alpha=0.25, color='#3498db')
-            
-            # Labels
-            ax.set_xticks(angles[:-1])
-            ax.set_xticklabels([c.upper() for c in categories])
-            ax.set_ylim(0, 1)
-            ax.set_yticks([0.2, 0.4, 0.6, 0.8])
-            ax.set_yticklabels(['0.2', '0.4', '0.6', '0.8'])
-            ax.set_title('CAMP Pillar Scores', y=1.08)
-            
-            # Add value labels
-            for angle, value, cat in zip(angles[:-1], values[:-1], categories):
-                ax.text(angle, value + 0.05, f'{value:.2f}', 
-                       ha='center', va='center', fontsize=10, 
-                       bbox=dict(boxstyle='round,pad=0.3', 
-                                facecolor='white', edgecolor='gray'))
-            
-            plt.tight_layout()
-            plots['pillar_radar'] = self._fig_to_base64(fig)
-            plt.close(fig)
-        
-        return plots
-    
-    def _fig_to_base64(self, fig) -> str:
-        """Convert matplotlib figure to base64 string"""
-        buffer = BytesIO()
-        fig.savefig(buffer, format='png', bbox_inches='tight', 
-                   facecolor='white', edgecolor='none')
-        buffer.seek(0)
-        image_base64 = base64.b64encode(buffer.getvalue()).decode()
-        buffer.close()
-        return f"data:image/png;base64,{image_base64}"
+        """Generate visualization plots as inline base64 PNGs"""
+        return {
+            name: "data:image/png;base64," + base64.b64encode(
+                render_plot(name, pillar_explanations, meta_explanation, fmt='png', dpi=150)
+            ).decode()
+            for name in available_plots(pillar_explanations, meta_explanation)
+        }
     
     def _generate_insights(self, pillar_explanations: Dict, 
                           meta_explanation: Optional[Dict]) -> Dict:
@@ -312,23 +549,26 @@ class FLASHExplainer:
             shap_values = np.array(exp['shap_values'])
             feature_names = exp['feature_names']
             feature_values = exp['feature_values']
+            scale = _output_scale(exp)
+            unit = ' log-odds' if scale == 'log_odds' else ''
+            threshold = INSIGHT_THRESHOLDS[scale]
             
             # Top positive impacts
-            pos_idx = np.where(shap_values > 0.02)[0]
+            pos_idx = np.where(shap_values > threshold)[0]
             if len(pos_idx) > 0:
                 top_pos = pos_idx[np.argsort(shap_values[pos_idx])[-1]]
                 insights['strengths'].append(
                     f"{pillar.capitalize()}: Strong {feature_names[top_pos]} "
-                    f"({feature_values[top_pos]:.2f}) contributing +{shap_values[top_pos]:.3f}"
+                    f"({_format_value(feature_values[top_pos])}) contributing +{shap_values[top_pos]:.3f}{unit}"
                 )
             
             # Top negative impacts
-            neg_idx = np.where(shap_values < -0.02)[0]
+            neg_idx = np.where(shap_values < -threshold)[0]
             if len(neg_idx) > 0:
                 top_neg = neg_idx[np.argsort(shap_values[neg_idx])[0]]
                 insights['weaknesses'].append(
                     f"{pillar.capitalize()}: Weak {feature_names[top_neg]} "
-                    f"({feature_values[top_neg]:.2f}) contributing {shap_values[top_neg]:.3f}"
+                    f"({_format_value(feature_values[top_neg])}) contributing {shap_values[top_neg]:.3f}{unit}"
                 )
         
         # Overall assessment
@@ -351,17 +591,18 @@ class FLASHExplainer:
         # Key drivers (top 3 absolute impacts across all features)
         all_impacts = []
         for pillar, exp in pillar_explanations.items():
+            scale = _output_scale(exp)
             for feat, val, impact in zip(exp['feature_names'], 
                                         exp['feature_values'], 
                                         exp['shap_values']):
-                all_impacts.append((feat, val, impact, abs(impact)))
+                all_impacts.append((feat, val, impact, abs(impact), scale))
         
         all_impacts.sort(key=lambda x: x[3], reverse=True)
         
-        for feat, val, impact, _ in all_impacts[:3]:
+        for feat, val, impact, _, scale in all_impacts[:3]:
             direction = "increasing" if impact > 0 else "decreasing"
             insights['key_drivers'].append(
-                f"{feat} (current: {val:.2f}) is {direction} success probability by {abs(impact):.3f}"
+                f"{feat} (current: {_format_value(val)}) is {direction} {SCALE_LABELS[scale]} by {abs(impact):.3f}"
             )
         
         return insights
@@ -404,6 +645,52 @@ class FLASHExplainer:
         }
 
 
+class ExplainerWarmer:
+    """
+    Builds the explainer in a background thread so no request waits on it.
+    state is 'idle', 'warming', 'ready' or 'failed'; a failed build can be restarted.
+    """
+    
+    def __init__(self, factory: Callable[[], FLASHExplainer]):
+        self.factory = factory
+        self.state = 'idle'
+        self.error = None
+        self.build_seconds = None
+        self._explainer = None
+        self._lock = threading.Lock()
+    
+    def start(self) -> None:
+        """Begin building unless a build is already running or done"""
+        with self._lock:
+            if self.state in ('warming', 'ready'):
+                return
+            self.state, self.error = 'warming', None
+        threading.Thread(target=self._build, name='explainer-warmup', daemon=True).start()
+    
+    def _build(self) -> None:
+        started = time.perf_counter()
+        try:
+            explainer = self.factory()
+        except Exception as e:
+            logger.exception("Explainer warmup failed")
+            with self._lock:
+                self.state, self.error = 'failed', str(e)
+            return
+        with self._lock:
+            self._explainer = explainer
+            self.build_seconds = time.perf_counter() - started
+            self.state = 'ready'
+        logger.info(f"Explainers ready in {self.build_seconds:.1f}s")
+    
+    @property
+    def explainer(self) -> Optional[FLASHExplainer]:
+        """The built explainer, or None while warming"""
+        return self._explainer
+    
+    def status(self) -> Dict:
+        return {'state': self.state, 'error': self.error, 'build_seconds': self.build_seconds}
+
+
 if __name__ == "__main__":
     # Test the explainer
     explainer = FLASHExplainer()
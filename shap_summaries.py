@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Precomputed Global SHAP Summaries for FLASH
+An offline job explains the whole training dataset once per model and stores
+the SHAP values as memory-mapped float32 arrays with funding stage and sector
+indexes; ShapSummaryStore answers global and segment-level importance,
+dependence and interaction questions by slicing those arrays
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from shap_explainer import PILLARS, FLASHExplainer, _file_digest, _is_catboost, _model_input, _positive_class
+from vocabulary import FUNDING_STAGE, SECTOR, UNKNOWN_CODE
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = 'manifest.json'
+
+
+def _interaction_matrices(values) -> np.ndarray:
+    """Positive-class interaction values as (rows, features, features) from any explainer output"""
+    if isinstance(values, list):
+        values = values[1]
+    values = np.asarray(values)
+    if values.ndim == 4:
+        values = values[..., 1]
+    return values
+
+
+def compute_shap_summaries(data: pd.DataFrame, models_dir: str, output_dir: str,
+                           backend: str = 'catboost', chunk_rows: int = 10_000,
+                           interaction_rows: int = 10_000, seed: int = 42) -> Dict:
+    """
+    Explain every row of `data` with each pillar and the meta model and write
+    <model>_shap.npy (SHAP values) and <model>_values.npy (feature values, with
+    categoricals as codes) as float32 .npy files, plus stage_codes.npy and
+    sector_codes.npy segment indexes and a manifest.
+
+    Everything is written to a temporary sibling of output_dir which then
+    replaces it, so a server with the previous arrays memory-mapped never sees
+    them rewritten underneath it.
+
+    SHAP interaction values cost far more than SHAP values, so they are stored
+    for a fixed random sample of interaction_rows rows (<model>_interactions.npy,
+    with the sampled row numbers in interaction_rows.npy); 0 skips them.
+    """
+    explainer = FLASHExplainer(models_dir=models_dir, backend=backend)
+    if set(explainer.models) != set(PILLARS + ['meta']):
+        raise FileNotFoundError(f"Pillar and meta models not found in {models_dir}")
+    target = Path(output_dir)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    output = Path(tempfile.mkdtemp(prefix=f".{target.name}.", suffix='.tmp', dir=target.parent))
+    try:
+        manifest = _write_summaries(explainer, data, output, backend, chunk_rows, interaction_rows, seed)
+        _replace_directory(output, target)
+    except BaseException:
+        shutil.rmtree(output, ignore_errors=True)
+        raise
+    return manifest
+
+
+def _replace_directory(staged: Path, target: Path) -> None:
+    """
+    Move a fully written directory into place. A directory cannot be renamed over
+    a non-empty one, so the old one is renamed aside first and deleted afterwards;
+    open memory maps of its files stay valid after the unlink.
+    """
+    previous = None
+    if target.exists():
+        previous = target.with_name(f".{target.name}.{os.getpid()}.old")
+        os.replace(target, previous)
+    os.replace(staged, target)
+    if previous is not None:
+        shutil.rmtree(previous, ignore_errors=True)
+
+
+def _write_summaries(explainer: FLASHExplainer, data: pd.DataFrame, output: Path, backend: str,
+                     chunk_rows: int, interaction_rows: int, seed: int) -> Dict:
+    """Write the arrays and manifest described in compute_shap_summaries into output"""
+    n_rows = len(data)
+    started = time.perf_counter()
+
+    np.save(output / 'stage_codes.npy', FUNDING_STAGE.codes(data['funding_stage']))
+    np.save(output / 'sector_codes.npy', SECTOR.codes(data['sector']))
+    sample = np.sort(np.random.default_rng(seed).choice(n_rows, min(interaction_rows, n_rows), replace=False))
+    np.save(output / 'interaction_rows.npy', sample)
+
+    feature_names = dict(explainer.feature_names, meta=explainer._meta_feature_names())
+    arrays = {
+        name: (
+            np.lib.format.open_memmap(output / f"{name}_shap.npy", mode='w+', dtype=np.float32,
+                                      shape=(n_rows, len(features))),
+            np.lib.format.open_memmap(output / f"{name}_values.npy", mode='w+', dtype=np.float32,
+                                      shape=(n_rows, len(features)))
+        )
+        for name, features in feature_names.items()
+    }
+    categories = {name: {} for name in feature_names}
+
+    def inputs(rows: pd.DataFrame) -> Dict:
+        """Every model's input frame or matrix for a block of rows"""
+        matrices = {
+            pillar: _model_input(explainer.models[pillar], feature_names[pillar],
+                                 rows.reindex(columns=feature_names[pillar], fill_value=0))
+            for pillar in PILLARS
+        }
+        predictions = {pillar: explainer.models[pillar].predict_proba(X)[:, 1] for pillar, X in matrices.items()}
+        matrices['meta'] = _model_input(explainer.models['meta'], feature_names['meta'],
+                                        explainer.meta_values(predictions))
+        return matrices
+
+    for start in range(0, n_rows, chunk_rows):
+        block = slice(start, min(start + chunk_rows, n_rows))
+        for name, X in inputs(data.iloc[block]).items():
+            shap_array, value_array = arrays[name]
+            shap_array[block] = _positive_class(explainer.explainers[name].shap_values(X))
+            values = pd.DataFrame(X, columns=feature_names[name])
+            model = explainer.models[name]
+            cat_columns = [feature_names[name][i] for i in model.get_cat_feature_indices()] if _is_catboost(model) else []
+            for column in cat_columns:
+                labels = categories[name].setdefault(column, [])
+                for label in sorted(set(values[column]) - set(labels)):
+                    labels.append(label)
+                values[column] = values[column].map({label: code for code, label in enumerate(labels)})
+            value_array[block] = values.to_numpy(dtype=np.float32)
+        logger.info(f"Explained rows {block.start}-{block.stop} of {n_rows}")
+
+    if len(sample):
+        for name, X in inputs(data.iloc[sample]).items():
+            np.save(output / f"{name}_interactions.npy",
+                    _interaction_matrices(explainer.explainers[name].shap_interaction_values(X)).astype(np.float32))
+
+    for shap_array, value_array in arrays.values():
+        shap_array.flush()
+        value_array.flush()
+    del arrays
+
+    manifest = {
+        'created': datetime.now().isoformat(),
+        'rows': n_rows,
+        'interaction_rows': int(len(sample)),
+        'backend': backend,
+        'models': {
+            name: {
+                'features': feature_names[name],
+                'categories': categories[name],
+                'model_file': str(explainer.model_paths[name]),
+                'model_digest': _file_digest(explainer.model_paths[name])
+            }
+            for name in feature_names
+        }
+    }
+    with open(output / MANIFEST, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    logger.info(f"SHAP summaries for {n_rows} rows written in {time.perf_counter() - started:.1f}s")
+    return manifest
+
+
+def _manifest_stat(stat: os.stat_result) -> tuple:
+    """Identity of a manifest file: a replaced directory brings a new inode and mtime"""
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+class ShapSummaryStore:
+    """
+    Read side of the precomputed SHAP arrays. Arrays are opened memory-mapped,
+    so only the rows a query touches are read; is_current() tells when the
+    directory has been recomputed and the store should be reopened. Segments are given as funding
+    stage and sector labels in any spelling the vocabularies accept.
+
+    Unknown models and features raise KeyError, unknown segment labels ValueError.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        with open(self.directory / MANIFEST) as f:
+            self.manifest_stat = _manifest_stat(os.fstat(f.fileno()))
+            self.manifest = json.load(f)
+        self.stage_codes = np.load(self.directory / 'stage_codes.npy', mmap_mode='r')
+        self.sector_codes = np.load(self.directory / 'sector_codes.npy', mmap_mode='r')
+        self.interaction_rows = np.load(self.directory / 'interaction_rows.npy', mmap_mode='r')
+        # Mapped up front, so a store never mixes arrays from two computations
+        kinds = ['shap', 'values'] + (['interactions'] if self.manifest['interaction_rows'] else [])
+        self._arrays: Dict[str, np.ndarray] = {
+            f"{model}_{kind}": np.load(self.directory / f"{model}_{kind}.npy", mmap_mode='r')
+            for model in self.manifest['models'] for kind in kinds
+        }
+
+    def is_current(self) -> bool:
+        """
+        False once compute_shap_summaries has replaced the directory (the manifest
+        changed). A manifest missing mid-replacement counts as current.
+        """
+        try:
+            return _manifest_stat(os.stat(self.directory / MANIFEST)) == self.manifest_stat
+        except FileNotFoundError:
+            return True
+
+    def models(self) -> List[str]:
+        return list(self.manifest['models'])
+
+    def features(self, model: str) -> List[str]:
+        if model not in self.manifest['models']:
+            raise KeyError(model)
+        return self.manifest['models'][model]['features']
+
+    def _array(self, model: str, kind: str) -> np.ndarray:
+        if model not in self.manifest['models']:
+            raise KeyError(model)
+        return self._arrays[f"{model}_{kind}"]
+
+    def segment_rows(self, stage: Optional[str] = None, sector: Optional[str] = None) -> Optional[np.ndarray]:
+        """Row numbers of a stage/sector segment, or None for the whole dataset"""
+        mask = None
+        for vocabulary, codes, label in ((FUNDING_STAGE, self.stage_codes, stage),
+                                         (SECTOR, self.sector_codes, sector)):
+            if label is None:
+                continue
+            code = vocabulary.code(label)
+            if code == UNKNOWN_CODE:
+                raise ValueError(f"Unknown {vocabulary.name} {label!r}")
+            mask = codes == code if mask is None else mask & (codes == code)
+        return None if mask is None else np.flatnonzero(mask)
+
+    def _segment(self, stage: Optional[str], sector: Optional[str], rows: int) -> Dict:
+        return {
+            'stage': FUNDING_STAGE.normalize(stage) if stage else None,
+            'sector': SECTOR.normalize(sector) if sector else None,
+            'rows': rows
+        }
+
+    def importance(self, model: str, stage: Optional[str] = None, sector: Optional[str] = None,
+                   top_n: Optional[int] = None) -> Dict:
+        """Features ranked by mean |SHAP| over a segment, with their mean signed SHAP value"""
+        shap_values = self._array(model, 'shap')
+        rows = self.segment_rows(stage, sector)
+        values = shap_values if rows is None else shap_values[rows]
+        features = []
+        if len(values):
+            mean_abs = np.abs(values).mean(axis=0, dtype=np.float64)
+            mean = values.mean(axis=0, dtype=np.float64)
+            for i in np.argsort(-mean_abs, kind='stable')[:top_n]:
+                features.append({
+                    'feature': self.features(model)[i],
+                    'mean_abs_shap': float(mean_abs[i]),
+                    'mean_shap': float(mean[i])
+                })
+        return {'model': model, 'segment': self._segment(stage, sector, len(values)), 'features': features}
+
+    def dependence(self, model: str, feature: str, stage: Optional[str] = None,
+                   sector: Optional[str] = None, bins: int = 20) -> Dict:
+        """
+        Mean SHAP value of one feature against its value: per category for
+        categorical features, per quantile bin of the feature value otherwise.
+        """
+        features = self.features(model)
+        if feature not in features:
+            raise KeyError(feature)
+        column = features.index(feature)
+        rows = self.segment_rows(stage, sector)
+        select = slice(None) if rows is None else rows
+        shap_values = np.asarray(self._array(model, 'shap')[select, column], dtype=np.float64)
+        values = np.asarray(self._array(model, 'values')[select, column], dtype=np.float64)
+        segment = self._segment(stage, sector, len(values))
+
+        labels = self.manifest['models'][model]['categories'].get(feature)
+        points = []
+        if labels is not None:
+            codes = values.astype(int)
+            counts = np.bincount(codes, minlength=len(labels))
+            sums = np.bincount(codes, weights=shap_values, minlength=len(labels))
+            for code in np.flatnonzero(counts):
+                points.append({'value': labels[code], 'mean_shap': float(sums[code] / counts[code]),
+                               'count': int(counts[code])})
+        else:
+            present = ~np.isnan(values)
+            values, shap_values = values[present], shap_values[present]
+            if len(values):
+                edges = np.unique(np.quantile(values, np.linspace(0, 1, bins + 1)))
+                index = np.clip(np.searchsorted(edges, values, side='right') - 1, 0, max(len(edges) - 2, 0))
+                counts = np.bincount(index)
+                value_sums = np.bincount(index, weights=values)
+                shap_sums = np.bincount(index, weights=shap_values)
+                for i in np.flatnonzero(counts):
+                    points.append({
+                        'value': float(value_sums[i] / counts[i]),
+                        'range': [float(edges[i]), float(edges[min(i + 1, len(edges) - 1)])],
+                        'mean_shap': float(shap_sums[i] / counts[i]),
+                        'count': int(counts[i])
+                    })
+        return {
+            'model': model,
+            'feature': feature,
+            'categorical': labels is not None,
+            'segment': segment,
+            'points': points
+        }
+
+    def interactions(self, model: str, stage: Optional[str] = None, sector: Optional[str] = None,
+                     top_n: int = 10) -> Dict:
+        """Feature pairs ranked by mean |SHAP interaction value| over the segment's sampled rows"""
+        rows = self.segment_rows(stage, sector)
+        if not self.manifest['interaction_rows']:
+            return {'model': model, 'segment': self._segment(stage, sector, 0), 'pairs': []}
+        interactions = self._array(model, 'interactions')
+        if rows is None:
+            values = interactions
+        else:
+            values = interactions[np.flatnonzero(np.isin(self.interaction_rows, rows))]
+
+        pairs = []
+        if len(values):
+            # Interaction effects are split evenly between (i, j) and (j, i)
+            strength = 2 * np.abs(values).mean(axis=0, dtype=np.float64)
+            first, second = np.triu_indices(strength.shape[0], k=1)
+            features = self.features(model)
+            for i in np.argsort(-strength[first, second], kind='stable')[:top_n]:
+                pairs.append({
+                    'features': [features[first[i]], features[second[i]]],
+                    'mean_abs_interaction': float(strength[first[i], second[i]])
+                })
+        return {'model': model, 'segment': self._segment(stage, sector, len(values)), 'pairs': pairs}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute global SHAP summaries")
+    parser.add_argument('--data', default='data/final_100k_dataset_45features.csv')
+    parser.add_argument('--models', default='models/v2')
+    parser.add_argument('--output', default='models/shap_summaries')
+    parser.add_argument('--backend', default='catboost', choices=['shap', 'catboost'])
+    parser.add_argument('--chunk-rows', type=int, default=10_000)
+    parser.add_argument('--interaction-rows', type=int, default=10_000, help="sampled rows (0 = none)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    if not Path(args.data).exists():
+        logger.warning(f"{args.data} not found, using data/final_sample_1000.csv")
+        args.data = 'data/final_sample_1000.csv'
+    compute_shap_summaries(pd.read_csv(args.data), args.models, args.output, backend=args.backend,
+                           chunk_rows=args.chunk_rows, interaction_rows=args.interaction_rows)
+
+
+if __name__ == "__main__":
+    main()
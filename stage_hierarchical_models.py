@@ -6,18 +6,79 @@ Implements stage-specific models for improved accuracy (5-10% improvement expect
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Tuple, Any, Optional
-from sklearn.base import BaseEstimator, ClassifierMixin
-from sklearn.model_selection import train_test_split
-import catboost as cb
-import xgboost as xgb
-import lightgbm as lgb
-from sklearn.linear_model import LogisticRegression
 import joblib
+import json
 import logging
 from pathlib import Path
 
+import native_model_io
+from segment_training import SegmentTrainer
+from vocabulary import FUNDING_STAGE, PRODUCT_STAGE, UNKNOWN_CODE
+
 logger = logging.getLogger(__name__)
 
+MANIFEST_VERSION = 1
+
+# Product readiness by product stage (dataset labels Concept/Beta/GA); other stages score 0.5
+PRODUCT_READINESS = PRODUCT_STAGE.table(
+    {'concept': 0.2, 'beta': 0.6, 'launch': 1.0}, default=0.5
+)
+
+# Training order of each stage ensemble; the meta-model's inputs follow it
+STAGE_ENSEMBLE_ORDER = ['catboost', 'xgboost', 'lightgbm']
+
+# Stage threshold checks: (threshold key, column, default when missing, divisor, penalty).
+# 'max_' thresholds penalize values above the limit, all others values below it.
+THRESHOLD_PENALTIES = [
+    ('min_team_size', 'team_size_full_time', 0, 1, 0.05),
+    ('min_retention_30d', 'product_retention_30d', 0, 1, 0.08),
+    ('max_burn_multiple', 'burn_multiple', 999, 1, 0.07),
+    ('min_runway_months', 'runway_months', 0, 1, 0.06),
+    ('min_revenue', 'annual_revenue_run_rate', 0, 1, 0.05),
+    ('min_growth_rate', 'revenue_growth_rate_percent', 0, 100, 0.04),
+]
+
+
+def _fit_stage_ensemble(X_stage: pd.DataFrame, y_stage: pd.Series, threads: int = -1) -> Dict[str, Any]:
+    """Fit one stage's CatBoost/XGBoost/LightGBM ensemble (a segment training job)"""
+    import catboost as cb
+    import xgboost as xgb
+    import lightgbm as lgb
+    
+    models = {
+        'catboost': cb.CatBoostClassifier(
+            iterations=500,
+            learning_rate=0.05,
+            depth=6,
+            l2_leaf_reg=3,
+            verbose=False,
+            thread_count=threads,
+            allow_writing_files=False
+        ),
+        'xgboost': xgb.XGBClassifier(
+            n_estimators=300,
+            learning_rate=0.05,
+            max_depth=5,
+            subsample=0.8,
+            colsample_bytree=0.8,
+            verbosity=0,
+            n_jobs=threads
+        ),
+        'lightgbm': lgb.LGBMClassifier(
+            n_estimators=300,
+            learning_rate=0.05,
+            max_depth=5,
+            subsample=0.8,
+            colsample_bytree=0.8,
+            verbose=-1,
+            n_jobs=threads
+        )
+    }
+    
+    for model in models.values():
+        model.fit(X_stage, y_stage)
+    return models
+
 
 class StageHierarchicalModel:
     """
@@ -153,8 +214,7 @@ class StageHierarchicalModel:
             )
             if 'product_stage' in df_copy.columns:
                 # Map product stages to readiness scores
-                stage_scores = {'Concept': 0.2, 'Beta': 0.6, 'GA': 1.0}
-                df_copy['product_stage_score'] = df_copy['product_stage'].map(stage_scores).fillna(0.5)
+                df_copy['product_stage_score'] = PRODUCT_READINESS[PRODUCT_STAGE.codes(df_copy['product_stage'])]
                 df_copy['product_readiness'] = (
                     df_copy['product_stage_score'] * 0.5 +
                     df_copy.get('scalability_score', 0) * 0.5
@@ -209,15 +269,20 @@ class StageHierarchicalModel:
             
         return df_copy
     
-    def train_stage_models(self, X_train: pd.DataFrame, y_train: pd.Series) -> None:
-        """Train individual models for each funding stage"""
+    def train_stage_models(self, X_train: pd.DataFrame, y_train: pd.Series,
+                           trainer: Optional[SegmentTrainer] = None) -> None:
+        """
+        Train individual models for each funding stage, stages in parallel.
+        Raises SegmentTrainingError after storing the successful stages if any stage failed.
+        """
         stages = ['pre_seed', 'seed', 'series_a', 'series_b', 'series_c', 'growth']
+        stage_codes = FUNDING_STAGE.codes(X_train['funding_stage'])
         
+        jobs = {}
+        stage_feature_cols = {}
         for stage in stages:
-            logger.info(f"Training model for {stage} stage...")
-            
             # Filter data for this stage
-            stage_mask = X_train['funding_stage'] == stage
+            stage_mask = stage_codes == FUNDING_STAGE.code(stage)
             if stage_mask.sum() < 50:  # Not enough data
                 logger.warning(f"Insufficient data for {stage} stage ({stage_mask.sum()} samples)")
                 continue
@@ -230,44 +295,12 @@ class StageHierarchicalModel:
             
             # Drop non-feature columns
             feature_cols = [col for col in X_stage.columns if col != 'funding_stage']
-            X_stage_features = X_stage[feature_cols]
-            
-            # Train ensemble for this stage
-            models = {
-                'catboost': cb.CatBoostClassifier(
-                    iterations=500,
-                    learning_rate=0.05,
-                    depth=6,
-                    l2_leaf_reg=3,
-                    verbose=False,
-                    thread_count=-1
-                ),
-                'xgboost': xgb.XGBClassifier(
-                    n_estimators=300,
-                    learning_rate=0.05,
-                    max_depth=5,
-                    subsample=0.8,
-                    colsample_bytree=0.8,
-                    verbosity=0,
-                    n_jobs=-1
-                ),
-                'lightgbm': lgb.LGBMClassifier(
-                    n_estimators=300,
-                    learning_rate=0.05,
-                    max_depth=5,
-                    subsample=0.8,
-                    colsample_bytree=0.8,
-                    verbose=-1,
-                    n_jobs=-1
-                )
-            }
-            
-            # Train models
-            stage_ensemble = {}
-            for name, model in models.items():
-                model.fit(X_stage_features, y_stage)
-                stage_ensemble[name] = model
-                
+            stage_feature_cols[stage] = feature_cols
+            jobs[stage] = (_fit_stage_ensemble, (X_stage[feature_cols], y_stage))
+        
+        trainer = trainer or SegmentTrainer()
+        for stage, stage_ensemble in trainer.run(jobs, label="stage").items():
+            feature_cols = stage_feature_cols[stage]
             self.stage_models[stage] = stage_ensemble
             
             # Calculate feature importance
@@ -285,41 +318,40 @@ class StageHierarchicalModel:
             
             feature_imp['importance_mean'] = feature_imp[[col for col in feature_imp.columns if 'importance_' in col]].mean(axis=1)
             self.feature_importance[stage] = feature_imp.nlargest(10, 'importance_mean')
-            
-            logger.info(f"Completed training for {stage} stage")
+        # Successful stages are kept; a failed one must not silently fall back to defaults
+        trainer.raise_failures("stage")
     
-    def train_meta_model(self, X_train: pd.DataFrame, y_train: pd.Series) -> None:
-        """Train meta-model that combines stage-specific predictions"""
+    def train_meta_model(self, X_train: pd.DataFrame, y_train: pd.Series,
+                         n_folds: int = 0, random_state: int = 42) -> None:
+        """
+        Train meta-model that combines stage-specific predictions.
+        Meta features are built per stage group in bulk from the fitted stage
+        ensembles. Out-of-fold meta features are opt-in: with n_folds >= 2 the
+        stage ensembles are refit on K-1 folds so each row is scored by models
+        that never saw it, at the cost of n_folds refits of every boosted model.
+        """
+        from sklearn.linear_model import LogisticRegression
+        
         logger.info("Training meta-model...")
         
         # Get predictions from each stage model
-        meta_features = []
+        n_models = len(next(iter(self.stage_models.values()), {})) or 3
+        # Default features if no stage model
+        meta_features = np.tile([0.5] * n_models + [0.25] * 4, (len(X_train), 1)).astype(float)
+        stage_codes = FUNDING_STAGE.codes(X_train['funding_stage'])
+        y_values = np.asarray(y_train)
         
-        for index, row in X_train.iterrows():
-            stage = row['funding_stage']
-            features = []
-            
-            if stage in self.stage_models:
-                # Get stage-specific features
-                row_df = pd.DataFrame([row])
-                row_features = self.create_stage_specific_features(row_df, stage)
-                feature_cols = [col for col in row_features.columns if col != 'funding_stage']
-                
-                # Get predictions from each model in ensemble
-                for name, model in self.stage_models[stage].items():
-                    pred_proba = model.predict_proba(row_features[feature_cols])[0, 1]
-                    features.append(pred_proba)
-                
-                # Add stage weights
-                weights = self.stage_feature_weights[stage]
-                features.extend(list(weights.values()))
-            else:
-                # Default features if no stage model
-                features = [0.5] * 3 + [0.25] * 4
+        for stage in self.stage_models:
+            code = FUNDING_STAGE.code(stage)
+            positions = np.flatnonzero(stage_codes == code) if code != UNKNOWN_CODE else []
+            if len(positions) == 0:
+                continue
             
-            meta_features.append(features)
-        
-        meta_features = np.array(meta_features)
+            # Get stage-specific features
+            stage_features = self.create_stage_specific_features(X_train.iloc[positions], stage)
+            stage_preds = self._out_of_fold_predictions(stage_features, y_values[positions], stage,
+                                                        n_folds, random_state)
+            meta_features[positions] = self._meta_features(stage_preds, stage)
         
         # Train meta-model
         self.meta_model = LogisticRegression(
@@ -331,85 +363,130 @@ class StageHierarchicalModel:
         
         logger.info("Meta-model training complete")
     
-    def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
-        """Make predictions using the hierarchical model"""
-        predictions = []
+    def _out_of_fold_predictions(self, stage_features: pd.DataFrame, y_stage: np.ndarray, stage: str,
+                                 n_folds: int, random_state: int) -> np.ndarray:
+        """Stage ensemble predictions for training rows, out-of-fold when the group allows it"""
+        from sklearn.base import clone
+        from sklearn.model_selection import StratifiedKFold
         
-        for index, row in X.iterrows():
-            stage = row['funding_stage']
-            
-            if stage in self.stage_models:
-                # Get stage-specific features
-                row_df = pd.DataFrame([row])
-                row_features = self.create_stage_specific_features(row_df, stage)
-                feature_cols = [col for col in row_features.columns if col != 'funding_stage']
-                
-                # Get predictions from ensemble
-                stage_preds = []
-                for name, model in self.stage_models[stage].items():
-                    pred_proba = model.predict_proba(row_features[feature_cols])[0, 1]
-                    stage_preds.append(pred_proba)
-                
-                # Apply stage-specific adjustments
-                base_pred = np.mean(stage_preds)
-                adjusted_pred = self.apply_stage_adjustments(base_pred, row, stage)
-                
-                # Meta-model features
-                meta_features = stage_preds + list(self.stage_feature_weights[stage].values())
-                meta_pred = self.meta_model.predict_proba(np.array(meta_features).reshape(1, -1))[0, 1]
-                
-                # Combine predictions
-                final_pred = 0.7 * adjusted_pred + 0.3 * meta_pred
-                predictions.append([1 - final_pred, final_pred])
-            else:
-                # Fallback for unknown stages
-                predictions.append([0.5, 0.5])
+        min_class_count = np.bincount(y_stage.astype(int)).min() if len(np.unique(y_stage)) > 1 else 0
+        if n_folds < 2 or min_class_count < n_folds:
+            if n_folds >= 2:
+                logger.warning(f"Too few samples per class for {n_folds}-fold meta features at {stage} stage, "
+                               f"using in-sample predictions")
+            return self._stage_model_predictions(stage_features, stage)
+        
+        feature_cols = [col for col in stage_features.columns if col != 'funding_stage']
+        X_stage = stage_features[feature_cols]
+        stage_preds = np.zeros((len(X_stage), len(self.stage_models[stage])))
+        folds = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=random_state)
+        
+        for train_idx, holdout_idx in folds.split(X_stage, y_stage):
+            for i, model in enumerate(self.stage_models[stage].values()):
+                fold_model = clone(model).fit(X_stage.iloc[train_idx], y_stage[train_idx])
+                stage_preds[holdout_idx, i] = fold_model.predict_proba(X_stage.iloc[holdout_idx])[:, 1]
         
-        return np.array(predictions)
+        return stage_preds
     
-    def apply_stage_adjustments(self, base_pred: float, row: pd.Series, stage: str) -> float:
-        """Apply stage-specific threshold adjustments"""
-        adjusted_pred = base_pred
+    def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
+        """Make predictions using the hierarchical model"""
+        # Unknown stages fall back to a neutral prediction
+        final_pred = np.full(len(X), 0.5)
+        stage_codes = FUNDING_STAGE.codes(X['funding_stage'])
+
+        for stage in self.stage_models:
+            code = FUNDING_STAGE.code(stage)
+            positions = np.flatnonzero(stage_codes == code) if code != UNKNOWN_CODE else []
+            if len(positions) == 0:
+                continue
+
+            # Build stage-specific features and score the whole group at once
+            X_stage = X.iloc[positions]
+            stage_features = self.create_stage_specific_features(X_stage, stage)
+            stage_preds = self._stage_model_predictions(stage_features, stage)
+
+            # Apply stage-specific adjustments
+            base_pred = stage_preds.mean(axis=1)
+            adjusted_pred = self.apply_stage_adjustments(base_pred, X_stage, stage)
+
+            # Meta-model features
+            meta_features = self._meta_features(stage_preds, stage)
+            meta_pred = self.meta_model.predict_proba(meta_features)[:, 1]
+
+            # Combine predictions
+            final_pred[positions] = 0.7 * adjusted_pred + 0.3 * meta_pred
+
+        return np.column_stack([1 - final_pred, final_pred])
+
+    def _stage_model_predictions(self, stage_features: pd.DataFrame, stage: str) -> np.ndarray:
+        """Positive-class probability from each model in a stage ensemble, one column per model"""
+        feature_cols = [col for col in stage_features.columns if col != 'funding_stage']
+        return np.column_stack([
+            model.predict_proba(stage_features[feature_cols])[:, 1]
+            for model in self.stage_models[stage].values()
+        ])
+
+    def _meta_features(self, stage_preds: np.ndarray, stage: str) -> np.ndarray:
+        """Stage ensemble predictions followed by the stage's pillar weights"""
+        weights = np.array(list(self.stage_feature_weights[stage].values()), dtype=float)
+        return np.hstack([stage_preds, np.tile(weights, (len(stage_preds), 1))])
+
+    def apply_stage_adjustments(self, base_pred, rows, stage: str):
+        """
+        Apply stage-specific threshold adjustments.
+        Accepts a single row (Series) with a scalar prediction, or a batch
+        (DataFrame) with an array of predictions.
+        """
+        single_row = isinstance(rows, pd.Series)
+        frame = rows.to_frame().T if single_row else rows
         thresholds = self.stage_thresholds.get(stage, {})
-        
+
         # Check each threshold
-        penalties = []
-        
-        if 'min_team_size' in thresholds and row.get('team_size_full_time', 0) < thresholds['min_team_size']:
-            penalties.append(0.05)
-            
-        if 'min_retention_30d' in thresholds and row.get('product_retention_30d', 0) < thresholds['min_retention_30d']:
-            penalties.append(0.08)
-            
-        if 'max_burn_multiple' in thresholds and row.get('burn_multiple', 999) > thresholds['max_burn_multiple']:
-            penalties.append(0.07)
-            
-        if 'min_runway_months' in thresholds and row.get('runway_months', 0) < thresholds['min_runway_months']:
-            penalties.append(0.06)
-            
-        if 'min_revenue' in thresholds and row.get('annual_revenue_run_rate', 0) < thresholds['min_revenue']:
-            penalties.append(0.05)
-            
-        if 'min_growth_rate' in thresholds and row.get('revenue_growth_rate_percent', 0) / 100 < thresholds['min_growth_rate']:
-            penalties.append(0.04)
-            
+        total_penalty = np.zeros(len(frame))
+        for key, column, default, divisor, penalty in THRESHOLD_PENALTIES:
+            if key not in thresholds:
+                continue
+            if column in frame.columns:
+                values = pd.to_numeric(frame[column], errors='coerce').to_numpy(dtype=float) / divisor
+            else:
+                values = np.full(len(frame), default / divisor, dtype=float)
+            if key.startswith('max_'):
+                violated = values > thresholds[key]
+            else:
+                violated = values < thresholds[key]
+            total_penalty += np.where(violated, penalty, 0.0)
+
         # Apply penalties
-        total_penalty = min(sum(penalties), 0.3)  # Cap at 30% penalty
-        adjusted_pred = adjusted_pred * (1 - total_penalty)
-        
-        return adjusted_pred
+        total_penalty = np.minimum(total_penalty, 0.3)  # Cap at 30% penalty
+        adjusted_pred = np.asarray(base_pred, dtype=float) * (1 - total_penalty)
+
+        return float(adjusted_pred[0]) if single_row else adjusted_pred
     
-    def save_models(self, path: Path) -> None:
-        """Save all stage models and meta model"""
+    def save_models(self, path: Path, native: bool = True) -> None:
+        """
+        Save all stage models and meta model.
+        With native=True stage models are written in their library's own format
+        (CatBoost .cbm, XGBoost UBJSON, LightGBM text) and described by manifest.json;
+        otherwise every stage model is joblib-pickled as before.
+        """
         path = Path(path)
         path.mkdir(parents=True, exist_ok=True)
         
         # Save stage models
+        manifest = {'format_version': MANIFEST_VERSION, 'stages': {}}
         for stage, models in self.stage_models.items():
             stage_path = path / f"stage_{stage}"
             stage_path.mkdir(exist_ok=True)
+            stage_entry = {'models': {}}
             for name, model in models.items():
-                joblib.dump(model, stage_path / f"{name}.pkl")
+                if native:
+                    stage_entry['models'][name] = native_model_io.save_model(model, stage_path, name)
+                else:
+                    joblib.dump(model, stage_path / f"{name}.pkl")
+            feature_names = [entry['feature_names'] for entry in stage_entry['models'].values()
+                             if entry['feature_names']]
+            stage_entry['feature_names'] = feature_names[0] if feature_names else None
+            manifest['stages'][stage] = stage_entry
         
         # Save meta model
         joblib.dump(self.meta_model, path / "meta_model.pkl")
@@ -422,20 +499,48 @@ class StageHierarchicalModel:
         }
         joblib.dump(config, path / "config.pkl")
         
+        manifest_path = path / "manifest.json"
+        if native:
+            manifest.update({
+                'meta_model': 'meta_model.pkl',
+                'stage_feature_weights': self.stage_feature_weights,
+                'stage_thresholds': self.stage_thresholds
+            })
+            with open(manifest_path, 'w') as f:
+                json.dump(manifest, f, indent=2)
+        elif manifest_path.exists():
+            # A stale manifest would shadow the pickles just written
+            manifest_path.unlink()
+        
         logger.info(f"Models saved to {path}")
     
     def load_models(self, path: Path) -> None:
-        """Load all stage models and meta model"""
+        """Load all stage models and meta model (native manifest if present, else pickles)"""
         path = Path(path)
+        manifest_path = path / "manifest.json"
         
         # Load stage models
         self.stage_models = {}
-        for stage_dir in path.glob("stage_*"):
-            stage = stage_dir.name.replace("stage_", "")
-            self.stage_models[stage] = {}
-            for model_file in stage_dir.glob("*.pkl"):
-                name = model_file.stem
-                self.stage_models[stage][name] = joblib.load(model_file)
+        if manifest_path.exists():
+            with open(manifest_path, 'r') as f:
+                manifest = json.load(f)
+            for stage, stage_entry in manifest['stages'].items():
+                stage_path = path / f"stage_{stage}"
+                self.stage_models[stage] = {
+                    name: native_model_io.load_model(stage_path, entry)
+                    for name, entry in stage_entry['models'].items()
+                }
+        else:
+            for stage_dir in path.glob("stage_*"):
+                stage = stage_dir.name.replace("stage_", "")
+                self.stage_models[stage] = {}
+                # glob order is arbitrary, so restore the training order the meta-model expects
+                model_files = sorted(stage_dir.glob("*.pkl"), key=lambda f: (
+                    STAGE_ENSEMBLE_ORDER.index(f.stem) if f.stem in STAGE_ENSEMBLE_ORDER else len(STAGE_ENSEMBLE_ORDER),
+                    f.stem))
+                for model_file in model_files:
+                    name = model_file.stem
+                    self.stage_models[stage][name] = joblib.load(model_file)
         
         # Load meta model
         self.meta_model = joblib.load(path / "meta_model.pkl")
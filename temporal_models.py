@@ -7,17 +7,132 @@ Short-term (0-6 months), Medium-term (6-18 months), Long-term (18+ months)
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Tuple, Optional
-from sklearn.ensemble import GradientBoostingClassifier
-from sklearn.linear_model import LogisticRegression
-import catboost as cb
 import joblib
 import logging
 from pathlib import Path
 from datetime import datetime
 import json
 
+from segment_training import SegmentTrainer
+from vocabulary import PRODUCT_STAGE
+
 logger = logging.getLogger(__name__)
 
+# Product maturity by product stage (dataset labels Concept/Beta/GA); other stages score 0.5
+PRODUCT_MATURITY = PRODUCT_STAGE.table(
+    {'concept': 0.2, 'beta': 0.6, 'launch': 1.0}, default=0.5
+)
+
+HORIZONS = ('short_term', 'medium_term', 'long_term')
+
+# Raw input columns each horizon model reads alongside its temporal features
+HORIZON_RAW_FEATURES = {
+    # Focus on financial health and immediate metrics
+    'short_term': [
+        'cash_on_hand_usd', 'monthly_burn_usd', 'runway_months',
+        'annual_revenue_run_rate', 'customer_count', 'team_size_full_time',
+        'product_retention_30d', 'burn_multiple'
+    ],
+    # Focus on growth and efficiency
+    'medium_term': [
+        'revenue_growth_rate_percent', 'user_growth_rate_percent',
+        'ltv_cac_ratio', 'gross_margin_percent', 'net_dollar_retention_percent',
+        'market_growth_rate_percent', 'tech_differentiation_score',
+        'product_retention_90d', 'dau_mau_ratio'
+    ],
+    # Focus on strategic position and moats
+    'long_term': [
+        'tam_size_usd', 'sam_size_usd', 'patent_count',
+        'network_effects_present', 'has_data_moat', 'switching_cost_score',
+        'prior_successful_exits_count', 'domain_expertise_years_avg',
+        'brand_strength_score', 'scalability_score'
+    ]
+}
+
+
+# Estimator factories per backend name; thread_count=None keeps the library default
+def _gradient_boosting(thread_count: Optional[int]):
+    # Exact single-threaded sklearn boosting (captures non-linearities, slow on large data)
+    from sklearn.ensemble import GradientBoostingClassifier
+    return GradientBoostingClassifier(n_estimators=100, learning_rate=0.1, max_depth=4, random_state=42)
+
+
+def _hist_gradient_boosting(thread_count: Optional[int]):
+    # Histogram-based boosting; OpenMP threads are capped around fit via threadpoolctl
+    from sklearn.ensemble import HistGradientBoostingClassifier
+    return HistGradientBoostingClassifier(max_iter=100, learning_rate=0.1, max_leaf_nodes=8,
+                                          early_stopping=False, random_state=42)
+
+
+def _catboost(thread_count: Optional[int]):
+    import catboost as cb
+    return cb.CatBoostClassifier(iterations=200, learning_rate=0.05, depth=5, verbose=False,
+                                 thread_count=thread_count or -1, allow_writing_files=False)
+
+
+def _logistic_regression(thread_count: Optional[int]):
+    from sklearn.linear_model import LogisticRegression
+    return LogisticRegression(C=1.0, max_iter=1000, random_state=42)
+
+
+TEMPORAL_BACKENDS = {
+    'gradient_boosting': _gradient_boosting,
+    'hist_gradient_boosting': _hist_gradient_boosting,
+    'catboost': _catboost,
+    'logistic_regression': _logistic_regression
+}
+
+DEFAULT_BACKENDS = {
+    'short_term': 'gradient_boosting',
+    'medium_term': 'catboost',
+    'long_term': 'logistic_regression'  # more stable for the long horizon
+}
+
+
+def parse_backends(spec: str) -> Dict[str, str]:
+    """'short_term=hist_gradient_boosting,medium_term=catboost' -> {horizon: backend}"""
+    backends = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        horizon, _, backend = item.partition('=')
+        horizon, backend = horizon.strip(), backend.strip()
+        if horizon not in HORIZONS or backend not in TEMPORAL_BACKENDS:
+            raise ValueError(f"Invalid temporal backend setting: {item!r}")
+        backends[horizon] = backend
+    return backends
+
+
+def _column(df: pd.DataFrame, name: str, default: float = 0) -> np.ndarray:
+    """Column as floats, or the default broadcast to every row when the column is absent"""
+    if name in df.columns:
+        return df[name].to_numpy(dtype=float)
+    return np.full(len(df), float(default))
+
+
+class TemporalFeatures:
+    """
+    Every temporal feature for all horizons, computed once into one float matrix
+    (NaN already replaced by 0). Each horizon model reads its columns, in training
+    order, through a precomputed column index.
+    """
+    
+    def __init__(self, values: np.ndarray, index: pd.Index, horizon_columns: Dict[str, np.ndarray],
+                 horizon_names: Dict[str, List[str]]):
+        self.values = values
+        self.index = index
+        self.horizon_columns = horizon_columns
+        self.horizon_names = horizon_names
+    
+    def matrix(self, horizon: str) -> np.ndarray:
+        return self.values[:, self.horizon_columns[horizon]]
+    
+    def frame(self, horizon: str) -> pd.DataFrame:
+        return pd.DataFrame(self.matrix(horizon), index=self.index, columns=self.horizon_names[horizon])
+
+
+def _fit_temporal_model(backend: str, X: pd.DataFrame, y: pd.Series, threads: Optional[int] = None):
+    """Fit one horizon's model (a segment training job)"""
+    return TEMPORAL_BACKENDS[backend](threads).fit(X, y)
+
 
 class TemporalPredictionModel:
     """
@@ -25,7 +140,11 @@ class TemporalPredictionModel:
     Different factors matter for short vs long term success
     """
     
-    def __init__(self):
+    def __init__(self, backends: Optional[Dict[str, str]] = None, thread_count: Optional[int] = None):
+        # Model backend per horizon (see TEMPORAL_BACKENDS) and the training CPU budget
+        # shared by all horizons (None = TRAINING_CPU_BUDGET from the settings)
+        self.backends = {**DEFAULT_BACKENDS, **(backends or {})}
+        self.thread_count = thread_count
         self.models = {
             'short_term': None,  # 0-6 months
             'medium_term': None,  # 6-18 months
@@ -66,199 +185,185 @@ class TemporalPredictionModel:
         
     def create_temporal_features(self, df: pd.DataFrame, horizon: str) -> pd.DataFrame:
         """Create features relevant for specific time horizons"""
-        features = pd.DataFrame(index=df.index)
+        features = pd.DataFrame(self._horizon_features(df, horizon), index=df.index)
         
-        if horizon == 'short_term':
-            # Short-term survival features
-            features['runway_risk'] = (df.get('runway_months', 12) < 6).astype(float)
-            features['burn_severity'] = np.minimum(df.get('monthly_burn_usd', 0) / 100000, 1)
-            features['cash_position'] = np.log1p(df.get('cash_on_hand_usd', 0)) / 20
-            features['immediate_revenue'] = (df.get('annual_revenue_run_rate', 0) > 0).astype(float)
-            features['team_stability_score'] = 1 - (df.get('key_person_dependency', 0) / 5)
-            
-            # Quick wins potential
-            features['quick_growth'] = df.get('user_growth_rate_percent', 0) / 100
-            features['immediate_traction'] = df.get('customer_count', 0) / 100
-            
-        elif horizon == 'medium_term':
-            # Medium-term growth features
-            features['pmf_score'] = (
-                df.get('product_retention_30d', 0.5) * 0.4 +
-                (df.get('net_dollar_retention_percent', 100) / 150) * 0.3 +
-                (df.get('dau_mau_ratio', 0.2) > 0.3).astype(float) * 0.3
-            )
-            features['unit_economics'] = np.minimum(df.get('ltv_cac_ratio', 0) / 3, 1)
-            features['growth_efficiency'] = 1 / (df.get('burn_multiple', 5) + 1)
-            features['market_momentum'] = df.get('market_growth_rate_percent', 0) / 100
-            features['competitive_advantage'] = df.get('tech_differentiation_score', 0) / 5
-            
-            # Team scaling ability
-            features['team_growth_capability'] = (
-                np.minimum(df.get('team_size_full_time', 0) / 50, 1) * 0.5 +
-                (df.get('advisors_count', 0) > 3).astype(float) * 0.5
-            )
-            
-        elif horizon == 'long_term':
-            # Long-term dominance features
-            features['market_opportunity'] = np.log1p(df.get('tam_size_usd', 0)) / 25
-            features['moat_strength'] = (
-                df.get('patent_count', 0) / 10 * 0.2 +
-                df.get('network_effects_present', 0) * 0.3 +
-                df.get('has_data_moat', 0) * 0.2 +
-                df.get('switching_cost_score', 0) / 5 * 0.3
-            )
-            features['scalability_potential'] = df.get('scalability_score', 0) / 5
-            features['founder_long_term'] = (
-                df.get('prior_successful_exits_count', 0) / 2 * 0.4 +
-                np.minimum(df.get('domain_expertise_years_avg', 0) / 15, 1) * 0.6
-            )
-            features['brand_power'] = df.get('brand_strength_score', 0) / 5
-            features['regulatory_moat'] = df.get('regulatory_advantage_present', 0)
-            
         # Add common temporal indicators
         features['stage_maturity'] = self._calculate_stage_maturity(df)
         features['momentum_score'] = self._calculate_momentum(df, horizon)
         
         return features
     
+    def build_temporal_features(self, df: pd.DataFrame) -> TemporalFeatures:
+        """
+        Single feature pass for all horizons: shared indicators (stage maturity,
+        the growth signal behind momentum) are computed once, then every raw and
+        horizon-specific column is stacked into one matrix.
+        """
+        positions: Dict[str, int] = {}
+        columns: List[np.ndarray] = []
+        
+        def add(name: str, values: np.ndarray) -> int:
+            if name not in positions:
+                positions[name] = len(columns)
+                columns.append(values)
+            return positions[name]
+        
+        maturity = self._stage_maturity_values(df)
+        growth_signal = self._growth_signal(df)
+        
+        horizon_columns, horizon_names = {}, {}
+        for horizon in HORIZONS:
+            raw = [col for col in HORIZON_RAW_FEATURES[horizon] if col in df.columns]
+            temporal = self._horizon_features(df, horizon)
+            momentum = np.minimum(0.5 + self.decay_factors[horizon] * growth_signal, 1.0)
+            
+            index = [add(col, _column(df, col)) for col in raw]
+            index += [add(name, values) for name, values in temporal.items()]
+            index.append(add('stage_maturity', maturity))
+            index.append(add(f'momentum_score:{horizon}', momentum))
+            horizon_columns[horizon] = np.array(index)
+            horizon_names[horizon] = raw + list(temporal) + ['stage_maturity', 'momentum_score']
+        
+        values = np.column_stack(columns)
+        values[np.isnan(values)] = 0
+        return TemporalFeatures(values, df.index, horizon_columns, horizon_names)
+    
+    def _horizon_features(self, df: pd.DataFrame, horizon: str) -> Dict[str, np.ndarray]:
+        """Horizon-specific temporal features as arrays, in model column order"""
+        def col(name, default=0):
+            return _column(df, name, default)
+        
+        if horizon == 'short_term':
+            return {
+                # Short-term survival features
+                'runway_risk': (col('runway_months', 12) < 6).astype(float),
+                'burn_severity': np.minimum(col('monthly_burn_usd') / 100000, 1),
+                'cash_position': np.log1p(col('cash_on_hand_usd')) / 20,
+                'immediate_revenue': (col('annual_revenue_run_rate') > 0).astype(float),
+                'team_stability_score': 1 - (col('key_person_dependency') / 5),
+                # Quick wins potential
+                'quick_growth': col('user_growth_rate_percent') / 100,
+                'immediate_traction': col('customer_count') / 100
+            }
+        if horizon == 'medium_term':
+            return {
+                # Medium-term growth features
+                'pmf_score': (
+                    col('product_retention_30d', 0.5) * 0.4 +
+                    (col('net_dollar_retention_percent', 100) / 150) * 0.3 +
+                    (col('dau_mau_ratio', 0.2) > 0.3).astype(float) * 0.3
+                ),
+                'unit_economics': np.minimum(col('ltv_cac_ratio') / 3, 1),
+                'growth_efficiency': 1 / (col('burn_multiple', 5) + 1),
+                'market_momentum': col('market_growth_rate_percent') / 100,
+                'competitive_advantage': col('tech_differentiation_score') / 5,
+                # Team scaling ability
+                'team_growth_capability': (
+                    np.minimum(col('team_size_full_time') / 50, 1) * 0.5 +
+                    (col('advisors_count') > 3).astype(float) * 0.5
+                )
+            }
+        if horizon == 'long_term':
+            return {
+                # Long-term dominance features
+                'market_opportunity': np.log1p(col('tam_size_usd')) / 25,
+                'moat_strength': (
+                    col('patent_count') / 10 * 0.2 +
+                    col('network_effects_present') * 0.3 +
+                    col('has_data_moat') * 0.2 +
+                    col('switching_cost_score') / 5 * 0.3
+                ),
+                'scalability_potential': col('scalability_score') / 5,
+                'founder_long_term': (
+                    col('prior_successful_exits_count') / 2 * 0.4 +
+                    np.minimum(col('domain_expertise_years_avg') / 15, 1) * 0.6
+                ),
+                'brand_power': col('brand_strength_score') / 5,
+                'regulatory_moat': col('regulatory_advantage_present')
+            }
+        return {}
+    
     def _calculate_stage_maturity(self, df: pd.DataFrame) -> pd.Series:
         """Calculate company maturity based on various factors"""
-        maturity_score = pd.Series(0.5, index=df.index)
+        return pd.Series(self._stage_maturity_values(df), index=df.index)
+    
+    def _stage_maturity_values(self, df: pd.DataFrame) -> np.ndarray:
+        maturity_score = np.full(len(df), 0.5)
         
         # Revenue maturity
         if 'annual_revenue_run_rate' in df.columns:
-            revenue_maturity = np.minimum(df['annual_revenue_run_rate'] / 10000000, 1)
-            maturity_score += revenue_maturity * 0.3
+            maturity_score += np.minimum(_column(df, 'annual_revenue_run_rate') / 10000000, 1) * 0.3
         
         # Team maturity
         if 'team_size_full_time' in df.columns:
-            team_maturity = np.minimum(df['team_size_full_time'] / 100, 1)
-            maturity_score += team_maturity * 0.2
+            maturity_score += np.minimum(_column(df, 'team_size_full_time') / 100, 1) * 0.2
         
         # Funding maturity
         if 'funding_rounds_count' in df.columns:
-            funding_maturity = np.minimum(df['funding_rounds_count'] / 5, 1)
-            maturity_score += funding_maturity * 0.2
+            maturity_score += np.minimum(_column(df, 'funding_rounds_count') / 5, 1) * 0.2
         
         # Product maturity
         if 'product_stage' in df.columns:
-            product_map = {'Concept': 0.2, 'Beta': 0.6, 'GA': 1.0}
-            product_maturity = df['product_stage'].map(product_map).fillna(0.5)
-            maturity_score += product_maturity * 0.3
+            maturity_score += PRODUCT_MATURITY[PRODUCT_STAGE.codes(df['product_stage'])] * 0.3
         
         return np.minimum(maturity_score, 1.0)
     
     def _calculate_momentum(self, df: pd.DataFrame, horizon: str) -> pd.Series:
         """Calculate momentum score based on growth indicators"""
-        momentum = pd.Series(0.5, index=df.index)
-        
         # Weight recent metrics more for short-term
         decay = self.decay_factors[horizon]
+        return pd.Series(np.minimum(0.5 + decay * self._growth_signal(df), 1.0), index=df.index)
+    
+    def _growth_signal(self, df: pd.DataFrame) -> np.ndarray:
+        """Horizon-independent part of momentum; each horizon scales it by its decay factor"""
+        signal = np.zeros(len(df))
         
         if 'revenue_growth_rate_percent' in df.columns:
-            momentum += (df['revenue_growth_rate_percent'] / 200) * decay
+            signal += _column(df, 'revenue_growth_rate_percent') / 200
         
         if 'user_growth_rate_percent' in df.columns:
-            momentum += (df['user_growth_rate_percent'] / 200) * (decay * 0.8)
+            signal += _column(df, 'user_growth_rate_percent') / 200 * 0.8
         
         if 'customer_count' in df.columns and 'founding_year' in df.columns:
-            age = datetime.now().year - df['founding_year']
-            customer_velocity = df['customer_count'] / (age + 1)
-            momentum += np.minimum(customer_velocity / 1000, 1) * (decay * 0.6)
+            age = datetime.now().year - _column(df, 'founding_year')
+            customer_velocity = _column(df, 'customer_count') / (age + 1)
+            signal += np.minimum(customer_velocity / 1000, 1) * 0.6
         
-        return np.minimum(momentum, 1.0)
+        return signal
     
-    def train_temporal_models(self, X: pd.DataFrame, y: pd.Series) -> None:
-        """Train models for different time horizons"""
+    def train_temporal_models(self, X: pd.DataFrame, y: pd.Series,
+                              trainer: Optional[SegmentTrainer] = None) -> None:
+        """Train models for different time horizons, horizons in parallel (SegmentTrainingError if any fails)"""
         logger.info("Training temporal prediction models...")
         
-        for horizon in ['short_term', 'medium_term', 'long_term']:
-            logger.info(f"Training {horizon} model...")
-            
-            # Create temporal features
-            temporal_features = self.create_temporal_features(X, horizon)
-            
-            # Combine with original features
-            feature_subset = self._select_features_for_horizon(X, horizon)
-            combined_features = pd.concat([feature_subset, temporal_features], axis=1)
-            
-            # Remove any NaN values
-            combined_features = combined_features.fillna(0)
-            
-            # Train model
-            if horizon == 'short_term':
-                # Use gradient boosting for short-term (captures non-linearities)
-                model = GradientBoostingClassifier(
-                    n_estimators=100,
-                    learning_rate=0.1,
-                    max_depth=4,
-                    random_state=42
-                )
-            elif horizon == 'medium_term':
-                # Use CatBoost for medium-term
-                model = cb.CatBoostClassifier(
-                    iterations=200,
-                    learning_rate=0.05,
-                    depth=5,
-                    verbose=False,
-                    thread_count=-1
-                )
-            else:
-                # Use logistic regression for long-term (more stable)
-                model = LogisticRegression(
-                    C=1.0,
-                    max_iter=1000,
-                    random_state=42
-                )
-            
-            model.fit(combined_features, y)
-            self.models[horizon] = model
-            
-            logger.info(f"Completed training {horizon} model")
+        # One feature pass shared by every horizon (NaN already filled with 0)
+        features = self.build_temporal_features(X)
+        jobs = {
+            horizon: (_fit_temporal_model, (self.backends[horizon], features.frame(horizon), y))
+            for horizon in HORIZONS
+        }
+        
+        trainer = trainer or SegmentTrainer(cpu_budget=self.thread_count)
+        self.models.update(trainer.run(jobs, label="temporal"))
+        trainer.raise_failures("temporal")
     
     def _select_features_for_horizon(self, df: pd.DataFrame, horizon: str) -> pd.DataFrame:
         """Select relevant features based on time horizon"""
-        if horizon == 'short_term':
-            # Focus on financial health and immediate metrics
-            relevant_cols = [
-                'cash_on_hand_usd', 'monthly_burn_usd', 'runway_months',
-                'annual_revenue_run_rate', 'customer_count', 'team_size_full_time',
-                'product_retention_30d', 'burn_multiple'
-            ]
-        elif horizon == 'medium_term':
-            # Focus on growth and efficiency
-            relevant_cols = [
-                'revenue_growth_rate_percent', 'user_growth_rate_percent',
-                'ltv_cac_ratio', 'gross_margin_percent', 'net_dollar_retention_percent',
-                'market_growth_rate_percent', 'tech_differentiation_score',
-                'product_retention_90d', 'dau_mau_ratio'
-            ]
-        else:
-            # Focus on strategic position and moats
-            relevant_cols = [
-                'tam_size_usd', 'sam_size_usd', 'patent_count',
-                'network_effects_present', 'has_data_moat', 'switching_cost_score',
-                'prior_successful_exits_count', 'domain_expertise_years_avg',
-                'brand_strength_score', 'scalability_score'
-            ]
-        
         # Only include columns that exist
-        available_cols = [col for col in relevant_cols if col in df.columns]
+        available_cols = [col for col in HORIZON_RAW_FEATURES[horizon] if col in df.columns]
         return df[available_cols]
     
     def predict_temporal(self, X: pd.DataFrame) -> Dict[str, np.ndarray]:
         """Make predictions for all time horizons"""
         predictions = {}
+        features = self.build_temporal_features(X)
         
         for horizon, model in self.models.items():
             if model is not None:
-                # Create temporal features
-                temporal_features = self.create_temporal_features(X, horizon)
-                
-                # Combine with original features
-                feature_subset = self._select_features_for_horizon(X, horizon)
-                combined_features = pd.concat([feature_subset, temporal_features], axis=1)
-                combined_features = combined_features.fillna(0)
+                combined_features = features.matrix(horizon)
+                # sklearn estimators fitted on frames check column names
+                if hasattr(model, 'feature_names_in_'):
+                    combined_features = pd.DataFrame(combined_features, columns=features.horizon_names[horizon])
                 
                 # Predict
                 if hasattr(model, 'predict_proba'):
@@ -272,60 +377,63 @@ class TemporalPredictionModel:
     
     def get_temporal_insights(self, predictions: Dict[str, float]) -> Dict:
         """Generate insights from temporal predictions"""
-        insights = {
-            'trajectory': self._determine_trajectory(predictions),
-            'critical_period': self._identify_critical_period(predictions),
-            'recommendations': self._generate_recommendations(predictions)
-        }
-        return insights
+        return self.get_temporal_insights_batch(
+            {horizon: np.ravel(value)[:1] for horizon, value in predictions.items()}
+        )[0]
     
-    def _determine_trajectory(self, predictions: Dict[str, float]) -> str:
-        """Determine overall trajectory based on temporal predictions"""
-        short = predictions.get('short_term', 0.5)
-        medium = predictions.get('medium_term', 0.5)
-        long = predictions.get('long_term', 0.5)
-        
-        if short > 0.7 and medium > 0.7 and long > 0.7:
-            return 'strong_growth'
-        elif short > 0.7 and medium > 0.5 and long < 0.5:
-            return 'early_peak'
-        elif short < 0.5 and medium > 0.6 and long > 0.7:
-            return 'late_bloomer'
-        elif short < 0.3:
-            return 'immediate_risk'
-        else:
-            return 'steady_progress'
+    def get_temporal_insights_batch(self, predictions: Dict[str, np.ndarray]) -> List[Dict]:
+        """Trajectory, critical period and recommendations for every startup in a batch"""
+        n = max((np.size(value) for value in predictions.values()), default=1)
+        scores = np.empty((n, len(HORIZONS)))
+        for position, horizon in enumerate(HORIZONS):
+            # Horizons without a prediction count as 0.5; scalars broadcast to the batch
+            scores[:, position] = np.ravel(predictions.get(horizon, 0.5))
+        
+        trajectories = self._determine_trajectory(scores)
+        critical_periods = self._identify_critical_period(scores)
+        recommendations = self._generate_recommendations(scores)
+        return [
+            {'trajectory': trajectory, 'critical_period': period, 'recommendations': recs}
+            for trajectory, period, recs in zip(trajectories, critical_periods, recommendations)
+        ]
     
-    def _identify_critical_period(self, predictions: Dict[str, float]) -> str:
-        """Identify the most critical time period for the startup"""
-        periods = ['short_term', 'medium_term', 'long_term']
-        min_period = min(periods, key=lambda p: predictions.get(p, 0.5))
-        
-        if predictions.get(min_period, 0.5) < 0.3:
-            return min_period
-        return 'none'
+    def _determine_trajectory(self, scores: np.ndarray) -> List[str]:
+        """Determine overall trajectory per row of (short, medium, long) predictions"""
+        short, medium, long = scores.T
+        trajectory = np.select(
+            [
+                (short > 0.7) & (medium > 0.7) & (long > 0.7),
+                (short > 0.7) & (medium > 0.5) & (long < 0.5),
+                (short < 0.5) & (medium > 0.6) & (long > 0.7),
+                short < 0.3
+            ],
+            ['strong_growth', 'early_peak', 'late_bloomer', 'immediate_risk'],
+            default='steady_progress'
+        )
+        return trajectory.tolist()
     
-    def _generate_recommendations(self, predictions: Dict[str, float]) -> List[str]:
-        """Generate actionable recommendations based on temporal analysis"""
-        recommendations = []
-        
-        short = predictions.get('short_term', 0.5)
-        medium = predictions.get('medium_term', 0.5)
-        long = predictions.get('long_term', 0.5)
-        
-        if short < 0.4:
-            recommendations.append("Immediate action needed: Focus on runway extension and revenue generation")
-        
-        if medium < 0.5 and short > 0.6:
-            recommendations.append("Prepare for scaling challenges: Strengthen unit economics and team")
-        
-        if long < 0.5:
-            recommendations.append("Build stronger moats: Invest in IP, network effects, or switching costs")
-        
-        if short > 0.7 and long > 0.7:
-            recommendations.append("Maintain momentum: Continue current strategy while preparing for scale")
-        
-        return recommendations
+    def _identify_critical_period(self, scores: np.ndarray) -> List[str]:
+        """Identify the most critical time period per startup"""
+        lowest = scores.argmin(axis=1)
+        critical = scores[np.arange(len(scores)), lowest] < 0.3
+        return np.where(critical, np.array(HORIZONS)[lowest], 'none').tolist()
+    
+    def _generate_recommendations(self, scores: np.ndarray) -> List[List[str]]:
+        """Generate actionable recommendations per startup based on temporal analysis"""
+        short, medium, long = scores.T
+        rules = np.column_stack([
+            short < 0.4,
+            (medium < 0.5) & (short > 0.6),
+            long < 0.5,
+            (short > 0.7) & (long > 0.7)
+        ])
+        messages = np.array([
+            "Immediate action needed: Focus on runway extension and revenue generation",
+            "Prepare for scaling challenges: Strengthen unit economics and team",
+            "Build stronger moats: Invest in IP, network effects, or switching costs",
+            "Maintain momentum: Continue current strategy while preparing for scale"
+        ], dtype=object)
+        return [messages[row].tolist() for row in rules]
     
     def save(self, path: Path) -> None:
         """Save temporal models"""
@@ -339,7 +447,8 @@ class TemporalPredictionModel:
         # Save configuration
         config = {
             'temporal_weights': self.temporal_weights,
-            'decay_factors': self.decay_factors
+            'decay_factors': self.decay_factors,
+            'backends': self.backends
         }
         with open(path / 'temporal_config.json', 'w') as f:
             json.dump(config, f, indent=2)
@@ -350,7 +459,7 @@ class TemporalPredictionModel:
         """Load temporal models"""
         path = Path(path)
         
-        for horizon in ['short_term', 'medium_term', 'long_term']:
+        for horizon in HORIZONS:
             model_path = path / f'temporal_{horizon}.pkl'
             if model_path.exists():
                 self.models[horizon] = joblib.load(model_path)
@@ -360,12 +469,16 @@ class TemporalPredictionModel:
             config = json.load(f)
             self.temporal_weights = config['temporal_weights']
             self.decay_factors = config['decay_factors']
+            # Models saved before backends were configurable used the defaults
+            self.backends = {**DEFAULT_BACKENDS, **config.get('backends', {})}
         
         logger.info(f"Temporal models loaded from {path}")
 
 
-def train_temporal_models():
-    """Train temporal prediction models"""
+def train_temporal_models(backends: Optional[Dict[str, str]] = None, thread_count: Optional[int] = None):
+    """Train temporal prediction models (backends default to TEMPORAL_BACKENDS in the settings)"""
+    from config import settings
+    
     logger.info("Starting Temporal Model Training")
     
     # Load data
@@ -379,7 +492,10 @@ def train_temporal_models():
     y = df['success']
     
     # Train temporal models
-    temporal_model = TemporalPredictionModel()
+    temporal_model = TemporalPredictionModel(
+        backends=backends if backends is not None else parse_backends(settings.TEMPORAL_BACKENDS),
+        thread_count=thread_count if thread_count is not None else settings.TEMPORAL_THREAD_COUNT
+    )
     temporal_model.train_temporal_models(X, y)
     
     # Save models
@@ -387,16 +503,10 @@ def train_temporal_models():
     
     # Test predictions
     sample = X.sample(3)
-    for idx, row in sample.iterrows():
-        predictions = temporal_model.predict_temporal(pd.DataFrame([row]))
-        
-        # Convert to single values
-        pred_values = {
-            horizon: float(pred[0]) if isinstance(pred, np.ndarray) else float(pred)
-            for horizon, pred in predictions.items()
-        }
-        
-        insights = temporal_model.get_temporal_insights(pred_values)
+    predictions = temporal_model.predict_temporal(sample)
+    all_insights = temporal_model.get_temporal_insights_batch(predictions)
+    for position, (idx, insights) in enumerate(zip(sample.index, all_insights)):
+        pred_values = {horizon: float(pred[position]) for horizon, pred in predictions.items()}
         
         logger.info(f"\nSample {idx}:")
         logger.info(f"  Short-term: {pred_values.get('short_term', 0):.3f}")
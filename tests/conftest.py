@@ -3,7 +3,9 @@ Test configuration and fixtures for FLASH API tests
 """
 import pytest
 import asyncio
-from typing import Generator, AsyncGenerator
+import numpy as np
+import pandas as pd
+from typing import Dict, Generator, AsyncGenerator, Optional
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
 import sys
@@ -21,6 +23,30 @@ settings.RATE_LIMIT_REQUESTS = 1000
 settings.RATE_LIMIT_WINDOW = 1
 
 
+def random_startups(n: int, columns: Dict, seed: int = 0,
+                    missing: Optional[Dict[str, int]] = None) -> pd.DataFrame:
+    """
+    Random startup frame for the model tests; each module passes its own columns.
+    A column spec is a (low, high) tuple for uniform floats, a range for integers,
+    bool for flags or a list of categories. missing blanks every k-th row of a column.
+    """
+    rng = np.random.default_rng(seed)
+    data = {}
+    for column, spec in columns.items():
+        if isinstance(spec, tuple):
+            data[column] = rng.uniform(*spec, n)
+        elif isinstance(spec, range):
+            data[column] = rng.integers(spec.start, spec.stop, n)
+        elif spec is bool:
+            data[column] = rng.integers(0, 2, n).astype(bool)
+        else:
+            data[column] = rng.choice(spec, n)
+    df = pd.DataFrame(data)
+    for column, every in (missing or {}).items():
+        df.loc[::every, column] = np.nan
+    return df
+
+
 @pytest.fixture(scope="session")
 def event_loop():
     """Create an instance of the default event loop for the test session."""
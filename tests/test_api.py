@@ -197,4 +197,216 @@ class TestExplanationEndpoint:
             data = response.json()
             assert "prediction" in data
             assert "explanation" in data
-            assert "feature_mapping" in data
\ No newline at end of file
+            assert "feature_mapping" in data
+    
+    def test_explanation_reports_warming(self, client, valid_startup_data, monkeypatch):
+        """Requests during explainer warmup get 503 'warming' instead of blocking"""
+        import threading
+        import api_server
+        from shap_explainer import ExplainerWarmer
+        
+        release = threading.Event()
+        warmer = ExplainerWarmer(lambda: release.wait(5))
+        monkeypatch.setattr(api_server, "EXPLAINER_WARMER", warmer)
+        try:
+            response = client.post("/explain", json={**valid_startup_data, "scalability_score": 3})
+            assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+            assert response.json()["status"] == "warming"
+            assert response.headers["Retry-After"] == "5"
+            assert client.get("/health").json()["explainer"] == "warming"
+        finally:
+            release.set()
+    
+    def test_batch_explanation_size_limits(self, client, valid_startup_data, monkeypatch):
+        """Batch explanations reject empty and oversized batches"""
+        from config import settings
+        
+        assert client.post("/explain/batch", json=[]).status_code == status.HTTP_400_BAD_REQUEST
+        monkeypatch.setattr(settings, "MAX_EXPLAIN_BATCH_SIZE", 2)
+        response = client.post("/explain/batch", json=[{**valid_startup_data, "scalability_score": 3}] * 3)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "between 1 and 2" in response.json()["detail"]
+    
+    def test_explanation_plot_urls(self, client, monkeypatch, tmp_path):
+        """Plots are served by content-addressed URL with ETag revalidation"""
+        import api_server
+        from explanation_plots import PlotStore
+        
+        monkeypatch.setattr(api_server, "PLOT_STORE", PlotStore(tmp_path, max_workers=0))
+        explanation = {
+            "pillar_explanations": {},
+            "meta_explanation": {
+                "prediction": 0.6, "shap_values": [0.1, -0.05, 0.02, 0.0],
+                "feature_names": ["Capital Score", "Advantage Score", "Market Score", "People Score"],
+                "feature_values": [0.7, 0.4, 0.5, 0.6]
+            }
+        }
+        urls = api_server.explanation_plot_urls(explanation, "svg")
+        assert sorted(urls) == ["meta_waterfall", "top_features"]
+        
+        response = client.get(urls["meta_waterfall"])
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("image/svg+xml")
+        etag = response.headers["etag"]
+        
+        cached = client.get(urls["meta_waterfall"], headers={"If-None-Match": etag})
+        assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+        assert client.get(urls["meta_waterfall"].replace(".svg", ".gif")).status_code == 404
+        assert client.get("/explain/plots/" + "0" * 32 + "/top_features.svg").status_code == 404
+        
+        # A matching ETag does not turn an invalid or unknown plot into a 304
+        unknown = "/explain/plots/" + "0" * 32 + "/top_features.svg"
+        unknown_etag = '"' + "0" * 32 + '-top_features-svg"'
+        assert client.get(unknown, headers={"If-None-Match": unknown_etag}).status_code == 404
+        
+        # An explanation evicted after the existence check is a 404, not a 500
+        import os
+        import explanation_plots
+        render = explanation_plots._render_to_file
+        
+        def evicted(explanation_path, *args):
+            os.remove(explanation_path)
+            return render(explanation_path, *args)
+        
+        monkeypatch.setattr(explanation_plots, "_render_to_file", evicted)
+        assert client.get(urls["top_features"]).status_code == 404
+
+    def test_shap_summary_endpoints(self, client, monkeypatch, tmp_path):
+        """Precomputed SHAP summaries are served per model and segment"""
+        import pandas as pd
+        import api_server
+        from shap_summaries import compute_shap_summaries
+
+        monkeypatch.setattr(api_server.settings, "SHAP_SUMMARY_DIR", str(tmp_path))
+        monkeypatch.setattr(api_server, "SHAP_SUMMARIES", None)
+        assert client.get("/explain/summary/capital").status_code == 404
+
+        data = pd.read_csv("data/final_sample_1000.csv", nrows=40)
+        compute_shap_summaries(data, "models/v2", tmp_path, interaction_rows=10)
+
+        response = client.get("/explain/summary/capital", params={"stage": "Series A", "top_n": 5})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["segment"]["stage"] == "series_a" and len(response.json()["features"]) == 5
+
+        response = client.get("/explain/summary/capital/dependence/runway_months", params={"bins": 4})
+        assert response.status_code == status.HTTP_200_OK and response.json()["points"]
+        assert client.get("/explain/summary/meta/interactions").json()["pairs"]
+
+        assert client.get("/explain/summary/capital", params={"sector": "Mining"}).status_code == 400
+        assert client.get("/explain/summary/capital/dependence/nope").status_code == 404
+        assert client.get("/explain/summary/nope/interactions").status_code == 404
+
+        # Recomputed summaries are picked up without a restart
+        compute_shap_summaries(data.iloc[:20], "models/v2", tmp_path, interaction_rows=10)
+        assert client.get("/explain/summary/capital").json()["segment"]["rows"] == 20
+
+class TestAdminProfiling:
+    """Test per-request profiling store and admin endpoints"""
+    
+    def test_admin_endpoints_require_key(self, client):
+        """Admin endpoints reject requests without an admin key"""
+        response = client.get("/admin/profiles")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+    
+    def test_admin_closed_without_keys_under_defaults(self, client, monkeypatch):
+        """Unconfigured deploys keep admin endpoints closed, even in development"""
+        from config import settings
+        
+        monkeypatch.setattr(settings, "ENVIRONMENT", "development")
+        monkeypatch.setattr(settings, "ADMIN_API_KEYS", [])
+        for path in ("/admin/profiles", "/admin/memory", "/admin/models/cache"):
+            assert client.get(path).status_code == status.HTTP_403_FORBIDDEN
+        assert client.post("/admin/memory/tracemalloc?requests=1").status_code == status.HTTP_403_FORBIDDEN
+        
+        monkeypatch.setattr(settings, "ADMIN_ALLOW_UNAUTHENTICATED", True)
+        assert client.get("/admin/memory").status_code == status.HTTP_200_OK
+    
+    def test_profile_ring_buffer(self, tmp_path):
+        """Only the most recent profiles are kept on disk"""
+        from profiling import ProfileStore, RequestProfiler
+        
+        profiler = RequestProfiler(ProfileStore(tmp_path, max_profiles=2))
+        profile_ids = []
+        for _ in range(3):
+            session = profiler.start()
+            sum(i * i for i in range(1000))
+            profile_ids.append(profiler.finish(session, {'path': '/predict'}))
+        
+        stored = [p['id'] for p in profiler.store.list()]
+        assert stored == profile_ids[:0:-1]
+        assert len(list(tmp_path.iterdir())) == 4  # profile + metadata per entry
+    
+    def test_list_and_download_profiles(self, client, tmp_path, monkeypatch):
+        """Admins can list and download captured profiles"""
+        import api_server
+        from config import settings
+        from profiling import ProfileStore, RequestProfiler
+        
+        monkeypatch.setattr(settings, "ADMIN_API_KEYS", ["admin-key"])
+        store = ProfileStore(tmp_path)
+        monkeypatch.setattr(api_server, "PROFILE_STORE", store)
+        
+        profiler = RequestProfiler(store)
+        session = profiler.start()
+        profile_id = profiler.finish(session, {'path': '/predict'})
+        
+        headers = {"X-API-Key": "admin-key"}
+        response = client.get("/admin/profiles", headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["profiles"][0]["id"] == profile_id
+        
+        response = client.get(f"/admin/profiles/{profile_id}", headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.content) > 0
+        
+        response = client.get(f"/admin/profiles/{profile_id}?format=text", headers=headers)
+        assert "cumulative" in response.text
+        
+        response = client.get("/admin/profiles/../../etc", headers=headers)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+class TestAdminMemory:
+    """Test model memory footprint reporting"""
+    
+    def test_memory_report(self, client, monkeypatch):
+        """Memory report covers every model family"""
+        from config import settings
+        monkeypatch.setattr(settings, "ADMIN_API_KEYS", ["admin-key"])
+        
+        response = client.get("/admin/memory", headers={"X-API-Key": "admin-key"})
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["process_rss_bytes"] > 0
+        assert set(data["families"]) == {
+            "v2_enhanced", "v2_pillars", "stage_hierarchical", "industry", "temporal", "dna"
+        }
+        assert data["families"]["v2_enhanced"]["disk_bytes"] > 0
+    
+    def test_tracemalloc_window(self, client, monkeypatch):
+        """Allocation sampling closes itself after the requested number of requests"""
+        from config import settings
+        monkeypatch.setattr(settings, "ADMIN_API_KEYS", ["admin-key"])
+        headers = {"X-API-Key": "admin-key"}
+        
+        response = client.post("/admin/memory/tracemalloc?requests=2", headers=headers)
+        assert response.json()["active"] is True
+        client.get("/features")
+        client.get("/features")
+        
+        data = client.get("/admin/memory/tracemalloc", headers=headers).json()
+        assert data["active"] is False
+        assert data["requests_sampled"] == 2
+
+
+class TestSimilarStartups:
+    """Nearest neighbours in DNA space from the shipped similarity index"""
+    
+    def test_similar_startups(self, client, valid_startup_data):
+        startup = {**valid_startup_data, "scalability_score": 3}
+        response = client.post("/similar", params={"k": 5}, json=startup)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["outcome_mix"]["neighbors"] == 5
+        assert len(data["similar_successes"]) == len(data["similar_failures"]) == 5
+        assert client.post("/similar", params={"k": 0}, json=startup).status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,257 @@
+"""
+Tests for DNA pattern analysis
+"""
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dna_pattern_analysis import StartupDNAAnalyzer
+from tests.conftest import random_startups
+
+STARTUP_COLUMNS = {
+    'revenue_growth_rate_percent': (0, 200),
+    'user_growth_rate_percent': (0, 200),
+    'team_size_full_time': range(1, 60),
+    'founding_year': range(2012, 2024),
+    'burn_multiple': (0, 8),
+    'ltv_cac_ratio': (0, 8),
+    'product_retention_30d': (0, 1),
+    'net_dollar_retention_percent': (60, 160),
+    'prior_successful_exits_count': range(0, 3),
+    'domain_expertise_years_avg': (0, 20),
+    'network_effects_present': bool
+}
+
+make_startups = partial(random_startups, columns=STARTUP_COLUMNS)
+
+
+def single_row_reference(analyzer: StartupDNAAnalyzer, row: pd.DataFrame) -> dict:
+    """The original one-startup trajectory logic the batch API must reproduce"""
+    dna = analyzer.extract_dna_features(row).iloc[0]
+    reduced = analyzer.pca.transform(analyzer.scaler.transform(analyzer.extract_dna_features(row)))
+    distances = analyzer.pattern_clusters.transform(reduced)[0]
+    names = list(analyzer.pattern_library.keys())
+    closest = int(distances.argmin())
+    score = dna['growth_velocity'] * 0.4 + dna['user_velocity'] * 0.3 + dna['team_growth_rate'] * 0.3
+    growth = 'hypergrowth' if score > 0.8 else 'rapid' if score > 0.6 else 'steady' if score > 0.4 else 'slow'
+    risks = [message for column, limit, message in [
+        ('capital_efficiency', 0.3, 'High burn rate relative to growth'),
+        ('pmf_strength', 0.4, 'Weak product-market fit signals'),
+        ('founder_success_gene', 0.1, 'Limited founder track record'),
+        ('customer_efficiency', 0.2, 'Poor unit economics')
+    ] if dna[column] < limit]
+    indicators = [message for column, limit, message in [
+        ('growth_velocity', 0.7, 'Strong revenue growth momentum'),
+        ('capital_efficiency', 0.7, 'Excellent capital efficiency'),
+        ('pmf_strength', 0.7, 'Strong product-market fit'),
+        ('founder_success_gene', 0.5, 'Experienced founding team'),
+        ('network_dna', 0.5, 'Network effects present')
+    ] if dna[column] > limit]
+    return {
+        'pattern_type': names[closest] if closest < len(names) else 'unknown',
+        'confidence': 1 / (1 + distances.min()),
+        'growth_prediction': growth,
+        'risk_factors': risks,
+        'success_indicators': indicators
+    }
+
+
+@pytest.fixture(scope="module")
+def analyzer():
+    train = make_startups(1200, seed=1)
+    y = pd.Series((train['product_retention_30d'] > 0.4).astype(int))
+    analyzer = StartupDNAAnalyzer()
+    analyzer.train(train, y)
+    assert analyzer.pattern_clusters is not None
+    return analyzer
+
+
+class TestGrowthTrajectories:
+    """Batch DNA trajectory analysis"""
+
+    def test_one_trajectory_per_row_matches_single_row_logic(self, analyzer):
+        batch = make_startups(50, seed=7)
+        trajectories = analyzer.predict_growth_trajectories(batch)
+        assert len(trajectories) == len(batch)
+        for position, trajectory in enumerate(trajectories):
+            expected = single_row_reference(analyzer, batch.iloc[[position]])
+            assert trajectory['confidence'] == pytest.approx(expected.pop('confidence'))
+            assert {key: trajectory[key] for key in expected} == expected
+
+    def test_single_trajectory_uses_batch_path(self, analyzer):
+        row = make_startups(3, seed=8).iloc[[1]]
+        assert analyzer.predict_growth_trajectory(row) == analyzer.predict_growth_trajectories(row)[0]
+
+    def test_untrained_analyzer_returns_defaults_per_row(self):
+        trajectories = StartupDNAAnalyzer().predict_growth_trajectories(make_startups(3))
+        assert [t['pattern_type'] for t in trajectories] == ['unknown'] * 3
+
+    def test_empty_batch(self, analyzer):
+        assert analyzer.predict_growth_trajectories(make_startups(0)) == []
+        with pytest.raises(ValueError):
+            analyzer.predict_growth_trajectory(make_startups(0))
+
+    def test_non_finite_rows_do_not_fail_the_batch(self, analyzer):
+        batch = make_startups(5, seed=13)
+        batch.loc[2, 'burn_multiple'] = -1  # capital_efficiency = 1 / 0
+        trajectories = analyzer.predict_growth_trajectories(batch)
+        assert trajectories[2] is None
+        assert [trajectories[i] for i in (0, 1, 3, 4)] == \
+            analyzer.predict_growth_trajectories(batch.drop(index=2))
+        with pytest.raises(ValueError):
+            analyzer.predict_growth_trajectory(batch.iloc[[2]])
+
+
+class TestSimilarStartups:
+    """Nearest-neighbour index over the training DNA"""
+
+    def test_neighbours_match_brute_force(self, analyzer):
+        train = make_startups(1200, seed=1)
+        outcomes = (train['product_retention_30d'] > 0.4).to_numpy()
+        reduced = analyzer.reduce_dna(train)
+        query = make_startups(5, seed=9)
+        results = analyzer.find_similar_startups(query, k=7)
+
+        for row, result in zip(analyzer.reduce_dna(query), results):
+            distances = np.linalg.norm(reduced - row, axis=1)
+            nearest_success = np.flatnonzero(outcomes)[np.argsort(distances[outcomes])[:7]]
+            assert [n['startup_id'] for n in result['similar_successes']] == [str(i) for i in nearest_success]
+            assert len(result['similar_failures']) == 7
+            expected_successes = int(outcomes[np.argsort(distances)[:7]].sum())
+            assert result['outcome_mix'] == {
+                'neighbors': 7, 'successes': expected_successes,
+                'failures': 7 - expected_successes, 'success_rate': pytest.approx(expected_successes / 7)
+            }
+
+    def test_index_round_trips_memory_mapped(self, analyzer, tmp_path):
+        from dna_similarity_index import SimilarityIndex
+
+        analyzer.similarity_index.save(tmp_path)
+        loaded = SimilarityIndex.load(tmp_path)
+        assert len(loaded) == len(analyzer.similarity_index) == 1200
+        assert isinstance(loaded.trees['success'].get_arrays()[0], np.memmap)
+        point = analyzer.reduce_dna(make_startups(1, seed=3))
+        assert loaded.query(point, k=3) == analyzer.similarity_index.query(point, k=3)
+
+    def test_missing_index(self):
+        with pytest.raises(ValueError):
+            StartupDNAAnalyzer().find_similar_startups(make_startups(1))
+
+
+class TestPatternStorage:
+    """Stored training DNA arrays"""
+
+    def test_patterns_saved_as_memory_mapped_float32(self, analyzer, tmp_path):
+        analyzer.save(tmp_path)
+        assert not (tmp_path / 'success_patterns.pkl').exists()
+
+        loaded = StartupDNAAnalyzer()
+        loaded.load(tmp_path)
+        for name in ('success_patterns', 'failure_patterns'):
+            stored = getattr(loaded, name)
+            assert isinstance(stored, np.memmap) and stored.dtype == np.float32
+            assert not stored.flags.writeable
+            np.testing.assert_array_equal(stored, getattr(analyzer, name))
+
+    def test_legacy_joblib_patterns_still_load(self, analyzer, tmp_path):
+        import joblib
+
+        analyzer.save(tmp_path)
+        legacy = np.asarray(analyzer.success_patterns, dtype=np.float64)
+        (tmp_path / 'success_patterns.npy').unlink()
+        joblib.dump(legacy, tmp_path / 'success_patterns.pkl')
+
+        loaded = StartupDNAAnalyzer()
+        loaded.load(tmp_path)
+        assert loaded.success_patterns.dtype == np.float32
+        np.testing.assert_allclose(loaded.success_patterns, legacy, rtol=1e-6)
+
+
+class TestFusedProjection:
+    """Scaler + PCA + centroid distances as one affine map"""
+
+    def test_matches_sklearn_chain(self, analyzer):
+        dna = analyzer.extract_dna_features(make_startups(200, seed=11))
+        reduced = analyzer.pca.transform(analyzer.scaler.transform(dna))
+        projection = analyzer.compile_projection()
+
+        np.testing.assert_allclose(projection.project(dna), reduced, rtol=1e-9, atol=1e-9)
+        distances = projection.cluster_distances(projection.project(dna))
+        np.testing.assert_allclose(distances, analyzer.pattern_clusters.transform(reduced), rtol=1e-9, atol=1e-9)
+        np.testing.assert_array_equal(distances.argmin(axis=1), analyzer.pattern_clusters.predict(reduced))
+
+    def test_rejects_non_finite_features(self, analyzer):
+        startups = make_startups(2, seed=12)
+        startups.loc[0, 'burn_multiple'] = -1  # capital_efficiency = 1 / 0
+        with pytest.raises(ValueError):
+            analyzer.reduce_dna(startups)
+
+
+def chunked(df: pd.DataFrame, y: pd.Series, size: int):
+    return lambda: ((df.iloc[i:i + size], y.iloc[i:i + size]) for i in range(0, len(df), size))
+
+
+class TestIncrementalTraining:
+    """Streaming training and folding in new cohorts"""
+
+    def test_streaming_matches_full_batch_statistics(self, analyzer):
+        train = make_startups(1200, seed=1)
+        y = pd.Series((train['product_retention_30d'] > 0.4).astype(int))
+        streamed = StartupDNAAnalyzer()
+        streamed.train_streaming(chunked(train, y, 250))
+
+        np.testing.assert_allclose(streamed.scaler.mean_, analyzer.scaler.mean_)
+        np.testing.assert_allclose(streamed.pca.explained_variance_, analyzer.pca.explained_variance_, rtol=1e-6)
+        assert streamed.pattern_library
+        assert sum(p['size'] for p in streamed.pattern_library.values()) <= int(y.sum())
+        assert streamed.pattern_stats['counts'].sum() == y.sum()
+        assert len(streamed.similarity_index) == len(train)
+        assert streamed.success_patterns.shape == analyzer.success_patterns.shape
+
+    def test_streaming_writes_patterns_into_memmaps(self, analyzer, tmp_path):
+        train = make_startups(1200, seed=1)
+        train.index = [f"s-{i}" for i in range(len(train))]
+        y = pd.Series((train['product_retention_30d'] > 0.4).astype(int), index=train.index)
+        streamed = StartupDNAAnalyzer()
+        streamed.train_streaming(chunked(train, y, 250), work_dir=tmp_path)
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == ['failure_patterns.npy', 'success_patterns.npy']
+        for stored, expected in [(streamed.success_patterns, analyzer.success_patterns),
+                                 (streamed.failure_patterns, analyzer.failure_patterns)]:
+            assert isinstance(stored, np.memmap) and stored.dtype == np.float32
+            np.testing.assert_allclose(stored, expected, rtol=1e-6)
+        assert set(streamed.similarity_index.ids['success']) == set(train.index[y == 1])
+
+        # Saving into the work directory leaves the mapped files intact
+        streamed.save(tmp_path)
+        np.testing.assert_allclose(np.load(tmp_path / 'success_patterns.npy'), analyzer.success_patterns, rtol=1e-6)
+
+    def test_partial_fit_folds_in_cohort(self, analyzer, tmp_path):
+        analyzer.save(tmp_path)
+        model = StartupDNAAnalyzer()
+        model.load(tmp_path)
+        counts_before = model.pattern_stats['counts'].copy()
+        centers_before = model.pattern_clusters.cluster_centers_.copy()
+
+        cohort = make_startups(300, seed=21)
+        cohort.index = [f"new-{i}" for i in range(300)]
+        y = pd.Series((cohort['product_retention_30d'] > 0.4).astype(int), index=cohort.index)
+        model.partial_fit(cohort, y)
+
+        assert model.pattern_stats['counts'].sum() == counts_before.sum() + y.sum()
+        assert not np.allclose(model.pattern_clusters.cluster_centers_, centers_before)
+        assert len(model.similarity_index) == 1500
+        assert len(model.success_patterns) + len(model.failure_patterns) == 1500
+        assert isinstance(model.success_patterns, np.memmap)
+        np.testing.assert_array_equal(model.success_patterns[-1],
+                                      model.extract_dna_features(cohort[y == 1]).to_numpy(dtype=np.float32)[-1])
+        # A new startup is its own nearest neighbour
+        nearest = model.find_similar_startups(cohort.iloc[[0]], k=1)[0]
+        outcome = 'similar_successes' if y.iloc[0] == 1 else 'similar_failures'
+        assert nearest[outcome][0]['startup_id'] == 'new-0'
+
+    def test_partial_fit_requires_trained_clusters(self):
+        with pytest.raises(ValueError):
+            StartupDNAAnalyzer().partial_fit(make_startups(5), pd.Series([1] * 5))
@@ -0,0 +1,55 @@
+"""
+Tests for the columnar hybrid dataset generator
+"""
+import numpy as np
+import pandas as pd
+
+from create_hybrid_dataset import KNOWN_COMPANIES, HybridDatasetGenerator, summarize
+
+
+def generate(n: int, **kwargs) -> pd.DataFrame:
+    return pd.concat(HybridDatasetGenerator(**kwargs).iter_dataset(n))
+
+
+class TestHybridDatasetGenerator:
+
+    def test_reproducible_from_seed(self):
+        first = generate(5000, seed=3, chunk_rows=2000)
+        pd.testing.assert_frame_equal(first, generate(5000, seed=3, chunk_rows=2000))
+        assert not first['total_capital_raised_usd'].equals(generate(5000, seed=4, chunk_rows=2000)['total_capital_raised_usd'])
+
+    def test_chunks_continue_rows(self):
+        df = generate(5000, chunk_rows=2000)
+        assert len(df) == 5000 and list(df.index) == list(range(5000))
+        assert list(df['startup_name'][:len(KNOWN_COMPANIES)]) == [c['name'] for c in KNOWN_COMPANIES]
+        assert df['startup_name'].is_unique and df['startup_name'].iloc[-1].endswith(f"_{5000 - 1 - len(KNOWN_COMPANIES)}")
+        assert df.loc[:4, 'success'].all() and (df.loc[:4, 'runway_months'] == 999).all()
+
+    def test_stage_and_sector_profiles(self):
+        generator = HybridDatasetGenerator(seed=1)
+        df = generator.generate_dataset(20000).iloc[len(KNOWN_COMPANIES):]
+        for stage, profile in generator.stage_profiles.items():
+            rows = df[df['funding_stage'] == stage]
+            low, high = profile['funding_range']
+            assert rows['total_capital_raised_usd'].between(low, high).all()
+            low, high = profile['team_size']
+            assert rows['team_size_full_time'].between(low, high - 1).all()
+        for sector, profile in generator.sector_profiles.items():
+            low, high = profile['gross_margin']
+            assert df.loc[df['sector'] == sector, 'gross_margin_percent'].between(low * 100, high * 100).all()
+
+        # Correlations flow from the shared performance draw and burn/revenue chain
+        assert df['success'].astype(float).corr(df['product_retention_30d']) > 0.1
+        assert df['monthly_burn_usd'].corr(df['total_capital_raised_usd']) > 0.9
+        seed_rows = df[df['funding_stage'] == 'Pre-seed']
+        assert np.isclose((seed_rows['annual_revenue_run_rate'] == 0).mean(), 0.7, atol=0.05)
+        assert set(seed_rows['investor_tier_primary']) == {'Angel', 'Unknown'}
+
+    def test_summary_over_chunks(self):
+        generator = HybridDatasetGenerator(chunk_rows=1500)
+        summary = summarize(generator.iter_dataset(4000))
+        df = generator.generate_dataset(4000)
+        assert summary['total_companies'] == 4000
+        assert summary['success_rate'] == df['success'].mean()
+        assert summary['sectors'] == df['sector'].value_counts().to_dict()
+        assert np.isclose(summary['avg_metrics']['avg_team_size'], df['team_size_full_time'].mean())
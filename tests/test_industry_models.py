@@ -0,0 +1,210 @@
+"""
+Tests for the industry-specific models
+"""
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from industry_specific_models import IndustrySpecificModel
+from model_cache import LRUModelCache
+from tests.conftest import random_startups
+
+SECTORS = ['SaaS', 'FinTech', 'AI/ML', 'Gaming']
+
+STARTUP_COLUMNS = {
+    **{col: (0, 100) for col in [
+        'total_capital_raised_usd', 'annual_revenue_run_rate', 'team_size_full_time', 'runway_months',
+        'funding_rounds_count', 'customer_count', 'gross_margin_percent', 'burn_multiple',
+        'revenue_growth_rate_percent', 'ltv_cac_ratio', 'patent_count', 'domain_expertise_years_avg',
+        'years_experience_avg', 'advisors_count', 'brand_strength_score', 'tech_differentiation_score',
+        'market_growth_rate_percent', 'team_diversity_percent', 'user_growth_rate_percent'
+    ]},
+    'has_data_moat': range(0, 2),
+    'regulatory_advantage_present': range(0, 2),
+    'sector': SECTORS + ['unknown']
+}
+
+make_startups = partial(random_startups, columns=STARTUP_COLUMNS)
+
+
+@pytest.fixture
+def saved_models(tmp_path):
+    """Simple per-sector models saved the way train_industry_models saves them"""
+    model = IndustrySpecificModel()
+    df = make_startups(400)
+    for sector in SECTORS:
+        rows = df[df['sector'] == sector]
+        features = pd.concat([
+            model._select_industry_features(rows, sector), model.create_industry_features(rows, sector)
+        ], axis=1).fillna(0).drop(columns='sector', errors='ignore')
+        model.industry_models[sector] = LogisticRegression(max_iter=2000).fit(
+            features, rows['gross_margin_percent'] > 50
+        )
+    model.save(tmp_path)
+    return model, tmp_path
+
+
+class TestLazyLoading:
+    """Industry models read on first use into a bounded LRU cache"""
+
+    def test_load_indexes_without_reading_models(self, saved_models):
+        _, path = saved_models
+        model = IndustrySpecificModel(cache_size=2)
+        model.load(path)
+        assert model.available_industries() == sorted(SECTORS)
+        assert len(model.model_cache) == 0
+
+    def test_lazy_predictions_match_eager(self, saved_models):
+        trained, path = saved_models
+        model = IndustrySpecificModel(cache_size=2)
+        model.load(path)
+        df = make_startups(200, seed=1)
+
+        np.testing.assert_allclose(model.predict_industry(df), trained.predict_industry(df))
+        stats = model.cache_stats()
+        assert len(stats['resident']) == 2
+        assert stats['misses'] == 4 and stats['evictions'] == 2
+        assert set(stats['load_seconds']) == set(SECTORS)
+
+    def test_preload_top_industries(self, saved_models):
+        _, path = saved_models
+        model = IndustrySpecificModel(cache_size=3)
+        model.load(path, preload_top_n=2)
+        # Saved configs are empty here, so every sector ties on sample count
+        assert len(model.model_cache) == 2 and model.cache_stats()['misses'] == 0
+
+        model.industry_configs = {'Gaming': {'sample_count': 10}, 'FinTech': {'sample_count': 5}}
+        assert model.top_industries(2) == ['Gaming', 'FinTech']
+        assert model.top_industries(2, traffic={'AI/ML': 9, 'SaaS': 3}) == ['AI/ML', 'SaaS']
+
+    def test_save_copies_files_without_touching_cache(self, saved_models, tmp_path):
+        trained, path = saved_models
+        model = IndustrySpecificModel(cache_size=2)
+        model.load(path)
+        model.get_model('SaaS')
+        model.save(tmp_path)
+        model.save(path)  # saving over its own files keeps them
+
+        assert model.model_cache.resident() == ['SaaS'] and model.cache_stats()['misses'] == 1
+        for directory in (tmp_path, path):
+            copy = IndustrySpecificModel()
+            copy.load(directory)
+            df = make_startups(100, seed=2)
+            np.testing.assert_allclose(copy.predict_industry(df), trained.predict_industry(df))
+
+    def test_shipped_models_load_lazily(self):
+        model = IndustrySpecificModel(cache_size=3)
+        model.load('models/industry_specific')
+        assert len(model.model_cache) == 0
+        predictions = model.predict_industry(pd.read_csv('data/final_sample_1000.csv').head(200))
+        assert ((predictions >= 0) & (predictions <= 1)).all()
+        assert len(model.model_cache) == 3
+
+
+def sequential_reference(model: IndustrySpecificModel, X: pd.DataFrame) -> np.ndarray:
+    """The original one-sector-at-a-time DataFrame scoring loop"""
+    predictions = np.full(len(X), 0.5)
+    for industry in model.available_industries():
+        mask = (X['sector'] == industry).to_numpy()
+        if mask.any():
+            rows = X[mask].copy()
+            features = pd.concat([
+                model._select_industry_features(rows, industry), model.create_industry_features(rows, industry)
+            ], axis=1).fillna(0)
+            predictions[mask] = model.get_model(industry).predict_proba(features)[:, 1]
+    return predictions
+
+
+class TestParallelScoring:
+    """Sector groups scored concurrently and scattered back in row order"""
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_matches_sequential_scoring(self, saved_models, workers):
+        trained, _ = saved_models
+        trained.predict_workers = workers
+        df = make_startups(300, seed=2)
+        np.testing.assert_array_equal(trained.predict_industry(df), sequential_reference(trained, df))
+
+    def test_shipped_models_match_sequential_scoring(self):
+        model = IndustrySpecificModel(predict_workers=4)
+        model.load('models/industry_specific')
+        df = pd.read_csv('data/final_sample_1000.csv')
+        df.loc[::7, 'runway_months'] = np.nan
+        np.testing.assert_array_equal(model.predict_industry(df), sequential_reference(model, df))
+
+    def test_pool_reused_until_shutdown(self):
+        model = IndustrySpecificModel(predict_workers=2)
+        model.load('models/industry_specific')
+        df = pd.read_csv('data/final_sample_1000.csv', nrows=200)
+        first = model.predict_industry(df)
+        pool = model._predict_pool
+        assert pool is not None
+        np.testing.assert_array_equal(model.predict_industry(df), first)
+        assert model._predict_pool is pool
+
+        model.shutdown()
+        assert model._predict_pool is None
+        np.testing.assert_array_equal(model.predict_industry(df), first)
+        model.shutdown()
+
+
+class TestLRUModelCache:
+
+    def test_evicts_least_recently_used(self):
+        loads = []
+        cache = LRUModelCache(lambda key: loads.append(key) or key.upper(), max_models=2)
+        assert [cache.get(key) for key in 'abacb'] == ['A', 'B', 'A', 'C', 'B']
+        assert loads == ['a', 'b', 'c', 'b']
+        assert cache.resident() == ['c', 'b']
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses'], stats['evictions']) == (1, 4, 2)
+        assert stats['requests'] == {'b': 2, 'a': 2, 'c': 1}
+
+    def test_slow_load_does_not_block_other_keys(self):
+        import threading
+
+        release, started, loads = threading.Event(), threading.Event(), []
+
+        def loader(key):
+            loads.append(key)
+            if key == 'slow':
+                started.set()
+                release.wait(5)
+            return key.upper()
+
+        cache = LRUModelCache(loader)
+        cache.get('fast')
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get('slow'))) for _ in range(2)]
+        threads[0].start()
+        assert started.wait(5)
+        threads[1].start()
+        # A hit on a resident key is served while 'slow' is still loading
+        assert cache.get('fast') == 'FAST' and 'slow' not in cache
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        assert results == ['SLOW', 'SLOW'] and loads == ['fast', 'slow']
+
+    def test_failed_load_is_retried(self):
+        attempts = []
+
+        def loader(key):
+            attempts.append(key)
+            if len(attempts) == 1:
+                raise OSError("disk error")
+            return key
+
+        cache = LRUModelCache(loader)
+        with pytest.raises(OSError):
+            cache.get('a')
+        assert cache.get('a') == 'a' and attempts == ['a', 'a']
+
+    def test_unbounded(self):
+        cache = LRUModelCache(str, max_models=0)
+        for key in range(10):
+            cache.get(key)
+        assert len(cache) == 10
@@ -0,0 +1,119 @@
+"""
+Tests for the parallel segment trainer
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from segment_training import SegmentTrainer, SegmentTrainingError
+from temporal_models import _fit_temporal_model
+
+
+def make_segment(n: int, seed: int):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(n, 4)), columns=['a', 'b', 'c', 'd'])
+    return X, (X['a'] + rng.normal(scale=0.5, size=n) > 0).astype(int)
+
+
+def jobs(backends):
+    return {
+        f"segment_{i}": (_fit_temporal_model, (backend, *make_segment(200, seed=i)))
+        for i, backend in enumerate(backends)
+    }
+
+
+class TestSegmentTrainer:
+
+    def test_plan_divides_budget(self):
+        assert SegmentTrainer(cpu_budget=8).plan(3) == (3, 2)
+        assert SegmentTrainer(cpu_budget=8).plan(20) == (8, 1)
+        assert SegmentTrainer(cpu_budget=8, max_workers=2).plan(6) == (2, 4)
+        assert SegmentTrainer(cpu_budget=1).plan(6) == (1, 1)
+
+    def test_in_process_failure_isolation(self):
+        trainer = SegmentTrainer(cpu_budget=1)
+        results = trainer.run(jobs(['logistic_regression', 'no_such_backend', 'logistic_regression']))
+        assert sorted(results) == ['segment_0', 'segment_2']
+        assert list(trainer.failures) == ['segment_1'] and 'KeyError' in trainer.failures['segment_1']
+        assert sorted(trainer.timings) == ['segment_0', 'segment_2']
+
+    def test_worker_processes_match_in_process(self):
+        backends = ['logistic_regression', 'hist_gradient_boosting', 'no_such_backend']
+        sequential = SegmentTrainer(cpu_budget=1).run(jobs(backends))
+        trainer = SegmentTrainer(cpu_budget=2)
+        parallel = trainer.run(jobs(backends))
+
+        assert sorted(parallel) == sorted(sequential) == ['segment_0', 'segment_1']
+        assert list(trainer.failures) == ['segment_2']
+        X, _ = make_segment(50, seed=99)
+        for name, model in sequential.items():
+            np.testing.assert_allclose(parallel[name].predict_proba(X), model.predict_proba(X))
+
+    def test_raise_failures(self):
+        trainer = SegmentTrainer(cpu_budget=1)
+        trainer.run(jobs(['logistic_regression', 'no_such_backend']))
+        with pytest.raises(SegmentTrainingError) as error:
+            trainer.raise_failures("temporal")
+        assert list(error.value.failures) == ['segment_1'] and 'temporal' in str(error.value)
+
+        trainer.run(jobs(['logistic_regression']))
+        trainer.raise_failures()
+
+
+@pytest.fixture(scope="module")
+def sample():
+    return pd.read_csv('data/final_sample_1000.csv')
+
+
+def segment_data(sample: pd.DataFrame, column: str, segments: list):
+    """Numeric features plus the segment column for the rows of the given segments"""
+    rows = sample[sample[column].isin(segments)]
+    return rows.select_dtypes('number').assign(**{column: rows[column]}), rows['success'].astype(int)
+
+
+class TestSegmentModelsInWorkers:
+    """Stage and industry jobs pickle into spawned workers and receive their thread share"""
+
+    def test_stage_ensembles(self, sample):
+        from stage_hierarchical_models import StageHierarchicalModel
+
+        X, y = segment_data(sample, 'funding_stage', ['Seed', 'Series A'])
+        model = StageHierarchicalModel()
+        trainer = SegmentTrainer(cpu_budget=2)
+        model.train_stage_models(X, y, trainer=trainer)
+
+        assert sorted(model.stage_models) == ['seed', 'series_a'] and not trainer.failures
+        for ensemble in model.stage_models.values():
+            assert ensemble['catboost'].get_params()['thread_count'] == 1
+            assert ensemble['xgboost'].get_params()['n_jobs'] == 1
+
+    def test_industry_models(self, sample):
+        from industry_specific_models import IndustrySpecificModel
+
+        X, y = segment_data(sample, 'sector', ['SaaS', 'AI/ML'])
+        model = IndustrySpecificModel()
+        trainer = SegmentTrainer(cpu_budget=2)
+        model.train_industry_models(X, y, trainer=trainer)
+
+        assert sorted(model.industry_models) == ['AI/ML', 'SaaS'] and not trainer.failures
+        assert model.industry_models['SaaS'].get_params()['thread_count'] == 1
+        assert model.industry_models['AI/ML'].get_params()['n_jobs'] == 1
+
+    def test_failed_industry_raises_after_keeping_the_rest(self, sample, monkeypatch):
+        import industry_specific_models
+        from industry_specific_models import IndustrySpecificModel
+
+        fit = industry_specific_models._fit_industry_model
+
+        def fail_saas(industry, *args, **kwargs):
+            if industry == 'SaaS':
+                raise ValueError("bad segment")
+            return fit(industry, *args, **kwargs)
+
+        monkeypatch.setattr(industry_specific_models, '_fit_industry_model', fail_saas)
+        X, y = segment_data(sample, 'sector', ['SaaS', 'AI/ML'])
+        model = IndustrySpecificModel()
+        with pytest.raises(SegmentTrainingError) as error:
+            model.train_industry_models(X, y, trainer=SegmentTrainer(cpu_budget=1))
+        assert list(error.value.failures) == ['SaaS']
+        assert list(model.industry_models) == ['AI/ML']
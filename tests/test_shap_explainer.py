@@ -0,0 +1,300 @@
+"""
+Tests for the SHAP explainer
+"""
+import pickle
+import threading
+
+import numpy as np
+import pytest
+from sklearn.ensemble import GradientBoostingClassifier
+
+from shap_explainer import ExplainerWarmer, FLASHExplainer
+
+PILLAR_WIDTHS = {'capital': 11, 'advantage': 8, 'market': 8, 'people': 11, 'meta': 4}
+
+
+@pytest.fixture(scope="module")
+def models_dir(tmp_path_factory):
+    """Small pickled pillar and meta models in the layout FLASHExplainer loads"""
+    path = tmp_path_factory.mktemp("shap_models")
+    rng = np.random.default_rng(0)
+    for name, width in PILLAR_WIDTHS.items():
+        X = rng.random((300, width))
+        model = GradientBoostingClassifier(n_estimators=20, max_depth=3, random_state=0)
+        model.fit(X, (X[:, 0] + X[:, -1] > 1).astype(int))
+        with open(path / f"{name}_model.pkl", 'wb') as f:
+            pickle.dump(model, f)
+    return path
+
+
+def sample_features(explainer: FLASHExplainer, seed: int = 1) -> dict:
+    rng = np.random.default_rng(seed)
+    return {name: float(rng.random()) for names in explainer.feature_names.values() for name in names}
+
+
+class TestExplainerCache:
+    """Built explainers cached on disk by model content"""
+
+    def test_rebuild_reads_cache(self, models_dir, tmp_path, monkeypatch):
+        import shap
+
+        built = FLASHExplainer(models_dir=models_dir, cache_dir=tmp_path)
+        assert len(list(tmp_path.glob('*.joblib'))) == len(PILLAR_WIDTHS)
+
+        def no_build(*args, **kwargs):
+            raise AssertionError("explainer rebuilt despite cache")
+
+        monkeypatch.setattr(shap, 'TreeExplainer', no_build)
+        cached = FLASHExplainer(models_dir=models_dir, cache_dir=tmp_path)
+
+        features = sample_features(built)
+        expected = built.explain_prediction(features, include_plots=False)
+        assert cached.explain_prediction(features, include_plots=False) == expected
+        assert expected['meta_explanation'] is not None
+
+    def test_changed_model_gets_new_entry(self, models_dir, tmp_path):
+        FLASHExplainer(models_dir=models_dir, cache_dir=tmp_path)
+        model_file = models_dir / 'meta_model.pkl'
+        original = model_file.read_bytes()
+        try:
+            with open(model_file, 'wb') as f:
+                pickle.dump(pickle.loads(original), f, protocol=2)
+            FLASHExplainer(models_dir=models_dir, cache_dir=tmp_path)
+        finally:
+            model_file.write_bytes(original)
+        assert len(list(tmp_path.glob('meta-*.joblib'))) == 2
+
+
+class TestExplainerWarmer:
+    """Background explainer construction"""
+
+    def test_reports_warming_until_built(self, models_dir):
+        release = threading.Event()
+
+        def factory():
+            release.wait(5)
+            return FLASHExplainer(models_dir=models_dir)
+
+        warmer = ExplainerWarmer(factory)
+        warmer.start()
+        assert warmer.state == 'warming' and warmer.explainer is None
+        warmer.start()  # a second start does not build twice
+        release.set()
+        for _ in range(100):
+            if warmer.state == 'ready':
+                break
+            threading.Event().wait(0.05)
+        assert warmer.state == 'ready' and isinstance(warmer.explainer, FLASHExplainer)
+        assert warmer.status()['build_seconds'] > 0
+
+    def test_failed_build_can_restart(self):
+        attempts = []
+
+        def factory():
+            attempts.append(1)
+            raise OSError("models missing")
+
+        warmer = ExplainerWarmer(factory)
+        for _ in range(2):
+            warmer.start()
+            for _ in range(100):
+                if warmer.state == 'failed':
+                    break
+                threading.Event().wait(0.01)
+        assert warmer.status() == {'state': 'failed', 'error': 'models missing', 'build_seconds': None}
+        assert len(attempts) == 2
+
+
+@pytest.fixture(scope="module")
+def explanation(models_dir):
+    explainer = FLASHExplainer(models_dir=models_dir)
+    return explainer.explain_prediction(sample_features(explainer), include_plots=False)
+
+
+class TestPlotStore:
+    """Content-addressed plots rendered on demand"""
+
+    def test_render_formats(self, explanation):
+        from shap_explainer import render_plot
+
+        pillars, meta = explanation['pillar_explanations'], explanation['meta_explanation']
+        assert b'<svg' in render_plot('pillar_radar', pillars, meta, fmt='svg')
+        assert render_plot('meta_waterfall', pillars, meta, fmt='png').startswith(b'\x89PNG')
+        with pytest.raises(ValueError):
+            render_plot('meta_waterfall', pillars, None)
+
+    def test_inline_plots_still_available(self, models_dir):
+        explainer = FLASHExplainer(models_dir=models_dir)
+        plots = explainer.explain_prediction(sample_features(explainer))['plots']
+        assert sorted(plots) == ['meta_waterfall', 'pillar_radar', 'top_features']
+        assert all(uri.startswith('data:image/png;base64,') for uri in plots.values())
+
+    def test_renders_once_and_caches(self, explanation, tmp_path, monkeypatch):
+        import explanation_plots
+        from explanation_plots import PlotStore
+
+        store = PlotStore(tmp_path, max_workers=0)
+        digest = store.put(explanation)
+        assert store.put(dict(explanation, plots={})) == digest
+
+        path = store.render(digest, 'top_features', 'svg').result()
+        assert path.endswith(f"{digest}-top_features.svg")
+
+        monkeypatch.setattr(explanation_plots, 'render_plot', lambda *a, **k: pytest.fail("re-rendered"))
+        assert store.render(digest, 'top_features', 'svg').result() == path
+
+        for bad in [('0' * 32, 'top_features', 'svg'), (digest, 'nope', 'svg'), (digest, 'top_features', 'gif')]:
+            with pytest.raises(KeyError):
+                store.render(*bad)
+
+    def test_process_pool_render(self, explanation, tmp_path):
+        from explanation_plots import PlotStore
+
+        store = PlotStore(tmp_path, max_workers=1)
+        try:
+            digest = store.put(explanation)
+            path = store.render(digest, 'pillar_radar', 'png').result(timeout=120)
+            assert open(path, 'rb').read(4) == b'\x89PNG'
+        finally:
+            store.shutdown()
+
+    def test_evicts_oldest_explanations(self, explanation, tmp_path):
+        import os
+        from explanation_plots import PlotStore
+
+        store = PlotStore(tmp_path, max_workers=0, max_explanations=2)
+        digests = []
+        for i in range(3):
+            changed = dict(explanation, meta_explanation=dict(explanation['meta_explanation'], prediction=i / 10))
+            digests.append(store.put(changed))
+            store.render(digests[-1], 'meta_waterfall', 'svg').result()
+            os.utime(tmp_path / f"{digests[-1]}.json", (i, i))
+        store.put(dict(explanation, meta_explanation=dict(explanation['meta_explanation'], prediction=0.9)))
+        assert not list(tmp_path.glob(f"{digests[0]}*")) and not list(tmp_path.glob(f"{digests[1]}*"))
+        assert (tmp_path / f"{digests[2]}-meta_waterfall.svg").exists()
+
+    def test_eviction_order_seeded_from_disk(self, explanation, tmp_path, monkeypatch):
+        import os
+        from explanation_plots import PlotStore
+
+        first = PlotStore(tmp_path, max_workers=0)
+        digests = []
+        for i in range(3):
+            digests.append(first.put(dict(explanation, meta_explanation=dict(explanation['meta_explanation'],
+                                                                            prediction=i / 10))))
+            os.utime(tmp_path / f"{digests[-1]}.json", (10 - i, 10 - i))
+
+        store = PlotStore(tmp_path, max_workers=0, max_explanations=3)
+        store.put(dict(explanation, meta_explanation=dict(explanation['meta_explanation'], prediction=0.9)))
+        assert not (tmp_path / f"{digests[2]}.json").exists()
+
+        # Later puts do not scan the directory
+        monkeypatch.setattr(type(tmp_path), 'glob', lambda *a: pytest.fail("directory scanned"))
+        store.put(dict(explanation, meta_explanation=dict(explanation['meta_explanation'], prediction=0.8)))
+        assert not (tmp_path / f"{digests[1]}.json").exists() and (tmp_path / f"{digests[0]}.json").exists()
+
+
+class TestBatchExplain:
+    """Many startups explained with one SHAP pass per model"""
+
+    def test_rows_match_single_explanations(self, models_dir):
+        explainer = FLASHExplainer(models_dir=models_dir)
+        rows = [sample_features(explainer, seed) for seed in range(25)]
+        batch = explainer.explain_batch(rows)
+
+        assert len(batch) == len(rows)
+        for row, explanation in zip(rows, batch):
+            single = explainer.explain_prediction(row, include_plots=False)
+            assert explanation == single
+            assert set(explanation['pillar_explanations']) == {'capital', 'advantage', 'market', 'people'}
+            assert explanation['insights']['opportunities']
+
+    def test_shap_values_match_per_row_computation(self, models_dir):
+        explainer = FLASHExplainer(models_dir=models_dir)
+        rows = [sample_features(explainer, seed) for seed in range(5)]
+        batch = explainer.explain_batch(rows)
+        names = explainer.feature_names['people']
+        for row, explanation in zip(rows, batch):
+            X = np.array([[row[name] for name in names]])
+            np.testing.assert_allclose(
+                explanation['pillar_explanations']['people']['shap_values'],
+                explainer.explainers['people'].shap_values(X)[0]
+            )
+
+    def test_empty_batch(self, models_dir):
+        assert FLASHExplainer(models_dir=models_dir).explain_batch([]) == []
+
+    def test_positive_class_layouts(self):
+        from shap_explainer import _positive_class
+
+        values = np.arange(6.0).reshape(3, 2)
+        np.testing.assert_array_equal(_positive_class([-values, values]), values)
+        np.testing.assert_array_equal(_positive_class(np.stack([-values, values], axis=2)), values)
+        np.testing.assert_array_equal(_positive_class(values), values)
+
+
+@pytest.fixture(scope="module")
+def shipped_rows():
+    import pandas as pd
+
+    return pd.read_csv('data/final_sample_1000.csv', nrows=50).to_dict('records')
+
+
+class TestCatBoostBackend:
+    """SHAP values of the shipped .cbm models computed natively by CatBoost"""
+
+    def test_native_values_match_shap_library(self, shipped_rows):
+        native = FLASHExplainer(backend='catboost')
+        assert set(native.model_paths) == {'capital', 'advantage', 'market', 'people', 'meta'}
+        assert all(path.suffix == '.cbm' for path in native.model_paths.values())
+
+        expected = FLASHExplainer(backend='shap').explain_batch(shipped_rows)
+        for explanation, reference in zip(native.explain_batch(shipped_rows), expected):
+            for pillar, pillar_explanation in explanation['pillar_explanations'].items():
+                np.testing.assert_allclose(pillar_explanation['shap_values'],
+                                           reference['pillar_explanations'][pillar]['shap_values'], atol=1e-9)
+            np.testing.assert_allclose(explanation['meta_explanation']['shap_values'],
+                                       reference['meta_explanation']['shap_values'], atol=1e-9)
+
+    def test_categorical_features_and_meta_interactions(self, shipped_rows):
+        explanation = FLASHExplainer(backend='catboost').explain_prediction(shipped_rows[0], include_plots=False)
+        capital = explanation['pillar_explanations']['capital']
+        assert capital['feature_names'][0] == 'funding_stage'
+        assert capital['feature_values'][0] == shipped_rows[0]['funding_stage']
+        from shap_explainer import render_plot
+        assert b'<svg' in render_plot('top_features', explanation['pillar_explanations'], None)
+
+        meta = explanation['meta_explanation']
+        assert meta['feature_names'][-2:] == ['Capital x Market', 'People x Advantage']
+        assert meta['feature_values'][4] == pytest.approx(meta['feature_values'][0] * meta['feature_values'][2])
+
+    def test_log_odds_values_labelled(self, shipped_rows):
+        from shap_explainer import _impact_axis_label
+
+        explanation = FLASHExplainer(backend='catboost').explain_prediction(shipped_rows[0], include_plots=False)
+        assert explanation['meta_explanation']['output_scale'] == 'log_odds'
+        assert all(exp['output_scale'] == 'log_odds' for exp in explanation['pillar_explanations'].values())
+        insights = explanation['insights']
+        assert all('success log-odds by' in driver for driver in insights['key_drivers'])
+        assert all(text.endswith('log-odds') for text in insights['strengths'] + insights['weaknesses'])
+        assert _impact_axis_label(['log_odds']) == 'Impact on Success Log-Odds'
+        assert _impact_axis_label(['probability']) == 'Impact on Success Probability'
+
+    def test_approximate_mode_close_to_exact(self, shipped_rows):
+        exact = FLASHExplainer(backend='catboost', thread_count=1).explain_batch(shipped_rows)
+        approximate = FLASHExplainer(backend='catboost', approximate=True).explain_batch(shipped_rows)
+        for pillar in ['capital', 'people']:
+            a = np.array([row['pillar_explanations'][pillar]['shap_values'] for row in exact]).ravel()
+            b = np.array([row['pillar_explanations'][pillar]['shap_values'] for row in approximate]).ravel()
+            assert not np.allclose(a, b) and np.corrcoef(a, b)[0, 1] > 0.9
+        # Predictions do not depend on how SHAP values are computed
+        assert [row['meta_explanation']['prediction'] for row in exact] == \
+               [row['meta_explanation']['prediction'] for row in approximate]
+
+    def test_pickled_models_keep_shap_explainers(self, models_dir):
+        import shap
+
+        explainer = FLASHExplainer(models_dir=models_dir, backend='catboost')
+        assert all(isinstance(e, shap.TreeExplainer) for e in explainer.explainers.values())
+        with pytest.raises(ValueError):
+            FLASHExplainer(models_dir=models_dir, backend='lime')
@@ -0,0 +1,90 @@
+"""
+Tests for the precomputed SHAP summaries
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from shap_explainer import FLASHExplainer
+from shap_summaries import ShapSummaryStore, compute_shap_summaries
+
+
+@pytest.fixture(scope="module")
+def sample():
+    return pd.read_csv('data/final_sample_1000.csv', nrows=200)
+
+
+@pytest.fixture(scope="module")
+def store(sample, tmp_path_factory):
+    path = tmp_path_factory.mktemp("shap_summaries")
+    compute_shap_summaries(sample, 'models/v2', path, chunk_rows=64, interaction_rows=60)
+    return ShapSummaryStore(path)
+
+
+class TestShapSummaries:
+    """Dataset-wide SHAP values sliced by funding stage and sector"""
+
+    def test_arrays_match_explanations(self, sample, store):
+        explanations = FLASHExplainer(backend='catboost').explain_batch(sample.to_dict('records'))
+        shap_values = store._array('capital', 'shap')
+        assert isinstance(shap_values, np.memmap) and shap_values.dtype == np.float32
+        np.testing.assert_allclose(
+            shap_values, [row['pillar_explanations']['capital']['shap_values'] for row in explanations], atol=1e-5
+        )
+        np.testing.assert_allclose(
+            store._array('meta', 'shap'), [row['meta_explanation']['shap_values'] for row in explanations], atol=1e-5
+        )
+
+    def test_segment_importance(self, sample, store):
+        rows = np.flatnonzero((sample['funding_stage'] == 'Series A') & (sample['sector'] == 'SaaS'))
+        summary = store.importance('people', stage='series_a', sector='saas')
+        assert summary['segment'] == {'stage': 'series_a', 'sector': 'SaaS', 'rows': len(rows)}
+
+        expected = np.abs(store._array('people', 'shap')[rows]).mean(axis=0)
+        by_feature = {item['feature']: item['mean_abs_shap'] for item in summary['features']}
+        np.testing.assert_allclose([by_feature[name] for name in store.features('people')], expected, rtol=1e-5)
+        assert [item['mean_abs_shap'] for item in summary['features']] == sorted(by_feature.values(), reverse=True)
+
+        assert store.importance('people', top_n=3)['segment']['rows'] == len(sample)
+        assert len(store.importance('people', top_n=3)['features']) == 3
+        with pytest.raises(ValueError):
+            store.importance('people', stage='series_z')
+        with pytest.raises(KeyError):
+            store.importance('nope')
+
+    def test_dependence(self, sample, store):
+        categorical = store.dependence('capital', 'funding_stage')
+        assert categorical['categorical']
+        assert {point['value'] for point in categorical['points']} == set(sample['funding_stage'])
+        assert sum(point['count'] for point in categorical['points']) == len(sample)
+
+        numeric = store.dependence('capital', 'runway_months', sector='SaaS', bins=4)
+        assert not numeric['categorical'] and len(numeric['points']) == 4
+        assert sum(point['count'] for point in numeric['points']) == (sample['sector'] == 'SaaS').sum()
+        assert [point['value'] for point in numeric['points']] == sorted(point['value'] for point in numeric['points'])
+        with pytest.raises(KeyError):
+            store.dependence('capital', 'team_size_full_time')
+
+    def test_interactions(self, sample, store):
+        summary = store.interactions('meta', top_n=3)
+        assert summary['segment']['rows'] == 60 and len(summary['pairs']) == 3
+        strengths = [pair['mean_abs_interaction'] for pair in summary['pairs']]
+        assert strengths == sorted(strengths, reverse=True)
+
+        seed_rows = set(np.flatnonzero(sample['funding_stage'] == 'Seed'))
+        assert store.interactions('capital', stage='seed')['segment']['rows'] == \
+            len(seed_rows & set(store.interaction_rows.tolist()))
+
+    def test_recompute_replaces_directory_under_open_store(self, sample, tmp_path):
+        target = tmp_path / 'summaries'
+        compute_shap_summaries(sample.iloc[:40], 'models/v2', target, interaction_rows=0)
+        old = ShapSummaryStore(target)
+        old_values = np.array(old._array('capital', 'shap'))
+        assert old.is_current()
+
+        compute_shap_summaries(sample.iloc[:80], 'models/v2', target, interaction_rows=0)
+        # The old mapping still reads the old arrays; the manifest change marks the store stale
+        np.testing.assert_array_equal(old._array('capital', 'shap'), old_values)
+        assert not old.is_current()
+        assert ShapSummaryStore(target).importance('capital')['segment']['rows'] == 80
+        assert [p.name for p in tmp_path.iterdir()] == ['summaries']
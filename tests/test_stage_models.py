@@ -0,0 +1,251 @@
+"""
+Tests for the stage-based hierarchical model
+"""
+import json
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+
+from stage_hierarchical_models import StageHierarchicalModel
+from tests.conftest import random_startups
+
+
+NUMERIC_COLUMNS = [
+    'years_experience_avg', 'domain_expertise_years_avg', 'prior_startup_experience_count',
+    'tech_differentiation_score', 'patent_count', 'brand_strength_score', 'customer_count',
+    'product_retention_30d', 'annual_revenue_run_rate', 'scalability_score',
+    'net_dollar_retention_percent', 'user_growth_rate_percent', 'dau_mau_ratio', 'ltv_cac_ratio',
+    'burn_multiple', 'gross_margin_percent', 'team_size_full_time', 'runway_months',
+    'revenue_growth_rate_percent'
+]
+
+
+STARTUP_COLUMNS = {
+    **{col: (0, 100) for col in NUMERIC_COLUMNS},
+    'product_retention_30d': (0, 1),
+    'dau_mau_ratio': (0, 1),
+    'burn_multiple': (0, 12),
+    'annual_revenue_run_rate': (0, 3e7),
+    'team_size_full_time': range(1, 100),
+    'funding_stage': ['pre_seed', 'seed', 'series_a', 'series_b', 'unknown']
+}
+
+make_startups = partial(random_startups, columns=STARTUP_COLUMNS, missing={'runway_months': 7})
+
+
+@pytest.fixture
+def stage_model():
+    """Hierarchical model with small decision-tree ensembles standing in for the boosted models"""
+    model = StageHierarchicalModel()
+    train = make_startups(400, seed=1)
+    y = (train['product_retention_30d'] > 0.5).astype(int)
+    for stage in ['pre_seed', 'seed', 'series_a', 'series_b']:
+        mask = train['funding_stage'] == stage
+        features = model.create_stage_specific_features(train[mask], stage).drop(columns='funding_stage')
+        model.stage_models[stage] = {
+            'shallow': DecisionTreeClassifier(max_depth=2, random_state=0).fit(features, y[mask]),
+            'deep': DecisionTreeClassifier(max_depth=5, random_state=0).fit(features, y[mask])
+        }
+    meta_X = np.random.default_rng(2).uniform(0, 1, (200, 6))
+    model.meta_model = LogisticRegression().fit(meta_X, (meta_X[:, 0] > 0.5).astype(int))
+    return model
+
+
+def predict_row_by_row(model: StageHierarchicalModel, X: pd.DataFrame) -> np.ndarray:
+    """Reference per-row implementation the batched predict_proba must reproduce"""
+    predictions = []
+    for _, row in X.iterrows():
+        stage = row['funding_stage']
+        if stage not in model.stage_models:
+            predictions.append([0.5, 0.5])
+            continue
+        row_features = model.create_stage_specific_features(X.loc[[row.name]], stage)
+        feature_cols = [col for col in row_features.columns if col != 'funding_stage']
+        stage_preds = [m.predict_proba(row_features[feature_cols])[0, 1]
+                       for m in model.stage_models[stage].values()]
+        adjusted = model.apply_stage_adjustments(np.mean(stage_preds), row, stage)
+        meta_features = stage_preds + list(model.stage_feature_weights[stage].values())
+        meta_pred = model.meta_model.predict_proba(np.array(meta_features).reshape(1, -1))[0, 1]
+        final = 0.7 * adjusted + 0.3 * meta_pred
+        predictions.append([1 - final, final])
+    return np.array(predictions)
+
+
+class TestStagePrediction:
+    """Batched stage prediction"""
+
+    def test_matches_row_by_row(self, stage_model):
+        X = make_startups(120, seed=3)
+        np.testing.assert_allclose(stage_model.predict_proba(X), predict_row_by_row(stage_model, X))
+
+    def test_preserves_row_order_and_index(self, stage_model):
+        X = make_startups(50, seed=4)
+        X.index = np.arange(1000, 1050)[::-1]
+        expected = predict_row_by_row(stage_model, X)
+        np.testing.assert_allclose(stage_model.predict_proba(X), expected)
+        np.testing.assert_allclose(stage_model.predict_proba(X.iloc[[7]]), expected[[7]])
+
+    def test_unknown_stage_is_neutral(self, stage_model):
+        X = make_startups(10, seed=5).assign(funding_stage='unknown')
+        np.testing.assert_array_equal(stage_model.predict_proba(X), np.full((10, 2), 0.5))
+
+    def test_stage_adjustments_single_row_and_batch(self, stage_model):
+        X = pd.DataFrame({
+            'team_size_full_time': [1, 50],
+            'product_retention_30d': [0.1, 0.9],
+            'burn_multiple': [20, 1],
+            'runway_months': [3, 30],
+            'annual_revenue_run_rate': [0, 5e6],
+            'revenue_growth_rate_percent': [10, 90]
+        })
+        batch = stage_model.apply_stage_adjustments(np.array([1.0, 1.0]), X, 'series_a')
+        # Every threshold fails for the first row: penalties sum to 0.35 and are capped at 0.3
+        np.testing.assert_allclose(batch, [0.7, 1.0])
+        assert stage_model.apply_stage_adjustments(1.0, X.iloc[0], 'series_a') == pytest.approx(0.7)
+        # Missing burn_multiple defaults to 999 and fails the max threshold
+        assert stage_model.apply_stage_adjustments(
+            1.0, X.iloc[1].drop('burn_multiple'), 'series_a') == pytest.approx(0.93)
+
+
+class TestMetaModelTraining:
+    """Bulk meta-feature generation for the meta-model"""
+
+    def test_in_sample_matches_row_by_row_features(self, stage_model):
+        X = make_startups(150, seed=6)
+        y = (X['product_retention_30d'] > 0.4).astype(int)
+        expected = []
+        for _, row in X.iterrows():
+            stage = row['funding_stage']
+            if stage not in stage_model.stage_models:
+                expected.append([0.5] * 2 + [0.25] * 4)
+                continue
+            row_features = stage_model.create_stage_specific_features(X.loc[[row.name]], stage)
+            feature_cols = [col for col in row_features.columns if col != 'funding_stage']
+            expected.append([m.predict_proba(row_features[feature_cols])[0, 1]
+                             for m in stage_model.stage_models[stage].values()]
+                            + list(stage_model.stage_feature_weights[stage].values()))
+        reference = LogisticRegression(C=1.0, class_weight='balanced', max_iter=1000).fit(np.array(expected), y)
+
+        stage_model.train_meta_model(X, y, n_folds=0)
+        np.testing.assert_allclose(stage_model.meta_model.coef_, reference.coef_, rtol=1e-6)
+
+    def test_out_of_fold_predictions_use_held_out_models(self, stage_model):
+        X = make_startups(300, seed=7)
+        y = pd.Series(np.random.default_rng(7).integers(0, 2, len(X)), index=X.index)
+        mask = (X['funding_stage'] == 'seed').to_numpy()
+        features = stage_model.create_stage_specific_features(X[mask], 'seed')
+
+        oof = stage_model._out_of_fold_predictions(features, y[mask].to_numpy(), 'seed', 3, 0)
+        in_sample = stage_model._stage_model_predictions(features, 'seed')
+        assert oof.shape == in_sample.shape
+        assert not np.allclose(oof, in_sample)
+        # Fitted stage ensembles are left untouched by the fold refits
+        np.testing.assert_array_equal(stage_model._stage_model_predictions(features, 'seed'), in_sample)
+
+        stage_model.train_meta_model(X, y, n_folds=3)
+        assert stage_model.meta_model.coef_.shape == (1, 6)
+
+    def test_small_groups_fall_back_to_in_sample(self, stage_model):
+        X = make_startups(40, seed=8).assign(funding_stage='seed')
+        y = np.r_[np.ones(3), np.zeros(37)].astype(int)
+        features = stage_model.create_stage_specific_features(X, 'seed')
+        np.testing.assert_array_equal(
+            stage_model._out_of_fold_predictions(features, y, 'seed', 5, 0),
+            stage_model._stage_model_predictions(features, 'seed'))
+
+
+class TestStageSerialization:
+    """Native-format save/load of stage ensembles"""
+
+    @pytest.fixture
+    def boosted_model(self, stage_model):
+        import catboost as cb
+        import lightgbm as lgb
+        import xgboost as xgb
+
+        train = make_startups(300, seed=9)
+        y = (train['product_retention_30d'] > 0.5).astype(int)
+        for stage in list(stage_model.stage_models):
+            mask = train['funding_stage'] == stage
+            features = stage_model.create_stage_specific_features(train[mask], stage).drop(columns='funding_stage')
+            stage_model.stage_models[stage] = {
+                'catboost': cb.CatBoostClassifier(iterations=20, depth=3, verbose=False,
+                                                  allow_writing_files=False).fit(features, y[mask]),
+                'xgboost': xgb.XGBClassifier(n_estimators=20, max_depth=3).fit(features, y[mask]),
+                'lightgbm': lgb.LGBMClassifier(n_estimators=20, max_depth=3, min_child_samples=5,
+                                               verbose=-1).fit(features, y[mask])
+            }
+        stage_model.meta_model = LogisticRegression().fit(
+            np.random.default_rng(3).uniform(0, 1, (50, 7)), np.tile([0, 1], 25))
+        return stage_model
+
+    def test_native_round_trip_matches_fitted_models(self, boosted_model, tmp_path):
+        X = make_startups(80, seed=10)
+        expected = boosted_model.predict_proba(X)
+        boosted_model.save_models(tmp_path)
+
+        manifest = json.loads((tmp_path / 'manifest.json').read_text())
+        seed_models = manifest['stages']['seed']['models']
+        assert [entry['file'] for entry in seed_models.values()] == ['catboost.cbm', 'xgboost.ubj', 'lightgbm.txt']
+        assert manifest['stages']['seed']['feature_names'][0] == 'years_experience_avg'
+        assert not list(tmp_path.glob('stage_*/*.pkl'))
+
+        loaded = StageHierarchicalModel()
+        loaded.load_models(tmp_path)
+        np.testing.assert_allclose(loaded.predict_proba(X), expected, atol=1e-6)
+        # Column order of the input does not matter to native predictors
+        np.testing.assert_allclose(loaded.predict_proba(X[X.columns[::-1]]), expected, atol=1e-6)
+
+    def test_pickle_format_still_loads_in_training_order(self, boosted_model, tmp_path):
+        X = make_startups(40, seed=11)
+        boosted_model.save_models(tmp_path)
+        boosted_model.save_models(tmp_path, native=False)
+        assert not (tmp_path / 'manifest.json').exists()
+
+        loaded = StageHierarchicalModel()
+        loaded.load_models(tmp_path)
+        assert list(loaded.stage_models['seed']) == ['catboost', 'xgboost', 'lightgbm']
+        np.testing.assert_allclose(loaded.predict_proba(X), boosted_model.predict_proba(X))
+
+
+class TestSimpleStageModel:
+    """Batched routing in the quick stage model"""
+
+    @pytest.fixture
+    def simple_model(self):
+        from train_stage_models_quick import SimpleStageModel
+
+        model = SimpleStageModel()
+        train = make_startups(300, seed=12).drop(columns='funding_stage')
+        y = (train['product_retention_30d'] > 0.5).astype(int)
+        for depth, stage in enumerate(['pre_seed', 'seed', 'series_a'], start=2):
+            model.stage_models[stage] = DecisionTreeClassifier(max_depth=depth, random_state=0).fit(train, y)
+        return model
+
+    def test_dataset_and_api_spellings_route_to_the_same_model(self, simple_model):
+        X = make_startups(30, seed=13).assign(funding_stage='Pre-seed')
+        api_spelling = X.assign(funding_stage='pre_seed')
+        expected = simple_model.stage_models['pre_seed'].predict_proba(X.drop(columns='funding_stage'))[:, 1]
+        np.testing.assert_array_equal(simple_model.predict_proba(X), expected)
+        np.testing.assert_array_equal(simple_model.predict_proba(api_spelling), expected)
+
+    def test_batched_matches_per_stage_models(self, simple_model):
+        X = make_startups(60, seed=14)
+        X['funding_stage'] = np.resize(['Seed', 'series_a', 'Series C+', 'pre_seed'], 60)
+        features = X.drop(columns='funding_stage')
+        # Series C has no model and falls back to the latest earlier trained stage
+        routed = {'Seed': 'seed', 'series_a': 'series_a', 'Series C+': 'series_a', 'pre_seed': 'pre_seed'}
+        expected = np.array([
+            simple_model.stage_models[routed[label]].predict_proba(features.iloc[[i]])[0, 1]
+            for i, label in enumerate(X['funding_stage'])
+        ])
+        np.testing.assert_array_equal(simple_model.predict_proba(X), expected)
+
+    def test_unrecognized_stage_raises(self, simple_model):
+        X = make_startups(3, seed=15).assign(funding_stage='Angel')
+        with pytest.raises(ValueError, match="Angel"):
+            simple_model.predict_proba(X)
@@ -0,0 +1,138 @@
+"""
+Tests for the temporal prediction models
+"""
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from temporal_models import HORIZON_RAW_FEATURES, HORIZONS, TemporalPredictionModel
+from tests.conftest import random_startups
+
+STARTUP_COLUMNS = {
+    **{col: (0, 100) for col in sorted({col for cols in HORIZON_RAW_FEATURES.values() for col in cols})},
+    'network_effects_present': bool,
+    'product_retention_30d': (0, 1),
+    'founding_year': range(2010, 2024),
+    'product_stage': ['Concept', 'Beta', 'GA', 'mvp']
+}
+
+make_startups = partial(random_startups, columns=STARTUP_COLUMNS, missing={'runway_months': 5})
+
+
+class TestTemporalFeatures:
+    """Single feature pass shared by all horizons"""
+
+    @pytest.mark.parametrize("horizon", HORIZONS)
+    def test_matches_per_horizon_features(self, horizon):
+        model = TemporalPredictionModel()
+        df = make_startups(50)
+        expected = pd.concat([
+            model._select_features_for_horizon(df, horizon),
+            model.create_temporal_features(df, horizon)
+        ], axis=1).fillna(0).astype(float)
+
+        features = model.build_temporal_features(df)
+        pd.testing.assert_frame_equal(features.frame(horizon), expected, rtol=1e-12)
+
+    def test_missing_columns_use_defaults(self):
+        features = TemporalPredictionModel().build_temporal_features(make_startups(3)[['customer_count']])
+        short = features.frame('short_term')
+        assert list(short.columns[:2]) == ['customer_count', 'runway_risk']
+        assert (short['runway_risk'] == 0).all()
+
+    def test_product_maturity_matches_dataset_labels(self):
+        from temporal_models import PRODUCT_MATURITY
+        from vocabulary import PRODUCT_STAGE
+
+        labels = ['Concept', 'Beta', 'GA', 'mvp', 'growth', 'mature', None]
+        expected = pd.Series(labels).map({'Concept': 0.2, 'Beta': 0.6, 'GA': 1.0}).fillna(0.5)
+        np.testing.assert_array_equal(PRODUCT_MATURITY[PRODUCT_STAGE.codes(labels)], expected)
+
+    def test_predictions_use_shared_features(self):
+        from sklearn.linear_model import LogisticRegression
+
+        model = TemporalPredictionModel()
+        df = make_startups(200, seed=1)
+        y = (df['product_retention_30d'] > 0.5).astype(int)
+        features = model.build_temporal_features(df)
+        for horizon in HORIZONS:
+            model.models[horizon] = LogisticRegression(max_iter=1000).fit(features.frame(horizon), y)
+
+        predictions = model.predict_temporal(df.head(20))
+        for horizon in HORIZONS:
+            expected = model.models[horizon].predict_proba(features.frame(horizon).head(20))[:, 1]
+            np.testing.assert_allclose(predictions[horizon], expected)
+
+
+class TestTemporalInsights:
+    """Batch trajectories, critical periods and recommendations"""
+
+    def test_batch_insights(self):
+        predictions = {
+            'short_term': np.array([0.8, 0.8, 0.4, 0.2, 0.5]),
+            'medium_term': np.array([0.8, 0.6, 0.7, 0.4, 0.5]),
+            'long_term': np.array([0.8, 0.4, 0.8, 0.6, 0.5])
+        }
+        insights = TemporalPredictionModel().get_temporal_insights_batch(predictions)
+
+        assert [i['trajectory'] for i in insights] == [
+            'strong_growth', 'early_peak', 'late_bloomer', 'immediate_risk', 'steady_progress'
+        ]
+        assert [i['critical_period'] for i in insights] == ['none', 'none', 'none', 'short_term', 'none']
+        assert insights[0]['recommendations'] == [
+            "Maintain momentum: Continue current strategy while preparing for scale"
+        ]
+        assert len(insights[3]['recommendations']) == 1
+
+    def test_single_insights_match_batch(self):
+        model = TemporalPredictionModel()
+        single = model.get_temporal_insights({'short_term': 0.35, 'long_term': 0.45})
+        assert single == model.get_temporal_insights_batch(
+            {'short_term': np.array([0.35]), 'long_term': np.array([0.45])}
+        )[0]
+        assert single['trajectory'] == 'steady_progress'
+        assert len(single['recommendations']) == 2
+
+
+class TestTemporalBackends:
+    """Configurable model backend per horizon"""
+
+    def test_parse_backends(self):
+        from temporal_models import parse_backends
+
+        assert parse_backends('') == {}
+        assert parse_backends('short_term=hist_gradient_boosting, long_term=catboost') == {
+            'short_term': 'hist_gradient_boosting', 'long_term': 'catboost'
+        }
+        with pytest.raises(ValueError):
+            parse_backends('short_term=xgboost')
+        with pytest.raises(ValueError):
+            parse_backends('next_week=catboost')
+
+    def test_trains_selected_backends_and_round_trips(self, tmp_path):
+        import json
+        from sklearn.ensemble import HistGradientBoostingClassifier
+
+        model = TemporalPredictionModel(
+            backends={'short_term': 'hist_gradient_boosting', 'medium_term': 'logistic_regression'},
+            thread_count=1
+        )
+        df = make_startups(300, seed=3)
+        model.train_temporal_models(df, (df['product_retention_30d'] > 0.5).astype(int))
+        assert isinstance(model.models['short_term'], HistGradientBoostingClassifier)
+        assert type(model.models['medium_term']).__name__ == 'LogisticRegression'
+
+        model.save(tmp_path)
+        loaded = TemporalPredictionModel()
+        loaded.load(tmp_path)
+        assert loaded.backends == model.backends
+        np.testing.assert_allclose(loaded.predict_temporal(df)['short_term'], model.predict_temporal(df)['short_term'])
+
+        # Configs written before backends were configurable load with the defaults
+        config = json.loads((tmp_path / 'temporal_config.json').read_text())
+        del config['backends']
+        (tmp_path / 'temporal_config.json').write_text(json.dumps(config))
+        loaded.load(tmp_path)
+        assert loaded.backends['short_term'] == 'gradient_boosting'
@@ -0,0 +1,82 @@
+"""
+Tests for the compiled NumPy tree-ensemble evaluator
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from tree_ensemble import TreeEnsemble, UnsupportedModelError, compile_model
+
+
+@pytest.fixture(scope="module")
+def training_data():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(400, 6)), columns=[f"feature_{i}" for i in range(6)])
+    y = ((X['feature_0'] + X['feature_1'] * X['feature_2'] + rng.normal(scale=0.5, size=400)) > 0).astype(int)
+    X_missing = X.copy()
+    X_missing.iloc[::9, 1] = np.nan
+    return X, X_missing, y
+
+
+def fitted_models(X, X_missing, y):
+    import catboost as cb
+    import lightgbm as lgb
+    import xgboost as xgb
+    from sklearn.ensemble import GradientBoostingClassifier, HistGradientBoostingClassifier, RandomForestClassifier
+
+    return {
+        'catboost': cb.CatBoostClassifier(iterations=30, depth=4, verbose=False,
+                                          allow_writing_files=False).fit(X_missing, y),
+        'xgboost': xgb.XGBClassifier(n_estimators=30, max_depth=4).fit(X_missing, y),
+        'lightgbm': lgb.LGBMClassifier(n_estimators=30, num_leaves=15, verbose=-1).fit(X_missing, y),
+        'gradient_boosting': GradientBoostingClassifier(n_estimators=30, max_depth=3).fit(X, y),
+        'hist_gradient_boosting': HistGradientBoostingClassifier(max_iter=30, max_depth=4).fit(X_missing, y),
+        'random_forest': RandomForestClassifier(n_estimators=20, max_depth=6, random_state=0).fit(X, y)
+    }
+
+
+@pytest.mark.parametrize("name", ['catboost', 'xgboost', 'lightgbm', 'gradient_boosting',
+                                  'hist_gradient_boosting', 'random_forest'])
+def test_compiled_probabilities_match_library(training_data, name, tmp_path):
+    X, X_missing, y = training_data
+    model = fitted_models(X, X_missing, y)[name]
+    ensemble = compile_model(model)
+    X_eval = X if name in ('gradient_boosting', 'random_forest') else X_missing
+
+    expected = model.predict_proba(X_eval)[:, 1]
+    np.testing.assert_allclose(ensemble.predict_proba(X_eval)[:, 1], expected, atol=1e-6)
+    # Single rows and column order go through the same path
+    np.testing.assert_allclose(ensemble.predict_proba(X_eval.iloc[[3], ::-1])[:, 1], expected[[3]], atol=1e-6)
+
+    ensemble.save(tmp_path / 'model.npz')
+    loaded = TreeEnsemble.load(tmp_path / 'model.npz')
+    np.testing.assert_array_equal(loaded.predict_proba(X_eval), ensemble.predict_proba(X_eval))
+
+
+def test_native_predictors_are_unwrapped(training_data, tmp_path):
+    import native_model_io
+
+    X, X_missing, y = training_data
+    model = fitted_models(X, X_missing, y)['xgboost']
+    entry = native_model_io.save_model(model, tmp_path, 'xgboost')
+    predictor = native_model_io.load_model(tmp_path, entry)
+    ensemble = compile_model(predictor)
+    np.testing.assert_allclose(ensemble.predict_proba(X_missing), predictor.predict_proba(X_missing), atol=1e-6)
+
+
+def test_categorical_catboost_is_rejected():
+    import catboost as cb
+
+    X = pd.DataFrame({'sector': ['saas', 'fintech', 'ai'] * 20, 'value': np.arange(60.0)})
+    model = cb.CatBoostClassifier(iterations=5, verbose=False, allow_writing_files=False)
+    model.fit(X, np.arange(60) % 2, cat_features=['sector'])
+    with pytest.raises(UnsupportedModelError):
+        compile_model(model)
+
+
+def test_non_tree_sklearn_model_is_rejected(training_data):
+    from sklearn.linear_model import LogisticRegression
+
+    X, _, y = training_data
+    with pytest.raises(UnsupportedModelError):
+        compile_model(LogisticRegression().fit(X, y))
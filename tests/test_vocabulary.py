@@ -0,0 +1,72 @@
+"""
+Tests for the canonical categorical vocabulary
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from vocabulary import (
+    FUNDING_STAGES, INVESTOR_TIER, PRODUCT_STAGE, SECTOR, UNKNOWN_CODE, enum_pattern, normalize_stage, stage_codes
+)
+
+
+class TestFundingStages:
+    """Funding stage normalization and codes"""
+
+    @pytest.mark.parametrize("label,expected", [
+        ('pre_seed', 'pre_seed'), ('Pre-seed', 'pre_seed'), ('Pre-Seed', 'pre_seed'), ('preseed', 'pre_seed'),
+        ('Seed', 'seed'), ('Series A', 'series_a'), ('series-b', 'series_b'),
+        ('Series C+', 'series_c'), ('growth', 'growth'), ('Series D', 'growth')
+    ])
+    def test_known_spellings(self, label, expected):
+        assert normalize_stage(label) == expected
+
+    @pytest.mark.parametrize("label", ['angel_round', '', None, np.nan])
+    def test_unknown_spellings(self, label):
+        assert normalize_stage(label) is None
+
+    def test_codes_follow_lifecycle_order(self):
+        labels = pd.Series(['Series C+', 'pre_seed', None, 'Seed', 'bogus', 'Seed'])
+        codes = stage_codes(labels)
+        assert codes.tolist() == [4, 0, UNKNOWN_CODE, 1, UNKNOWN_CODE, 1]
+        assert [FUNDING_STAGES[c] for c in codes if c >= 0] == ['series_c', 'pre_seed', 'seed', 'seed']
+
+    def test_api_pattern_accepts_only_canonical_stages(self):
+        import re
+        pattern = re.compile(enum_pattern(FUNDING_STAGES))
+        assert all(pattern.match(stage) for stage in FUNDING_STAGES)
+        assert not pattern.match('Series A')
+
+
+class TestOtherVocabularies:
+    """Sector, investor tier and product stage spellings"""
+
+    @pytest.mark.parametrize("label,expected", [
+        ('AI/ML', 'AI/ML'), ('AI_ML', 'AI/ML'), ('ai-ml', 'AI/ML'), ('E-commerce', 'E-commerce'),
+        ('ecommerce', 'E-commerce'), ('fintech', 'FinTech'), ('Healthcare', 'HealthTech')
+    ])
+    def test_sector_spellings(self, label, expected):
+        assert SECTOR.normalize(label) == expected
+
+    @pytest.mark.parametrize("label,expected", [
+        ('Tier1', 'tier_1'), ('tier_2', 'tier_2'), ('Angel', 'tier_3'), ('Unknown', 'none')
+    ])
+    def test_investor_tier_spellings(self, label, expected):
+        assert INVESTOR_TIER.normalize(label) == expected
+
+    @pytest.mark.parametrize("label,expected", [('GA', 'launch'), ('Beta', 'beta'), ('Concept', 'concept')])
+    def test_product_stage_spellings(self, label, expected):
+        assert PRODUCT_STAGE.normalize(label) == expected
+
+    def test_table_default_slot(self):
+        table = PRODUCT_STAGE.table({'concept': 0.2, 'launch': 1.0}, default=0.5)
+        codes = PRODUCT_STAGE.codes(['Concept', 'GA', 'unheard of', None])
+        assert table[codes].tolist() == [0.2, 1.0, 0.5, 0.5]
+
+
+def test_api_stage_rules_accept_dataset_spellings():
+    pytest.importorskip('fastapi')
+    from api_server import get_stage_weights
+
+    assert get_stage_weights('Pre-seed') == get_stage_weights('pre_seed')
+    assert get_stage_weights('Series C+') == get_stage_weights('series_c')
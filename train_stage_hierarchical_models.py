@@ -19,12 +19,12 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 logger = logging.getLogger(__name__)
 
 
-def load_and_prepare_data():
+def load_and_prepare_data(data_path: str = "data/final_100k_dataset_45features.csv"):
     """Load the hybrid dataset and prepare for training"""
     logger.info("Loading dataset...")
     
     # Load the main dataset
-    df = pd.read_csv("data/final_100k_dataset_45features.csv")
+    df = pd.read_csv(data_path)
     logger.info(f"Dataset loaded: {df.shape[0]} rows, {df.shape[1]} columns")
     
     # Map existing funding stages to our standard stages
@@ -14,6 +14,8 @@ import logging
 import json
 from datetime import datetime
 
+from vocabulary import FUNDING_STAGES, STAGE_CODES, UNKNOWN_CODE, normalize_stage, stage_codes
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -34,9 +36,10 @@ class SimpleStageModel:
     def train(self, X_train, y_train):
         """Train stage-specific models"""
         stages = ['pre_seed', 'seed', 'series_a', 'series_b', 'series_c']
+        codes = stage_codes(X_train['funding_stage'])
         
         for stage in stages:
-            stage_mask = X_train['funding_stage'] == stage
+            stage_mask = codes == STAGE_CODES[stage]
             if stage_mask.sum() < 100:
                 logger.warning(f"Skipping {stage} - insufficient data")
                 continue
@@ -58,19 +61,37 @@ class SimpleStageModel:
             logger.info(f"Trained model for {stage} stage ({stage_mask.sum()} samples)")
     
     def predict_proba(self, X):
-        """Make predictions using stage-specific models"""
-        predictions = []
+        """
+        Make predictions using stage-specific models.
+        Rows are routed by canonical stage code and each stage model scores its
+        rows in one batch; stages without a trained model use the nearest
+        earlier trained stage (later stages if none is earlier).
+        """
+        codes = stage_codes(X['funding_stage'])
+        if (codes == UNKNOWN_CODE).any():
+            unknown = sorted(set(X['funding_stage'][codes == UNKNOWN_CODE].astype(str)))
+            raise ValueError(f"Unrecognized funding stages: {unknown}")
         
-        for idx, row in X.iterrows():
-            stage = row['funding_stage']
-            if stage in self.stage_models:
-                X_row = row.drop('funding_stage').to_frame().T
-                pred = self.stage_models[stage].predict_proba(X_row)[0, 1]
-            else:
-                pred = 0.5  # Default prediction
-            predictions.append(pred)
+        predictions = np.full(len(X), 0.5)
+        features = X.drop(columns='funding_stage')
+        for code in np.unique(codes):
+            stage = self._model_stage(FUNDING_STAGES[code])
+            if stage is None:
+                continue  # No stage models trained
+            rows = np.flatnonzero(codes == code)
+            predictions[rows] = self.stage_models[stage].predict_proba(features.iloc[rows])[:, 1]
         
-        return np.array(predictions)
+        return predictions
+    
+    def _model_stage(self, stage):
+        """Trained stage whose model scores the given canonical stage"""
+        if stage in self.stage_models:
+            return stage
+        trained = sorted(self.stage_models, key=lambda s: STAGE_CODES[s])
+        if not trained:
+            return None
+        earlier = [s for s in trained if STAGE_CODES[s] < STAGE_CODES[stage]]
+        return earlier[-1] if earlier else trained[0]
     
     def save(self, path):
         """Save the models"""
@@ -91,15 +112,8 @@ def main():
     # Load data
     df = pd.read_csv("data/final_100k_dataset_45features.csv")
     
-    # Map funding stages
-    stage_mapping = {
-        'Pre-seed': 'pre_seed',
-        'Seed': 'seed',
-        'Series A': 'series_a',
-        'Series B': 'series_b',
-        'Series C+': 'series_c'
-    }
-    df['funding_stage'] = df['funding_stage'].map(stage_mapping)
+    # Map funding stages ("Pre-seed", "Series C+", ...) to canonical stage names
+    df['funding_stage'] = df['funding_stage'].map(normalize_stage)
     
     # Prepare features
     exclude_cols = ['success', 'startup_id', 'startup_name', 'funding_stage']
@@ -0,0 +1,501 @@
+#!/usr/bin/env python3
+"""
+Compiled Tree Ensembles for FLASH
+Exports CatBoost, XGBoost, LightGBM and sklearn tree models into one flat
+array representation and scores whole batches across all trees with NumPy
+"""
+
+import json
+import logging
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Split rules: which side of the threshold goes to the left child
+SPLIT_RULES = ('le', 'lt')  # x <= threshold (sklearn, LightGBM), x < threshold (XGBoost)
+LINKS = ('logistic', 'identity')  # raw score -> probability of the positive class
+
+ARRAY_FIELDS = [
+    'feature', 'threshold', 'left', 'right', 'default_left', 'zero_as_missing', 'value', 'roots',
+    'oblivious_features', 'oblivious_thresholds', 'oblivious_leaf_values', 'oblivious_nan_fill'
+]
+
+
+class UnsupportedModelError(ValueError):
+    """Raised for models the flat representation cannot express (categorical splits, multiclass, ...)"""
+
+
+class TreeEnsemble:
+    """
+    Flat-array tree ensemble for binary classification.
+
+    Regular trees are stored as concatenated node arrays (feature, threshold,
+    left/right child, default direction for missing values, leaf value) with one
+    root index per tree; leaves have feature == -1. CatBoost oblivious trees are
+    stored as (tree, depth) feature/threshold tables plus a (tree, leaf) value table.
+    """
+
+    def __init__(self, library: str, feature_names: Optional[List[str]], n_features: int,
+                 split_rule: str = 'le', aggregation: str = 'sum', link: str = 'logistic',
+                 base_score: float = 0.0, scale: float = 1.0, input_dtype: str = 'float32',
+                 **arrays):
+        if split_rule not in SPLIT_RULES or link not in LINKS or aggregation not in ('sum', 'mean'):
+            raise ValueError(f"Invalid ensemble settings: {split_rule}, {aggregation}, {link}")
+        self.library = library
+        self.feature_names = list(feature_names) if feature_names is not None else None
+        self.n_features = n_features
+        self.split_rule = split_rule
+        self.aggregation = aggregation
+        self.link = link
+        self.base_score = float(base_score)
+        self.scale = float(scale)
+        self.input_dtype = input_dtype
+
+        empty = {
+            'feature': np.zeros(0, np.int32), 'threshold': np.zeros(0), 'left': np.zeros(0, np.int32),
+            'right': np.zeros(0, np.int32), 'default_left': np.zeros(0, bool),
+            'zero_as_missing': np.zeros(0, bool), 'value': np.zeros(0), 'roots': np.zeros(0, np.int32),
+            'oblivious_features': np.zeros((0, 0), np.int32), 'oblivious_thresholds': np.zeros((0, 0)),
+            'oblivious_leaf_values': np.zeros((0, 1)), 'oblivious_nan_fill': np.zeros(n_features)
+        }
+        for name in ARRAY_FIELDS:
+            setattr(self, name, np.asarray(arrays.get(name, empty[name])))
+        self.max_depth = self._max_depth()
+
+        # Evaluation tables: leaves read feature 0 and loop back to themselves
+        nodes = np.arange(len(self.feature), dtype=np.int32)
+        leaf = self.feature < 0
+        self._split_feature = np.where(leaf, 0, self.feature)
+        self._children = np.column_stack([np.where(leaf, nodes, self.left), np.where(leaf, nodes, self.right)])
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots) + len(self.oblivious_features)
+
+    def _max_depth(self) -> int:
+        """Longest root-to-leaf path among the regular trees"""
+        if len(self.roots) == 0:
+            return 0
+        frontier = self.roots
+        level = 0
+        while len(frontier):
+            internal = frontier[self.feature[frontier] >= 0]
+            frontier = np.concatenate([self.left[internal], self.right[internal]])
+            level += 1
+        return level - 1
+
+    def _matrix(self, X) -> np.ndarray:
+        if isinstance(X, pd.DataFrame):
+            if self.feature_names is not None:
+                X = X[self.feature_names]
+            X = X.to_numpy(dtype=float)
+        X = np.asarray(X, dtype=float)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        # Round to the precision the source library compares in, then compare in float64
+        return X.astype(self.input_dtype).astype(np.float64)
+
+    def decision_function(self, X) -> np.ndarray:
+        """Raw ensemble score per row, before the link function"""
+        X = self._matrix(X)
+        n_rows = len(X)
+        total = np.zeros(n_rows)
+
+        if len(self.roots):
+            X_flat = X.ravel()
+            row_offsets = (np.arange(n_rows) * X.shape[1])[:, None]
+            check_missing = np.isnan(X).any() or self.zero_as_missing.any()
+            node = np.broadcast_to(self.roots, (n_rows, len(self.roots))).copy()
+            for _ in range(self.max_depth):
+                x = X_flat[row_offsets + self._split_feature[node]]
+                threshold = self.threshold[node]
+                go_right = x > threshold if self.split_rule == 'le' else x >= threshold
+                if check_missing:
+                    missing = np.isnan(x)
+                    if self.zero_as_missing.any():
+                        missing |= self.zero_as_missing[node] & (x == 0)
+                    go_right = np.where(missing, ~self.default_left[node], go_right)
+                # Leaves point to themselves, so finished paths stay put
+                node = self._children[node, go_right.astype(np.intp)]
+            leaf_values = self.value[node]
+            total += leaf_values.mean(axis=1) if self.aggregation == 'mean' else leaf_values.sum(axis=1)
+
+        if len(self.oblivious_features):
+            # NaN handling per feature: CatBoost's Min/Max modes become -inf/+inf
+            X_filled = np.where(np.isnan(X), self.oblivious_nan_fill, X)
+            x = X_filled[:, self.oblivious_features]  # (rows, trees, depth)
+            bits = x > self.oblivious_thresholds
+            leaf_index = (bits << np.arange(bits.shape[2])).sum(axis=2)
+            total += self.oblivious_leaf_values[np.arange(len(self.oblivious_features)), leaf_index].sum(axis=1)
+
+        return self.scale * total + self.base_score
+
+    def predict_proba(self, X) -> np.ndarray:
+        raw = self.decision_function(X)
+        positive = 1 / (1 + np.exp(-raw)) if self.link == 'logistic' else raw
+        return np.column_stack([1 - positive, positive])
+
+    def predict(self, X) -> np.ndarray:
+        return (self.predict_proba(X)[:, 1] > 0.5).astype(int)
+
+    def save(self, path: Path) -> None:
+        """Write the ensemble as a single .npz file (no pickled objects)"""
+        metadata = {
+            'library': self.library, 'feature_names': self.feature_names, 'n_features': self.n_features,
+            'split_rule': self.split_rule, 'aggregation': self.aggregation, 'link': self.link,
+            'base_score': self.base_score, 'scale': self.scale, 'input_dtype': self.input_dtype
+        }
+        np.savez(path, metadata=np.array(json.dumps(metadata)),
+                 **{name: getattr(self, name) for name in ARRAY_FIELDS})
+
+    @classmethod
+    def load(cls, path: Path) -> 'TreeEnsemble':
+        with np.load(path, allow_pickle=False) as data:
+            metadata = json.loads(str(data['metadata']))
+            arrays = {name: data[name] for name in ARRAY_FIELDS}
+        return cls(**metadata, **arrays)
+
+
+class _NodeBuilder:
+    """Accumulates regular trees into concatenated node arrays"""
+
+    def __init__(self):
+        self.columns = {name: [] for name in
+                        ('feature', 'threshold', 'left', 'right', 'default_left', 'zero_as_missing', 'value')}
+        self.roots = []
+        self.size = 0
+
+    def add_tree(self, feature, threshold, left, right, default_left, value, zero_as_missing=None, root=0):
+        """Add one tree given node arrays with tree-local child indices (-1 for leaves)"""
+        feature = np.asarray(feature, dtype=np.int32)
+        left = np.asarray(left, dtype=np.int32)
+        right = np.asarray(right, dtype=np.int32)
+        leaf = left < 0
+        self.columns['feature'].append(np.where(leaf, -1, feature))
+        self.columns['threshold'].append(np.asarray(threshold, dtype=float))
+        self.columns['left'].append(np.where(leaf, -1, left + self.size))
+        self.columns['right'].append(np.where(leaf, -1, right + self.size))
+        self.columns['default_left'].append(np.asarray(default_left, dtype=bool))
+        self.columns['zero_as_missing'].append(
+            np.zeros(len(feature), bool) if zero_as_missing is None else np.asarray(zero_as_missing, bool))
+        self.columns['value'].append(np.asarray(value, dtype=float))
+        self.roots.append(root + self.size)
+        self.size += len(feature)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        arrays = {name: np.concatenate(parts) for name, parts in self.columns.items()}
+        arrays['roots'] = np.asarray(self.roots, dtype=np.int32)
+        return arrays
+
+
+def _logit(p: float) -> float:
+    return float(np.log(p / (1 - p)))
+
+
+def compile_sklearn(model: Any) -> TreeEnsemble:
+    """
+    GradientBoostingClassifier, HistGradientBoostingClassifier, RandomForestClassifier,
+    ExtraTreesClassifier or DecisionTreeClassifier
+    """
+    from sklearn.ensemble import GradientBoostingClassifier, HistGradientBoostingClassifier
+
+    if len(getattr(model, 'classes_', [])) != 2:
+        raise UnsupportedModelError("Only binary classifiers can be compiled")
+    feature_names = list(model.feature_names_in_) if hasattr(model, 'feature_names_in_') else None
+    builder = _NodeBuilder()
+
+    if isinstance(model, HistGradientBoostingClassifier):
+        for (predictor,) in model._predictors:
+            nodes = predictor.nodes
+            if nodes['is_categorical'].any():
+                raise UnsupportedModelError("Categorical HistGradientBoosting splits are not supported")
+            leaf = nodes['is_leaf'].astype(bool)
+            # Leaf values already include the learning rate
+            builder.add_tree(nodes['feature_idx'], nodes['num_threshold'], np.where(leaf, -1, nodes['left']),
+                             np.where(leaf, -1, nodes['right']), nodes['missing_go_to_left'], nodes['value'])
+        # HistGradientBoosting bins and compares in float64
+        return TreeEnsemble('sklearn', feature_names, model.n_features_in_, split_rule='le',
+                            base_score=float(np.ravel(model._baseline_prediction)[0]), input_dtype='float64',
+                            **builder.arrays())
+
+    if not hasattr(model, 'tree_') and not hasattr(model, 'estimators_'):
+        raise UnsupportedModelError(f"No tree compiler for {type(model).__name__}")
+
+    def add(tree, value):
+        missing_left = getattr(tree, 'missing_go_to_left', np.zeros(tree.node_count, dtype=np.uint8))
+        builder.add_tree(tree.feature, tree.threshold, tree.children_left, tree.children_right,
+                         missing_left, value)
+
+    if isinstance(model, GradientBoostingClassifier):
+        for estimator in model.estimators_[:, 0]:
+            add(estimator.tree_, model.learning_rate * estimator.tree_.value[:, 0, 0])
+        if model.init_ == 'zero':
+            base_score = 0.0
+        else:
+            base_score = _logit(model.init_.predict_proba(np.zeros((1, model.n_features_in_)))[0, 1])
+        return TreeEnsemble('sklearn', feature_names, model.n_features_in_, split_rule='le',
+                            base_score=base_score, **builder.arrays())
+
+    estimators = getattr(model, 'estimators_', [model])
+    for estimator in estimators:
+        counts = estimator.tree_.value[:, 0, :]
+        add(estimator.tree_, counts[:, 1] / counts.sum(axis=1))
+    return TreeEnsemble('sklearn', feature_names, model.n_features_in_, split_rule='le',
+                        aggregation='mean', link='identity', **builder.arrays())
+
+
+def compile_xgboost(model: Any) -> TreeEnsemble:
+    """XGBClassifier or Booster trained with binary:logistic"""
+    booster = model.get_booster() if hasattr(model, 'get_booster') else model
+    raw = json.loads(booster.save_raw(raw_format='json'))
+    learner = raw['learner']
+    if learner['objective']['name'] != 'binary:logistic':
+        raise UnsupportedModelError(f"Unsupported XGBoost objective {learner['objective']['name']}")
+    if learner['gradient_booster']['name'] != 'gbtree':
+        raise UnsupportedModelError("Only gbtree boosters can be compiled")
+
+    builder = _NodeBuilder()
+    for tree in learner['gradient_booster']['model']['trees']:
+        if any(tree.get('split_type', [])):
+            raise UnsupportedModelError("Categorical XGBoost splits are not supported")
+        left = np.asarray(tree['left_children'])
+        # XGBoost compares in float32; the JSON prints shortest decimal forms
+        conditions = np.asarray(tree['split_conditions'], dtype=np.float32).astype(np.float64)
+        # Leaf weights are stored in split_conditions for leaf nodes
+        builder.add_tree(tree['split_indices'], conditions, left, tree['right_children'],
+                         tree['default_left'], np.where(left < 0, conditions, 0.0))
+
+    n_features = int(learner['learner_model_param']['num_feature'])
+    feature_names = learner.get('feature_names') or None
+    base_score = _logit(float(learner['learner_model_param']['base_score']))
+    return TreeEnsemble('xgboost', feature_names, n_features, split_rule='lt',
+                        base_score=base_score, **builder.arrays())
+
+
+def compile_lightgbm(model: Any) -> TreeEnsemble:
+    """LGBMClassifier or Booster trained with the binary objective"""
+    booster = model.booster_ if hasattr(model, 'booster_') else model
+    dump = booster.dump_model()
+    objective = dump.get('objective', '').split()
+    if not objective or objective[0] != 'binary' or dump.get('average_output'):
+        raise UnsupportedModelError(f"Unsupported LightGBM model ({dump.get('objective')})")
+    sigmoid = float(next((o.split(':')[1] for o in objective if o.startswith('sigmoid:')), 1.0))
+
+    builder = _NodeBuilder()
+    for info in dump['tree_info']:
+        nodes = []
+
+        def visit(node):
+            index = len(nodes)
+            nodes.append(None)
+            if 'leaf_value' in node:
+                nodes[index] = (-1, 0.0, -1, -1, False, False, node['leaf_value'])
+                return index
+            if node['decision_type'] != '<=':
+                raise UnsupportedModelError("Categorical LightGBM splits are not supported")
+            left, right = visit(node['left_child']), visit(node['right_child'])
+            default_left = node['default_left']
+            if node['missing_type'] == 'None':
+                # NaN is treated as zero, so it follows zero's branch
+                default_left = 0 <= node['threshold']
+            nodes[index] = (node['split_feature'], node['threshold'], left, right, default_left,
+                            node['missing_type'] == 'Zero', 0.0)
+            return index
+
+        visit(info['tree_structure'])
+        feature, threshold, left, right, default_left, zero_missing, value = zip(*nodes)
+        builder.add_tree(feature, threshold, left, right, default_left, np.asarray(value) * sigmoid,
+                         zero_as_missing=zero_missing)
+
+    return TreeEnsemble('lightgbm', dump.get('feature_names'), dump['max_feature_idx'] + 1,
+                        split_rule='le', input_dtype='float64', **builder.arrays())
+
+
+def compile_catboost(model: Any) -> TreeEnsemble:
+    """CatBoostClassifier with symmetric trees over numeric features"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'model.json'
+        model.save_model(str(path), format='json')
+        with open(path, 'r') as f:
+            dump = json.load(f)
+
+    if 'oblivious_trees' not in dump:
+        raise UnsupportedModelError("Only symmetric (oblivious) CatBoost trees are supported")
+    if dump['features_info'].get('categorical_features'):
+        raise UnsupportedModelError("CatBoost models with categorical features are not supported")
+
+    float_features = dump['features_info']['float_features']
+    flat_index = {f['feature_index']: f['flat_feature_index'] for f in float_features}
+    n_features = max(flat_index.values()) + 1
+    nan_fill = np.full(n_features, np.nan)
+    for f in float_features:
+        if f.get('nan_value_treatment') == 'AsFalse':
+            nan_fill[f['flat_feature_index']] = -np.inf
+        elif f.get('nan_value_treatment') == 'AsTrue':
+            nan_fill[f['flat_feature_index']] = np.inf
+
+    trees = dump['oblivious_trees']
+    depth = max((len(t['splits']) for t in trees), default=0)
+    features = np.zeros((len(trees), depth), dtype=np.int32)
+    # Padding levels never fire (x > inf is false), so leaf indices stay within the real tree
+    thresholds = np.full((len(trees), depth), np.inf)
+    leaf_values = np.zeros((len(trees), 2 ** depth))
+    for i, tree in enumerate(trees):
+        for level, split in enumerate(tree['splits']):
+            if split['split_type'] != 'FloatFeature':
+                raise UnsupportedModelError(f"Unsupported CatBoost split type {split['split_type']}")
+            features[i, level] = flat_index[split['float_feature_index']]
+            thresholds[i, level] = np.float32(split['border'])
+        leaf_values[i, :len(tree['leaf_values'])] = tree['leaf_values']
+
+    scale, bias = dump.get('scale_and_bias', [1, [0]])
+    bias = bias[0] if isinstance(bias, list) else bias
+    return TreeEnsemble('catboost', list(model.feature_names_ or []) or None, n_features,
+                        scale=scale, base_score=bias, oblivious_features=features,
+                        oblivious_thresholds=thresholds, oblivious_leaf_values=leaf_values,
+                        oblivious_nan_fill=nan_fill)
+
+
+def compile_model(model: Any) -> TreeEnsemble:
+    """Export any supported fitted tree model to a TreeEnsemble"""
+    if hasattr(model, 'model') and hasattr(model, 'library'):
+        # native_model_io predictors wrap the raw booster
+        ensemble = compile_model(model.model)
+        ensemble.feature_names = model.feature_names_ or ensemble.feature_names
+        return ensemble
+
+    module = type(model).__module__.split('.')[0]
+    compilers = {
+        'catboost': compile_catboost,
+        'xgboost': compile_xgboost,
+        'lightgbm': compile_lightgbm,
+        'sklearn': compile_sklearn
+    }
+    if module not in compilers:
+        raise UnsupportedModelError(f"No tree compiler for {type(model).__name__}")
+    return compilers[module](model)
+
+
+def load_artifact(path: Path) -> Any:
+    """Load a model artifact from disk in whichever library format it was saved"""
+    import joblib
+
+    path = Path(path)
+    if path.suffix == '.pkl':
+        return joblib.load(path)
+    if path.suffix == '.cbm':
+        import catboost as cb
+        model = cb.CatBoostClassifier()
+        try:
+            model.load_model(str(path))
+            return model
+        except Exception:
+            # Some industry models are XGBoost binaries saved under a .cbm name
+            import xgboost as xgb
+            booster = xgb.Booster()
+            booster.load_model(str(path))
+            return booster
+    if path.suffix in ('.ubj', '.json'):
+        import xgboost as xgb
+        booster = xgb.Booster()
+        booster.load_model(str(path))
+        return booster
+    if path.suffix == '.txt':
+        import lightgbm as lgb
+        return lgb.Booster(model_file=str(path))
+    raise UnsupportedModelError(f"Unknown model artifact {path.name}")
+
+
+def library_positive_proba(model: Any, X: np.ndarray) -> np.ndarray:
+    """Positive-class probability from the source library, for verification"""
+    module = type(model).__module__.split('.')[0]
+    if module == 'xgboost' and not hasattr(model, 'predict_proba'):
+        return model.inplace_predict(X.astype(np.float32), validate_features=False)
+    if module == 'lightgbm' and not hasattr(model, 'predict_proba'):
+        return model.predict(X)
+    return model.predict_proba(X)[:, 1]
+
+
+def verification_inputs(ensemble: TreeEnsemble, n_rows: int = 500, seed: int = 0) -> np.ndarray:
+    """Random rows drawn from each feature's split thresholds so every branch gets exercised"""
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_rows, ensemble.n_features))
+    thresholds = [[] for _ in range(ensemble.n_features)]
+    internal = ensemble.feature >= 0
+    for f, t in zip(ensemble.feature[internal], ensemble.threshold[internal]):
+        thresholds[f].append(t)
+    for f, t in zip(ensemble.oblivious_features.ravel(), ensemble.oblivious_thresholds.ravel()):
+        if np.isfinite(t):
+            thresholds[f].append(t)
+    for f, values in enumerate(thresholds):
+        if values:
+            values = np.asarray(values)
+            X[:, f] = rng.choice(values, n_rows) + rng.normal(scale=np.std(values) + 1e-3, size=n_rows)
+    X[rng.random(X.shape) < 0.02] = np.nan
+    return X
+
+
+def main():
+    """Compile every tree model under models/ into .npz ensembles and verify them"""
+    import argparse
+    import time
+
+    from memory_report import MODEL_FAMILIES
+
+    parser = argparse.ArgumentParser(description="Export FLASH tree models to compiled NumPy ensembles")
+    parser.add_argument('--output', default='models/compiled')
+    parser.add_argument('--tolerance', type=float, default=1e-5)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    rows = []
+    for family, directory in MODEL_FAMILIES.items():
+        for path in sorted(Path(directory).rglob('*')):
+            if path.suffix not in ('.cbm', '.pkl', '.ubj', '.txt') or 'compiled' in path.parts:
+                continue
+            try:
+                model = load_artifact(path)
+                ensemble = compile_model(model)
+            except UnsupportedModelError as e:
+                rows.append({'model': str(path), 'status': f"skipped: {e}"})
+                continue
+            except Exception as e:
+                logger.debug(f"{path} is not a tree model: {e}")
+                continue
+
+            X = verification_inputs(ensemble)
+            try:
+                expected = library_positive_proba(model, X)
+            except ValueError:
+                # Estimators trained without missing values may reject NaN
+                X = np.nan_to_num(X)
+                expected = library_positive_proba(model, X)
+            max_diff = float(np.abs(ensemble.predict_proba(X)[:, 1] - expected).max())
+
+            timings = {}
+            for label, fn in (('library', lambda b: library_positive_proba(model, b)),
+                              ('compiled', lambda b: ensemble.predict_proba(b))):
+                for size in (1, len(X)):
+                    started = time.perf_counter()
+                    for _ in range(20):
+                        fn(X[:size])
+                    timings[f"{label}_{size}_ms"] = (time.perf_counter() - started) / 20 * 1000
+
+            target = Path(args.output) / family / f"{path.stem}.npz"
+            target.parent.mkdir(parents=True, exist_ok=True)
+            ensemble.save(target)
+            rows.append({
+                'model': str(path), 'status': 'ok' if max_diff <= args.tolerance else 'MISMATCH',
+                'trees': ensemble.n_trees, 'max_abs_diff': max_diff, **timings
+            })
+
+    print(pd.DataFrame(rows).to_string(index=False, float_format=lambda v: f"{v:.3g}"))
+
+
+if __name__ == "__main__":
+    main()
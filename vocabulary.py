@@ -0,0 +1,137 @@
+"""
+Canonical Categorical Vocabulary for FLASH
+Maps the many spellings of categorical labels (API snake_case, dataset
+title case such as "Pre-seed" / "Series C+" / "AI/ML") to canonical names
+and small integer codes, converting each distinct label only once
+"""
+
+import re
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+UNKNOWN_CODE = -1
+
+# Bound on interned spellings per vocabulary (free-text fields such as sector)
+MAX_CACHED_SPELLINGS = 4096
+
+
+def _slug(label) -> str:
+    """'Series C+' -> 'series_c_plus', 'Pre-seed' -> 'pre_seed', 'AI/ML' -> 'ai_ml'"""
+    label = str(label).strip().lower().replace('+', '_plus')
+    return re.sub(r'[^a-z0-9]+', '_', label).strip('_')
+
+
+def enum_pattern(values: Iterable[str]) -> str:
+    """Regex accepting exactly the given canonical values, for pydantic Field(pattern=...)"""
+    return f"^({'|'.join(re.escape(v) for v in values)})$"
+
+
+class Vocabulary:
+    """
+    Ordered set of canonical labels. A label's position is its integer code;
+    any spelling that slugs to a canonical label or a known alias resolves to it.
+    """
+
+    def __init__(self, name: str, values: Iterable[str], aliases: Optional[Dict[str, str]] = None):
+        self.name = name
+        self.values = tuple(values)
+        self.codes_by_value = {value: code for code, value in enumerate(self.values)}
+        self._lookup = {_slug(value): value for value in self.values}
+        for alias, value in (aliases or {}).items():
+            self._lookup[_slug(alias)] = value
+        # Interned results for every raw spelling seen so far
+        self._cache: Dict[str, Optional[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def normalize(self, label) -> Optional[str]:
+        """Canonical label for any known spelling, or None"""
+        if label is None or (isinstance(label, float) and np.isnan(label)):
+            return None
+        key = str(label)
+        if key in self._cache:
+            return self._cache[key]
+        value = self._lookup.get(_slug(key))
+        if len(self._cache) < MAX_CACHED_SPELLINGS:
+            self._cache[key] = value
+        return value
+
+    def code(self, label) -> int:
+        """Integer code of one label (UNKNOWN_CODE if unrecognized)"""
+        value = self.normalize(label)
+        return self.codes_by_value[value] if value is not None else UNKNOWN_CODE
+
+    def codes(self, labels) -> np.ndarray:
+        """
+        Integer codes for a column of labels.
+        Only the distinct labels are normalized; rows are mapped by array lookup.
+        """
+        inverse, uniques = pd.factorize(pd.Series(labels), use_na_sentinel=True)
+        lookup = np.array([self.code(label) for label in uniques] + [UNKNOWN_CODE], dtype=np.int8)
+        # factorize marks missing values with -1, which indexes the trailing UNKNOWN entry
+        return lookup[inverse]
+
+    def table(self, mapping: Dict[str, Any], default: Any = np.nan) -> np.ndarray:
+        """
+        Rule table indexed by code. The extra trailing slot holds the default,
+        so `table[codes]` maps UNKNOWN_CODE (-1) to it without masking.
+        """
+        values = [mapping.get(value, default) for value in self.values] + [default]
+        return np.array(values)
+
+    def pattern(self) -> str:
+        return enum_pattern(self.values)
+
+
+# Funding stages in lifecycle order
+FUNDING_STAGE = Vocabulary('funding_stage', [
+    'pre_seed', 'seed', 'series_a', 'series_b', 'series_c', 'growth'
+], aliases={
+    'preseed': 'pre_seed',
+    'Series C+': 'series_c',
+    'series_d': 'growth',
+    'series_e': 'growth',
+    'late_stage': 'growth'
+})
+
+# Sectors as named by the dataset and the industry models
+SECTOR = Vocabulary('sector', [
+    'SaaS', 'FinTech', 'HealthTech', 'E-commerce', 'AI/ML', 'BioTech', 'EdTech',
+    'Cybersecurity', 'Gaming', 'Other'
+], aliases={
+    'ecommerce': 'E-commerce',
+    'ai': 'AI/ML',
+    'aiml': 'AI/ML',
+    'machine_learning': 'AI/ML',
+    'healthcare': 'HealthTech',
+    'biotechnology': 'BioTech',
+    'security': 'Cybersecurity',
+    'education': 'EdTech'
+})
+
+INVESTOR_TIER = Vocabulary('investor_tier', ['tier_1', 'tier_2', 'tier_3', 'none'], aliases={
+    'tier1': 'tier_1',
+    'tier2': 'tier_2',
+    'tier3': 'tier_3',
+    'angel': 'tier_3',
+    'unknown': 'none'
+})
+
+PRODUCT_STAGE = Vocabulary('product_stage', ['concept', 'mvp', 'beta', 'launch', 'growth', 'mature'], aliases={
+    'ga': 'launch',  # dataset label for general availability
+    'general_availability': 'launch',
+    'prototype': 'mvp'
+})
+
+# Funding-stage helpers (canonical names and codes)
+FUNDING_STAGES = FUNDING_STAGE.values
+STAGE_CODES = FUNDING_STAGE.codes_by_value
+normalize_stage = FUNDING_STAGE.normalize
+stage_code = FUNDING_STAGE.code
+stage_codes = FUNDING_STAGE.codes